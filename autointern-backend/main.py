@@ -24,6 +24,7 @@ app.config['SUPABASE_ANON_KEY'] = os.getenv('SUPABASE_ANON_KEY')
 app.config['SUPABASE_SERVICE_ROLE_KEY'] = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
 app.config['GOOGLE_CLIENT_ID'] = os.getenv('GOOGLE_CLIENT_ID')
 app.config['GOOGLE_CLIENT_SECRET'] = os.getenv('GOOGLE_CLIENT_SECRET')
+app.config['SEARCH_BACKEND'] = os.getenv('SEARCH_BACKEND', 'auto')  # auto, fulltext, bm25 or like
 
 # للحصول على عنوان URL للواجهة الأمامية من متغيرات البيئة
 FRONTEND_URL = os.getenv('FRONTEND_URL', 'https://auto-intern-ai.vercel.app') # استخدم الرابط الجديد
@@ -52,6 +53,10 @@ db.init_app(app)
 with app.app_context():
     db.create_all()
     
+    # Materialized application stats shared with the enhanced models
+    from src.models.user_enhanced import UserApplicationStats
+    UserApplicationStats.__table__.create(bind=db.engine, checkfirst=True)
+    
     # Add sample internships if none exist
     from src.models.user import Internship
     if Internship.query.count() == 0:
@@ -2,6 +2,7 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 import os
+import multiprocessing
 from datetime import datetime
 
 # Import models
@@ -17,6 +18,15 @@ from src.routes.i18n_routes import i18n_bp
 
 # Import utilities
 from src.utils.i18n import i18n
+from src.utils.job_queue import job_queue
+from src.utils.llm_client import llm_client
+from src.utils.chat_context import chat_context
+from src.utils.pdf_extract import pdf_extractor
+from src.utils.nlp_pipeline import nlp_pipeline
+from src.utils.browser_pool import browser_pool
+from src.utils.page_waits import page_waiter
+from src.utils.static_forms import static_form_detector
+from src.utils.field_mapping_cache import field_mapping_cache
 
 def create_app():
     """Create and configure the Flask application"""
@@ -36,6 +46,57 @@ def create_app():
     
     # OpenAI Configuration
     app.config['OPENAI_API_KEY'] = os.environ.get('OPENAI_API_KEY')
+    app.config['OPENAI_API_BASE'] = os.environ.get('OPENAI_API_BASE')
+    app.config['LLM_MAX_CONCURRENCY'] = int(os.environ.get('LLM_MAX_CONCURRENCY', 8))
+    app.config['LLM_REQUESTS_PER_MINUTE'] = int(os.environ.get('LLM_REQUESTS_PER_MINUTE', 3500))
+    app.config['LLM_TOKENS_PER_MINUTE'] = int(os.environ.get('LLM_TOKENS_PER_MINUTE', 90000))
+    
+    # LLM response cache (memory://, sqlite:///path or redis://...)
+    app.config['LLM_CACHE_ENABLED'] = os.environ.get('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+    app.config['LLM_CACHE_URL'] = os.environ.get('LLM_CACHE_URL', 'memory://')
+    app.config['LLM_CACHE_MAX_ENTRIES'] = int(os.environ.get('LLM_CACHE_MAX_ENTRIES', 10000))
+    
+    # Chat context token budget and rolling summary threshold
+    app.config['CHAT_CONTEXT_MAX_TOKENS'] = int(os.environ.get('CHAT_CONTEXT_MAX_TOKENS', 3000))
+    app.config['CHAT_SUMMARY_TRIGGER_TOKENS'] = int(os.environ.get('CHAT_SUMMARY_TRIGGER_TOKENS', 1500))
+    
+    # PDF extraction worker processes and per-document limits
+    app.config['PDF_EXTRACT_WORKERS'] = int(os.environ.get('PDF_EXTRACT_WORKERS', 4))
+    app.config['PDF_MAX_PAGES'] = int(os.environ.get('PDF_MAX_PAGES', 100))
+    app.config['PDF_MAX_BYTES'] = int(os.environ.get('PDF_MAX_BYTES', 2 * 1024 * 1024))
+    
+    # spaCy model (loaded on first use) and nlp.pipe batching
+    app.config['SPACY_MODEL'] = os.environ.get('SPACY_MODEL', 'en_core_web_sm')
+    app.config['SPACY_BATCH_SIZE'] = int(os.environ.get('SPACY_BATCH_SIZE', 32))
+    app.config['SPACY_N_PROCESS'] = int(os.environ.get('SPACY_N_PROCESS', 1))
+    
+    # Warm headless Chrome sessions shared by the autofill endpoints
+    app.config['BROWSER_POOL_SIZE'] = int(os.environ.get('BROWSER_POOL_SIZE', 2))
+    app.config['BROWSER_POOL_PREWARM'] = int(os.environ.get('BROWSER_POOL_PREWARM', 1))
+    app.config['BROWSER_POOL_MAX_USES'] = int(os.environ.get('BROWSER_POOL_MAX_USES', 50))
+    app.config['BROWSER_POOL_CHECKOUT_TIMEOUT'] = float(os.environ.get('BROWSER_POOL_CHECKOUT_TIMEOUT', 30))
+    
+    # Upper bounds (seconds) for autofill page loads and readiness waits
+    app.config['AUTOFILL_NAVIGATION_TIMEOUT'] = float(os.environ.get('AUTOFILL_NAVIGATION_TIMEOUT', 20))
+    app.config['AUTOFILL_READY_TIMEOUT'] = float(os.environ.get('AUTOFILL_READY_TIMEOUT', 10))
+    app.config['AUTOFILL_NETWORK_IDLE_TIMEOUT'] = float(os.environ.get('AUTOFILL_NETWORK_IDLE_TIMEOUT', 5))
+    app.config['AUTOFILL_NETWORK_IDLE_TIME'] = float(os.environ.get('AUTOFILL_NETWORK_IDLE_TIME', 0.5))
+    app.config['AUTOFILL_ELEMENT_TIMEOUT'] = float(os.environ.get('AUTOFILL_ELEMENT_TIMEOUT', 5))
+    app.config['AUTOFILL_SUBMIT_TIMEOUT'] = float(os.environ.get('AUTOFILL_SUBMIT_TIMEOUT', 10))
+    
+    # Static-HTML field detection tried before the browser
+    app.config['AUTOFILL_STATIC_DETECTION'] = os.environ.get('AUTOFILL_STATIC_DETECTION', 'true').lower() == 'true'
+    app.config['AUTOFILL_STATIC_TIMEOUT'] = float(os.environ.get('AUTOFILL_STATIC_TIMEOUT', 5))
+    app.config['AUTOFILL_STATIC_MIN_FIELDS'] = int(os.environ.get('AUTOFILL_STATIC_MIN_FIELDS', 2))
+    
+    # Shared cache of detected field mappings per page layout
+    app.config['AUTOFILL_FIELD_CACHE_ENABLED'] = os.environ.get('AUTOFILL_FIELD_CACHE_ENABLED', 'true').lower() == 'true'
+    app.config['AUTOFILL_FIELD_CACHE_TTL'] = int(os.environ.get('AUTOFILL_FIELD_CACHE_TTL', 24 * 3600))
+    app.config['AUTOFILL_TEMPLATE_LIMIT'] = int(os.environ.get('AUTOFILL_TEMPLATE_LIMIT', 50))
+    
+    # Background job queue (sqlite:///path or redis://...)
+    app.config['JOB_QUEUE_URL'] = os.environ.get('JOB_QUEUE_URL')
+    app.config['JOB_QUEUE_WORKERS'] = int(os.environ.get('JOB_QUEUE_WORKERS', 4))
     
     # Enable CORS for all routes
     CORS(app, origins="*", allow_headers=["Content-Type", "Authorization"])
@@ -46,6 +107,23 @@ def create_app():
     # Initialize i18n
     i18n.init_app(app)
     
+    # Initialize shared LLM client
+    llm_client.init_app(app)
+    chat_context.init_app(app)
+    
+    # Initialize background job queue
+    job_queue.init_app(app)
+    
+    # Initialize CV extraction and NLP
+    pdf_extractor.init_app(app)
+    nlp_pipeline.init_app(app)
+    
+    # Initialize the autofill browser pool, page waits, static detection and field cache
+    browser_pool.init_app(app)
+    page_waiter.init_app(app)
+    static_form_detector.init_app(app)
+    field_mapping_cache.init_app(app)
+    
     # Create upload directories
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     os.makedirs(os.path.join(app.config['UPLOAD_FOLDER'], 'cvs'), exist_ok=True)
@@ -76,6 +154,16 @@ def create_app():
             ]
         }), 200
     
+    # LLM client and response cache counters for monitoring
+    @app.route('/api/metrics/llm', methods=['GET'])
+    def llm_metrics():
+        return jsonify(llm_client.stats()), 200
+    
+    # Browser pool occupancy for monitoring
+    @app.route('/api/metrics/browser-pool', methods=['GET'])
+    def browser_pool_metrics():
+        return jsonify(browser_pool.stats()), 200
+    
     # API info endpoint
     @app.route('/api/info', methods=['GET'])
     def api_info():
@@ -135,8 +223,10 @@ def create_app():
     
     return app
 
-# Create the application
-app = create_app()
+# Create the application. Spawned worker processes (the PDF extraction pool)
+# re-import the main script, and with it this module, before they run any
+# task; they only need the worker functions, not the tables and output.
+app = create_app() if multiprocessing.current_process().name == 'MainProcess' else None
 
 if __name__ == '__main__':
     # Run the application
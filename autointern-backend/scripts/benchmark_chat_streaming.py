@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark time-to-first-token for chat replies
+Compares a blocking completion with a streamed one against the local fake
+completion server, whose reply arrives one word at a time.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.fake_llm import FakeCompletionServer
+from src.utils.llm_client import LLMClient
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark chat streaming')
+    parser.add_argument('--words', type=int, default=200)
+    parser.add_argument('--first-token-latency', type=float, default=0.4)
+    parser.add_argument('--token-delay', type=float, default=0.02)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    reply = ' '.join(f'word{i}' for i in range(args.words))
+    generation_time = args.first_token_latency + args.token_delay * (args.words - 1)
+
+    with FakeCompletionServer(latency=generation_time, first_token_latency=args.first_token_latency,
+                              token_delay=args.token_delay, reply=lambda messages: reply) as server:
+        client = LLMClient(api_key='fake', api_base=server.api_base)
+        messages = [{"role": "user", "content": "Tell me about internships"}]
+
+        print(f"📊 {args.words}-word replies, {args.runs} runs each")
+
+        blocking = []
+        for _ in range(args.runs):
+            start = time.monotonic()
+            client.chat(messages)
+            blocking.append(time.monotonic() - start)
+
+        first_tokens = []
+        totals = []
+        for _ in range(args.runs):
+            start = time.monotonic()
+            first = None
+            for _ in client.stream(messages):
+                if first is None:
+                    first = time.monotonic() - start
+            first_tokens.append(first)
+            totals.append(time.monotonic() - start)
+
+        print(f"   • Blocking: first text after {sum(blocking) / args.runs * 1000:.0f} ms")
+        print(f"   • Streaming: first token after {sum(first_tokens) / args.runs * 1000:.0f} ms, "
+              f"complete after {sum(totals) / args.runs * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
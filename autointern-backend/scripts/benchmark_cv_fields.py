@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Regression check and benchmark for CV field extraction
+Verifies the compiled extractor against the regression corpus in
+src/data/cv_field_corpus.json (expected values recorded from the original
+per-field functions), then compares throughput in MB/s of CV text with the
+original functions, which are kept below as the reference.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.cv_fields import extract_fields
+
+CORPUS_PATH = os.path.join(project_root, 'src', 'data', 'cv_field_corpus.json')
+
+def legacy_extract_email(text):
+    """Original implementation"""
+    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    emails = re.findall(email_pattern, text)
+    return emails[0] if emails else None
+
+def legacy_extract_phone(text):
+    """Original implementation"""
+    phone_patterns = [
+        r'\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}',
+        r'\+?[0-9]{1,3}[-.\s]?[0-9]{3,4}[-.\s]?[0-9]{3,4}[-.\s]?[0-9]{3,4}',
+        r'\b[0-9]{10,15}\b'
+    ]
+
+    for pattern in phone_patterns:
+        phones = re.findall(pattern, text)
+        if phones:
+            return phones[0]
+    return None
+
+def legacy_extract_experience_years(text):
+    """Original implementation"""
+    experience_patterns = [
+        r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
+        r'experience\s*:?\s*(\d+)\+?\s*years?',
+        r'(\d+)\+?\s*years?\s*in\s*(?:the\s*)?(?:field|industry)',
+    ]
+
+    text_lower = text.lower()
+
+    for pattern in experience_patterns:
+        matches = re.findall(pattern, text_lower)
+        if matches:
+            try:
+                return int(matches[0])
+            except ValueError:
+                continue
+
+    return 0
+
+def legacy_extract_education_level(text):
+    """Original implementation"""
+    education_keywords = {
+        'phd': ['phd', 'ph.d', 'doctorate', 'doctoral'],
+        'masters': ['masters', 'master', 'm.s', 'msc', 'm.sc', 'mba', 'm.a'],
+        'bachelors': ['bachelors', 'bachelor', 'b.s', 'bsc', 'b.sc', 'b.a', 'ba', 'bs'],
+        'associates': ['associates', 'associate', 'a.s', 'aa'],
+        'high_school': ['high school', 'secondary', 'diploma']
+    }
+
+    text_lower = text.lower()
+
+    for level, keywords in education_keywords.items():
+        if any(keyword in text_lower for keyword in keywords):
+            return level
+
+    return 'unknown'
+
+def legacy_extract_job_titles(text):
+    """Original implementation"""
+    # Common job title patterns
+    title_patterns = [
+        r'(?:^|\n)\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s*(?:at|@|\|)',
+        r'(?:position|role|title)\s*:?\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
+        r'(?:worked as|served as)\s+(?:a\s+)?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
+    ]
+
+    job_titles = []
+
+    for pattern in title_patterns:
+        matches = re.findall(pattern, text, re.MULTILINE)
+        job_titles.extend(matches)
+
+    # Common job titles to look for
+    common_titles = [
+        'software engineer', 'developer', 'programmer', 'analyst', 'manager',
+        'intern', 'associate', 'specialist', 'consultant', 'coordinator',
+        'designer', 'architect', 'lead', 'senior', 'junior', 'data scientist'
+    ]
+
+    text_lower = text.lower()
+    for title in common_titles:
+        if title in text_lower:
+            job_titles.append(title)
+
+    return list(set(job_titles))
+
+def legacy_extract_fields(text):
+    """All fields through the original functions"""
+    return {
+        'email': legacy_extract_email(text),
+        'phone': legacy_extract_phone(text),
+        'experience_years': legacy_extract_experience_years(text),
+        'education_level': legacy_extract_education_level(text),
+        'job_titles': legacy_extract_job_titles(text)
+    }
+
+def check_corpus(corpus):
+    """Compare both implementations with the recorded expectations, return failures"""
+    failures = []
+    for number, case in enumerate(corpus):
+        for name, extract in (('engine', extract_fields), ('legacy', legacy_extract_fields)):
+            fields = extract(case['text'])
+            fields['job_titles'] = sorted(fields['job_titles'])
+            if fields != case['expected']:
+                failures.append((number, name, fields, case['expected']))
+    return failures
+
+def throughput(extract, documents, repeat):
+    """MB of text processed per second"""
+    size = sum(len(document.encode('utf-8')) for document in documents) * repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for document in documents:
+            extract(document)
+    return size / (time.perf_counter() - start) / 1e6
+
+def main():
+    """Run the regression check and the benchmark"""
+    parser = argparse.ArgumentParser(description='Check and benchmark CV field extraction')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--doc-size', type=int, default=6000, help='Approximate characters per synthetic CV')
+    args = parser.parse_args()
+
+    with open(CORPUS_PATH, encoding='utf-8') as file:
+        corpus = json.load(file)
+
+    failures = check_corpus(corpus)
+    if failures:
+        for number, name, got, expected in failures:
+            print(f"❌ Case {number} ({name}): got {got}, expected {expected}")
+        sys.exit(1)
+    print(f"✅ {len(corpus)} regression cases match")
+
+    # Synthetic CVs of about doc_size characters stitched from the corpus
+    texts = [case['text'] for case in corpus if case['text']]
+    documents = []
+    for offset in range(len(texts)):
+        parts, size = [], 0
+        while size < args.doc_size:
+            part = texts[(offset + len(parts)) % len(texts)]
+            parts.append(part)
+            size += len(part) + 1
+        documents.append('\n'.join(parts))
+
+    # The same documents with no phone/experience/degree near the top (worst case for first-match fields)
+    plain = [re.sub(r'[0-9@]', 'x', document) for document in documents]
+
+    print(f"📊 {len(documents)} CVs of ~{args.doc_size} characters, {args.repeat} rounds")
+    for label, docs in (('typical CVs', documents), ('no matches', plain)):
+        legacy = throughput(legacy_extract_fields, docs, args.repeat)
+        engine = throughput(extract_fields, docs, args.repeat)
+        print(f"   • {label:<12} legacy {legacy:6.2f} MB/s   engine {engine:6.2f} MB/s   {engine / legacy:.1f}x")
+
+if __name__ == "__main__":
+    main()
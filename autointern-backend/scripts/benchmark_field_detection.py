@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Fixture check and benchmark for static form field detection
+Serves fixture application pages from a local HTTP server and checks that
+the static-HTML tier answers server-rendered forms with the expected fields,
+and hands JavaScript-rendered or sparse pages to the browser with the right
+reason. Also times detection over the pooled session against a fresh
+connection per request.
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import requests
+from src.utils.static_forms import StaticFormDetector
+
+GREENHOUSE_FORM = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Apply: Software Engineering Intern</title></head>
+<body><form id="application_form" method="post" enctype="multipart/form-data">
+  <input type="hidden" name="authenticity_token" value="x">
+  <div class="field"><label for="first_name">First Name *</label><input type="text" id="first_name" name="job_application[first_name]"></div>
+  <div class="field"><label for="last_name">Last Name *</label><input type="text" id="last_name" name="job_application[last_name]"></div>
+  <div class="field"><label for="email">Email *</label><input type="text" id="email" name="job_application[email]"></div>
+  <div class="field"><label for="phone">Phone</label><input type="text" id="phone" name="job_application[phone]"></div>
+  <div class="field"><label>Resume/CV <input type="file" name="job_application[resume]"></label></div>
+  <div class="field"><label for="q1">LinkedIn Profile</label><input type="text" id="q1" name="job_application[answers][0][text_value]"></div>
+  <div class="field"><label for="q2">Website</label><input type="text" id="q2" name="job_application[answers][1][text_value]"></div>
+  <div class="field"><label for="cl">Cover Letter</label><textarea id="cl" name="job_application[cover_letter_text]"></textarea></div>
+  <input type="submit" value="Submit Application">
+</form></body></html>"""
+
+INDEED_FORM = """<html><body><form>
+  <input name="applicant.name"><input name="applicant.emailAddress">
+  <input name="applicant.phoneNumber"><textarea name="coverletter"></textarea>
+  <button type="submit">Continue</button>
+</form></body></html>"""
+
+# Served without a charset header; the encoding comes from <meta>
+ARABIC_FORM = """<html><head><meta charset="utf-8"></head><body><form dir="rtl">
+  <label for="a">الاسم الأول</label><input id="a" name="f1">
+  <label for="b">اسم العائلة</label><input id="b" name="f2">
+  <label for="c">البريد الإلكتروني</label><input id="c" name="f3">
+  <label for="d">رقم الهاتف</label><input id="d" name="f4" type="tel">
+</form></body></html>"""
+
+ARIA_FORM = """<html><body><div role="form">
+  <span id="n">Full name</span><input aria-labelledby="n">
+  <input aria-label="Email address" autocomplete="email">
+  <div>Mobile <input></div>
+  <input placeholder="GitHub username or URL">
+</div></body></html>"""
+
+SPA_SHELL = """<html><head><script src="/static/app.js"></script></head>
+<body><noscript>You need to enable JavaScript to run this app.</noscript><div id="root"></div></body></html>"""
+
+NEWSLETTER_PAGE = """<html><body><h1>Careers</h1><p>No open roles right now.</p>
+<form><input type="email" name="subscribe"><button>Notify me</button></form></body></html>"""
+
+# path: (body, content type, status)
+FIXTURES = {
+    '/greenhouse': (GREENHOUSE_FORM, 'text/html; charset=utf-8', 200),
+    '/indeed': (INDEED_FORM, 'text/html; charset=utf-8', 200),
+    '/arabic': (ARABIC_FORM, 'text/html', 200),
+    '/aria': (ARIA_FORM, 'text/html; charset=utf-8', 200),
+    '/spa': (SPA_SHELL, 'text/html; charset=utf-8', 200),
+    '/newsletter': (NEWSLETTER_PAGE, 'text/html; charset=utf-8', 200),
+    '/api': ('{"fields": []}', 'application/json', 200),
+    '/gone': ('Not found', 'text/html', 404)
+}
+
+# path: (answered by the static tier, fallback reason, fields that must be detected)
+EXPECTED = {
+    '/greenhouse': (True, None, {
+        'first_name', 'last_name', 'email', 'phone', 'resume', 'linkedin', 'portfolio', 'cover_letter'
+    }),
+    '/indeed': (True, None, {'name', 'email', 'phone', 'cover_letter'}),
+    '/arabic': (True, None, {'first_name', 'last_name', 'email', 'phone'}),
+    '/aria': (True, None, {'name', 'email', 'phone', 'github'}),
+    '/spa': (False, 'javascript_rendered', set()),
+    '/newsletter': (False, 'too_few_fields', {'email'}),
+    '/api': (False, 'fetch_failed', set()),
+    '/gone': (False, 'fetch_failed', set())
+}
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves FIXTURES with keep-alive, like a real site"""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, Nagle plus
+    # delayed ACKs add ~40 ms to every keep-alive response
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body, content_type, status = FIXTURES.get(self.path, ('Not found', 'text/html', 404))
+        payload = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def check_fixtures(detector, base_url):
+    """Run every fixture once and compare with EXPECTED; return the number of failures"""
+    failures = 0
+    for path, (answered, reason, fields) in EXPECTED.items():
+        result = detector.detect(base_url + path)
+        detected = set(result['detected_fields'])
+        tier = 'static' if result['answered'] else f"browser ({result['reason']})"
+        ok = result['answered'] == answered and result['reason'] == reason and fields <= detected
+        failures += not ok
+        print(f"   {'✅' if ok else '❌'} {path:<12} {tier:<30} {', '.join(sorted(detected)) or '-'}")
+        if not ok:
+            print(f"      expected answered={answered} reason={reason} fields ⊇ {sorted(fields)}")
+    return failures
+
+class UnpooledFormDetector(StaticFormDetector):
+    """The same detector opening a new connection for every page"""
+
+    def fetch(self, url):
+        response = requests.get(url, timeout=self.timeout, headers={'Connection': 'close'})
+        response.raise_for_status()
+        return response.content, None
+
+def time_detection(detector, url, rounds):
+    """Seconds per detection of one page"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        detector.detect(url)
+    return (time.perf_counter() - start) / rounds
+
+def main():
+    """Run the fixture checks and the benchmark"""
+    parser = argparse.ArgumentParser(description='Check and benchmark static form field detection')
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+
+    server = start_server()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    detector = StaticFormDetector()
+    try:
+        print(f"📊 Static form detection against fixtures at {base_url}")
+        failures = check_fixtures(detector, base_url)
+
+        pooled = time_detection(detector, base_url + '/greenhouse', args.rounds)
+        fresh = time_detection(UnpooledFormDetector(), base_url + '/greenhouse', args.rounds)
+        print(f"   • pooled session:      {pooled * 1000:.2f} ms per detection")
+        print(f"   • new connection each: {fresh * 1000:.2f} ms per detection")
+    finally:
+        server.shutdown()
+
+    if failures:
+        print(f"❌ {failures} fixture(s) did not match")
+        sys.exit(1)
+    print("✅ All fixtures matched")
+
+if __name__ == "__main__":
+    main()
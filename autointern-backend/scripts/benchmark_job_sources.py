@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the concurrent job source engine
+Compares sequential source calls with the fan-out engine using local fake sources.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.job_sources import FakeJobSource, JobSourceEngine
+
+def build_sources(latencies, timeout):
+    """Create fake sources with the given latencies (seconds)"""
+    return [
+        FakeJobSource(f'source{i + 1}', latency=latency, timeout=timeout)
+        for i, latency in enumerate(latencies)
+    ]
+
+def run_sequential(sources, keywords, location, job_type):
+    """Call every source one after another, like the original search_jobs"""
+    start = time.monotonic()
+    jobs = []
+    for source in sources:
+        jobs.extend(source.search(keywords, location, job_type))
+    return jobs, time.monotonic() - start
+
+def run_concurrent(engine, keywords, location, job_type):
+    """Call every source through the engine"""
+    start = time.monotonic()
+    result = engine.search(keywords, location, job_type)
+    return result, time.monotonic() - start
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark job source fan-out')
+    parser.add_argument('--latencies', default='0.2,0.3,0.25,1.5',
+                        help='Comma-separated fake source latencies in seconds')
+    parser.add_argument('--timeout', type=float, default=1.0,
+                        help='Per-source deadline in seconds')
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    latencies = [float(value) for value in args.latencies.split(',')]
+    sources = build_sources(latencies, args.timeout)
+
+    engine = JobSourceEngine(max_workers=len(sources))
+    for source in sources:
+        engine.register(source)
+
+    keywords = ['python', 'sql', 'react']
+
+    print(f"Sources: {len(sources)}  latencies: {latencies}  deadline: {args.timeout}s")
+    print("=" * 50)
+
+    for round_number in range(args.rounds):
+        jobs, sequential_time = run_sequential(sources, keywords, 'Remote', 'internship')
+        result, concurrent_time = run_concurrent(engine, keywords, 'Remote', 'internship')
+
+        print(f"Round {round_number + 1}:")
+        print(f"   • Sequential: {sequential_time * 1000:.1f} ms ({len(jobs)} jobs)")
+        print(f"   • Concurrent: {concurrent_time * 1000:.1f} ms ({len(result['jobs'])} jobs, partial={result['partial']})")
+        for name, info in result['sources'].items():
+            print(f"       - {name}: {info['status']} {info['elapsed_ms']} ms {info['error'] or ''}")
+
+    engine.shutdown()
+
+if __name__ == "__main__":
+    main()
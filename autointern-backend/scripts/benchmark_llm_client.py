@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the shared LLM client
+Runs against a local fake completion server: N prompts one after another
+versus generate_many(), with optional injected rate-limit errors to
+exercise the retry path.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.fake_llm import FakeCompletionServer
+from src.utils.llm_client import LLMClient
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark the LLM client')
+    parser.add_argument('--prompts', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.5)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--error-rate', type=float, default=0.1)
+    args = parser.parse_args()
+
+    prompts = [f"Write a cover letter for internship #{i}" for i in range(args.prompts)]
+
+    with FakeCompletionServer(latency=args.latency, error_rate=args.error_rate, seed=42) as server:
+        client = LLMClient(api_key='fake', api_base=server.api_base, max_concurrency=args.concurrency,
+                           backoff_base=0.05, backoff_max=1.0)
+
+        print(f"📊 {args.prompts} prompts, {args.latency}s latency, {args.error_rate:.0%} rate-limited responses")
+
+        start = time.monotonic()
+        for prompt in prompts:
+            client.generate(prompt, max_tokens=200)
+        serial = time.monotonic() - start
+        print(f"   • Serial:        {serial:.2f}s")
+
+        start = time.monotonic()
+        results = client.generate_many(prompts, max_tokens=200)
+        batched = time.monotonic() - start
+        failed = sum(1 for result in results if isinstance(result, Exception))
+        print(f"   • generate_many: {batched:.2f}s ({failed} failed)")
+
+        print(f"   • Speedup: {serial / batched:.1f}x")
+        print(f"   • Client stats: {client.stats()}")
+        print(f"   • Server saw {server.requests} requests, {server.rate_limited} rate-limited")
+
+if __name__ == "__main__":
+    main()
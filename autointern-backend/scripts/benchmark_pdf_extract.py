@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark for PDF text extraction
+Generates text PDFs of 1-100 pages and compares the old serial extraction
+(string concatenation page by page) with the page-parallel extractor, plus
+the time until the first page is available through iter_pages().
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import PyPDF2
+from src.utils.pdf_extract import PDFExtractor, DEFAULT_WORKERS
+
+def build_pdf(path, pages, lines_per_page=45):
+    """Write an uncompressed PDF with lines of CV-like text on every page"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        lines = [
+            f"({page + 1}.{line} Software engineering intern, Python, SQL, React, Docker; shipped features) Tj T*"
+            for line in range(lines_per_page)
+        ]
+        stream = ("BT /F1 9 Tf 11 TL 40 800 Td\n" + "\n".join(lines) + "\nET").encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> "
+            b"/Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % kid for kid in kids), pages)
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+
+    with open(path, 'wb') as file:
+        file.write(output)
+
+def serial_extract(path):
+    """The previous implementation: one page at a time, text += page"""
+    with open(path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        text = ""
+        for page in reader.pages:
+            text += page.extract_text() + "\n"
+    return text
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark PDF text extraction')
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 5, 10, 25, 50, 100])
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args()
+
+    extractor = PDFExtractor(workers=args.workers, max_pages=max(args.pages), max_bytes=64 * 1024 * 1024)
+    workdir = tempfile.mkdtemp(prefix='pdf-bench-')
+
+    # Start the worker processes before timing
+    warmup = os.path.join(workdir, 'warmup.pdf')
+    build_pdf(warmup, extractor.inline_page_limit + 1)
+    extractor.extract_text(warmup)
+
+    print(f"📊 PDF extraction, {args.workers} worker processes, {os.cpu_count()} CPUs")
+    print(f"   {'pages':>5}  {'serial':>8}  {'engine':>8}  {'first page':>10}  {'speedup':>7}")
+    try:
+        for pages in args.pages:
+            path = os.path.join(workdir, f'cv_{pages}.pdf')
+            build_pdf(path, pages)
+
+            start = time.perf_counter()
+            expected = serial_extract(path)
+            serial = time.perf_counter() - start
+
+            start = time.perf_counter()
+            text = extractor.extract_text(path)
+            engine = time.perf_counter() - start
+
+            start = time.perf_counter()
+            next(extractor.iter_pages(path))
+            first_page = time.perf_counter() - start
+
+            if text != expected:
+                print(f"❌ Extracted text differs for {pages} pages")
+                return
+            print(f"   {pages:>5}  {serial:>7.3f}s  {engine:>7.3f}s  {first_page:>9.3f}s  {serial / engine:>6.1f}x")
+    finally:
+        extractor.shutdown()
+
+    print("✅ Extracted text identical to the serial implementation")
+
+if __name__ == "__main__":
+    main()
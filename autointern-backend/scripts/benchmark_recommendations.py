@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark for /jobs/recommendations scoring
+Compares a full-catalog Python scan with the inverted skill index on a
+synthetic SQLite catalog (100k postings by default).
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from flask import Flask
+from src.models.user_enhanced import db, Internship
+from src.utils.skill_index import normalize_skills, rebuild_index, recommend
+
+SKILLS = [
+    'python', 'javascript', 'java', 'react', 'node.js', 'sql', 'html', 'css',
+    'machine learning', 'data science', 'docker', 'kubernetes', 'aws', 'azure',
+    'git', 'agile', 'scrum', 'testing', 'graphql', 'rest'
+] + [f'skill{i}' for i in range(2000)]
+
+def create_catalog(size, seed=42):
+    """Insert a synthetic catalog of internships with random keywords"""
+    rng = random.Random(seed)
+    batch = []
+    for i in range(size):
+        keywords = rng.sample(SKILLS[:20], 2) + rng.sample(SKILLS[20:], rng.randint(1, 6))
+        batch.append({
+            'title': f'Intern {i}',
+            'company': f'Company {i % 5000}',
+            'description': '',
+            'keywords': json.dumps(keywords)
+        })
+        if len(batch) == 5000:
+            db.session.execute(Internship.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.session.execute(Internship.__table__.insert(), batch)
+    db.session.commit()
+
+def full_scan(user_skills, limit):
+    """Score every internship in Python, like the original endpoint without its LIMIT 50"""
+    skills = set(normalize_skills(user_skills))
+    scores = []
+    for internship_id, keywords in db.session.query(Internship.id, Internship.keywords):
+        job_keywords = set(normalize_skills(json.loads(keywords)))
+        matching = skills & job_keywords
+        if matching:
+            scores.append((len(matching) / max(len(job_keywords), 1) * 100, internship_id))
+    scores.sort(reverse=True)
+    return scores[:limit]
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark job recommendations')
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=20)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'recommendations_benchmark.db')
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+
+        print(f"📊 Creating catalog of {args.size} internships...")
+        start = time.monotonic()
+        create_catalog(args.size)
+        print(f"   • Catalog created in {time.monotonic() - start:.1f}s")
+
+        start = time.monotonic()
+        postings = rebuild_index(batch_size=5000)
+        print(f"   • Indexed {postings} postings in {time.monotonic() - start:.1f}s")
+
+        rng = random.Random(7)
+        queries = [rng.sample(SKILLS[:20], 3) + rng.sample(SKILLS[20:], 5) for _ in range(args.queries)]
+
+        start = time.monotonic()
+        for skills in queries:
+            full_scan(skills, 10)
+        scan_time = (time.monotonic() - start) / len(queries)
+
+        start = time.monotonic()
+        for skills in queries:
+            recommend(skills, limit=10)
+        index_time = (time.monotonic() - start) / len(queries)
+
+        print("=" * 50)
+        print(f"   • Full scan: {scan_time * 1000:.1f} ms/query")
+        print(f"   • Skill index: {index_time * 1000:.1f} ms/query")
+        print(f"   • Speedup: {scan_time / max(index_time, 1e-9):.1f}x")
+
+    os.remove(db_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the BM25 internship ranking engine
+Builds an index over a synthetic catalog (1M postings by default) and
+measures build time, incremental add time and ranked query latency.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.search_ranking import BM25Index
+
+ROLES = ['software', 'data', 'frontend', 'backend', 'mobile', 'cloud', 'security', 'product',
+         'design', 'marketing', 'research', 'devops', 'machine', 'learning', 'analytics', 'finance']
+SKILLS = ['python', 'java', 'react', 'sql', 'docker', 'kubernetes', 'aws', 'excel', 'figma',
+          'pytorch', 'tensorflow', 'go', 'rust', 'node', 'spark', 'tableau'] + [f'tool{i}' for i in range(5000)]
+FILLER = ['team', 'work', 'build', 'learn', 'project', 'product', 'users', 'customers',
+          'collaborate', 'develop', 'support', 'growth', 'impact', 'scale'] + [f'word{i}' for i in range(20000)]
+
+def generate_documents(start, count, rng):
+    """Yield synthetic internship documents"""
+    for doc_id in range(start, start + count):
+        yield {
+            'id': doc_id,
+            'title': f"{rng.choice(ROLES)} {rng.choice(ROLES)} intern",
+            'description': ' '.join(rng.choices(FILLER, k=40) + rng.choices(SKILLS, k=5)),
+            'requirements': ' '.join(rng.choices(SKILLS, k=6))
+        }
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark BM25 ranking')
+    parser.add_argument('--size', type=int, default=1000000)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--increment', type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    index = BM25Index(merge_threshold=max(args.size // 10, 10000))
+
+    print(f"📊 Indexing {args.size} postings...")
+    start = time.monotonic()
+    batch = []
+    for document in generate_documents(0, args.size, rng):
+        batch.append(document)
+        if len(batch) == 10000:
+            index.add_documents(batch)
+            batch = []
+    index.add_documents(batch)
+    print(f"   • Built in {time.monotonic() - start:.1f}s ({len(index.vocabulary)} terms)")
+
+    start = time.monotonic()
+    index.add_documents(generate_documents(args.size, args.increment, rng))
+    print(f"   • Added {args.increment} postings incrementally in {(time.monotonic() - start) * 1000:.1f} ms")
+
+    queries = [
+        f"{rng.choice(ROLES)} {rng.choice(SKILLS[:16])} {rng.choice(SKILLS)}"
+        for _ in range(args.queries)
+    ]
+
+    # Warm up cached per-document arrays
+    index.search(queries[0])
+
+    for page in (1, 10):
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query, page=page, per_page=20)
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+        print(f"   • page {page}: p50 {latencies[len(latencies) // 2]:.1f} ms, "
+              f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.1f} ms")
+
+    ids, scores, total = index.search(queries[0])
+    print(f"   • Example '{queries[0]}': {total} hits, top ids {ids[:5]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the shared skill matcher
+Compares the original per-keyword substring loop with the single-pass
+token automaton for growing dictionary sizes.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.skill_matcher import SkillMatcher, load_skill_dictionary
+
+SAMPLE_CV = """
+John Doe - Software Engineer at Google
+Maintained backend services in Python and Go, built React frontends and
+node.js APIs. 3 years of experience with Docker, Kubernetes and AWS.
+Led machine learning projects using TensorFlow, pandas and scikit-learn.
+Strong communication and leadership skills; agile / scrum practitioner.
+"""
+
+def legacy_extract(keywords, text):
+    """Original implementation: one substring scan per keyword"""
+    text_lower = text.lower()
+    return [keyword for keyword in keywords if keyword in text_lower]
+
+def synthetic_terms(count, seed=1):
+    """Generate distinct multi-word synthetic skills"""
+    rng = random.Random(seed)
+    words = ['data', 'cloud', 'micro', 'service', 'graph', 'stream', 'edge', 'vision',
+             'quantum', 'secure', 'mobile', 'web', 'neural', 'search', 'batch', 'real']
+    terms = set()
+    while len(terms) < count:
+        terms.add(' '.join(rng.sample(words, rng.randint(1, 3))) + f' {rng.randint(0, 10 ** 6)}')
+    return list(terms)
+
+def time_call(func, repeat):
+    """Average wall time of func() in microseconds"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark skill matching')
+    parser.add_argument('--sizes', default='0,1000,10000,50000',
+                        help='Extra synthetic terms added to the skill dictionary')
+    parser.add_argument('--text-multiplier', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    text = SAMPLE_CV * args.text_multiplier
+    base_terms = load_skill_dictionary()
+
+    print(f"Text length: {len(text)} chars")
+    print("=" * 50)
+
+    for size in [int(value) for value in args.sizes.split(',')]:
+        terms = base_terms + synthetic_terms(size)
+        matcher = SkillMatcher(terms)
+
+        legacy_time = time_call(lambda: legacy_extract(terms, text), args.repeat)
+        matcher_time = time_call(lambda: matcher.find_all(text), args.repeat)
+
+        legacy_hits = set(legacy_extract(base_terms, text))
+        matcher_hits = set(matcher.find_all(text)) & set(base_terms)
+
+        print(f"Dictionary: {len(terms)} terms")
+        print(f"   • Substring loop: {legacy_time:.0f} µs")
+        print(f"   • Skill matcher:  {matcher_time:.0f} µs")
+        print(f"   • False positives removed: {sorted(legacy_hits - matcher_hits)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Create missing model indexes on an existing database
+db.create_all() only creates indexes together with new tables, so indexes
+added to models later have to be created explicitly.
+"""
+
+import os
+import sys
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from main_enhanced import app
+from src.models.user_enhanced import db
+
+def main():
+    """Create every index declared on the models if it does not exist"""
+    with app.app_context():
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=db.engine, checkfirst=True)
+                print(f"   • {table.name}.{index.name}")
+        print("✅ Indexes are up to date")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Migration script for the chat context columns
+Adds the rolling-summary and token-count columns to chat_sessions and
+chat_messages on existing databases. Counts for old messages are filled in
+lazily the next time their session is used.
+"""
+
+import os
+import sys
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from sqlalchemy import inspect, text
+from main_enhanced import app
+from src.models.user_enhanced import db
+
+NEW_COLUMNS = {
+    'chat_sessions': [
+        ('summary', 'TEXT'),
+        ('summary_message_id', 'INTEGER DEFAULT 0'),
+        ('summary_tokens', 'INTEGER DEFAULT 0'),
+        ('history_tokens', 'INTEGER'),
+        ('summary_updated_at', 'TIMESTAMP')
+    ],
+    'chat_messages': [
+        ('token_count', 'INTEGER')
+    ]
+}
+
+def main():
+    """Add any missing columns"""
+    with app.app_context():
+        print("📊 Migrating chat context columns...")
+        inspector = inspect(db.engine)
+        for table, columns in NEW_COLUMNS.items():
+            existing = {column['name'] for column in inspector.get_columns(table)}
+            for name, column_type in columns:
+                if name in existing:
+                    continue
+                with db.engine.begin() as conn:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}"))
+                print(f"   • Added {table}.{name}")
+        print("✅ Chat context columns are up to date")
+
+if __name__ == "__main__":
+    main()
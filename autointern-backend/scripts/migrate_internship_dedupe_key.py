@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Migration script for the internships.dedupe_key column
+Adds the column to existing databases, backfills keys in batches and creates
+the unique index used by the bulk job upsert.
+"""
+
+import os
+import sys
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from sqlalchemy import inspect, text
+from main_enhanced import app
+from src.models.user_enhanced import db, Internship
+from src.utils.job_ingest import internship_dedupe_key
+
+BATCH_SIZE = 1000
+
+def add_column_if_missing():
+    """Add the dedupe_key column if the table predates it"""
+    columns = [column['name'] for column in inspect(db.engine).get_columns('internships')]
+    if 'dedupe_key' in columns:
+        return False
+    with db.engine.begin() as conn:
+        conn.execute(text("ALTER TABLE internships ADD COLUMN dedupe_key VARCHAR(40)"))
+    return True
+
+def backfill_keys():
+    """Compute keys for rows without one; later duplicates keep a NULL key"""
+    seen = {key for (key,) in db.session.query(Internship.dedupe_key).filter(
+        Internship.dedupe_key.isnot(None)
+    )}
+    last_id = 0
+    updated = 0
+    duplicates = 0
+
+    while True:
+        rows = db.session.query(Internship.id, Internship.title, Internship.company, Internship.url).filter(
+            Internship.id > last_id,
+            Internship.dedupe_key.is_(None)
+        ).order_by(Internship.id).limit(BATCH_SIZE).all()
+
+        if not rows:
+            break
+
+        mappings = []
+        for row in rows:
+            key = internship_dedupe_key(row.title, row.company, row.url)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            mappings.append({'id': row.id, 'dedupe_key': key})
+
+        if mappings:
+            db.session.bulk_update_mappings(Internship, mappings)
+        db.session.commit()
+
+        updated += len(mappings)
+        last_id = rows[-1].id
+        print(f"   • Backfilled {updated} rows (up to id {last_id})")
+
+    return updated, duplicates
+
+def create_unique_index():
+    """Create the unique index the upsert conflicts on"""
+    with db.engine.begin() as conn:
+        conn.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_internships_dedupe_key ON internships (dedupe_key)"
+        ))
+
+def main():
+    """Run the migration"""
+    with app.app_context():
+        print("📊 Migrating internships.dedupe_key...")
+        if add_column_if_missing():
+            print("✅ Added dedupe_key column")
+
+        updated, duplicates = backfill_keys()
+        print(f"✅ Backfilled {updated} rows ({duplicates} duplicates left without a key)")
+
+        create_unique_index()
+        print("✅ Unique index ready")
+
+if __name__ == "__main__":
+    main()
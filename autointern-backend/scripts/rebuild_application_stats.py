@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Rebuild the materialized user_application_stats table
+Recomputes every user's counts from the applications table in one grouped
+query. Run once after deploying the table, or to repair drift.
+"""
+
+import os
+import sys
+import time
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from main_enhanced import app
+from src.models.user_enhanced import db, UserApplicationStats
+from src.utils.application_stats import rebuild_stats
+
+def main():
+    """Create the stats table if needed and rebuild it"""
+    with app.app_context():
+        UserApplicationStats.__table__.create(bind=db.engine, checkfirst=True)
+
+        print("📊 Rebuilding application stats...")
+        start = time.monotonic()
+        users = rebuild_stats(db.session)
+        print(f"✅ Rebuilt stats for {users} users in {time.monotonic() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
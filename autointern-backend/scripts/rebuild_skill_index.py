@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Rebuild the inverted skill index (internship_skills) from the internships table
+Run after bulk imports that bypass the ORM or after changing keyword extraction.
+"""
+
+import os
+import sys
+import time
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from main_enhanced import app
+from src.utils.skill_index import rebuild_index
+
+def main():
+    """Rebuild the index"""
+    with app.app_context():
+        print("📊 Rebuilding skill index...")
+        start = time.monotonic()
+        postings = rebuild_index()
+        print(f"✅ Indexed {postings} postings in {time.monotonic() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
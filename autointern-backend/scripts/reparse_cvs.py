@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Re-parse every stored CV with the current parser
+Streams cv_data rows in id order, re-runs skill, experience, education and
+job title extraction on a multiprocessing pool (spaCy batched per chunk) and
+writes each chunk back in one bulk update. Progress is checkpointed after
+every committed chunk, so an interrupted run continues with --resume.
+AI keywords are kept; only the parser-derived fields are refreshed.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import multiprocessing
+from collections import deque
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from main_enhanced import app
+from src.models.user_enhanced import db, CVData
+from src.routes.cv_parser import CV_PARSER_VERSION, extract_text_from_file, extract_skills_batch
+from src.utils.cv_fields import extract_fields
+from src.utils.pdf_extract import pdf_extractor
+
+DEFAULT_CHECKPOINT = os.path.join(tempfile.gettempdir(), 'autointern_reparse_cvs.json')
+
+def init_worker():
+    """Pool initializer: workers are already parallel, so extract PDFs inline"""
+    pdf_extractor.workers = 1
+
+def reparse_chunk(rows, from_files=False):
+    """Re-run the parser over a chunk of (id, text, file_path) rows (runs in a pool process)"""
+    texts = []
+    for row_id, text, file_path in rows:
+        if from_files and file_path and os.path.exists(file_path):
+            text = extract_text_from_file(file_path) or text
+        texts.append(text or '')
+
+    results = []
+    for (row_id, _, _), text, skills in zip(rows, texts, extract_skills_batch(texts)):
+        fields = extract_fields(text)
+        results.append({
+            'id': row_id,
+            'extracted_text': text,
+            'skills': skills,
+            'experience_years': fields['experience_years'],
+            'education_level': fields['education_level'],
+            'job_titles': fields['job_titles']
+        })
+    return results
+
+def iter_chunks(after_id, chunk_size, limit=None):
+    """Yield lists of (id, text, file_path) in id order, one keyset query per chunk"""
+    fetched = 0
+    while limit is None or fetched < limit:
+        size = chunk_size if limit is None else min(chunk_size, limit - fetched)
+        rows = db.session.query(CVData.id, CVData.extracted_text, CVData.file_path).filter(
+            CVData.id > after_id
+        ).order_by(CVData.id).limit(size).all()
+        db.session.rollback()
+        if not rows:
+            return
+        fetched += len(rows)
+        after_id = rows[-1][0]
+        yield [tuple(row) for row in rows]
+
+def write_chunk(results, from_files=False):
+    """Write a chunk of parse results in one bulk update, keeping AI keywords"""
+    ids = [result['id'] for result in results]
+    previous = {
+        row_id: (keywords, skills)
+        for row_id, keywords, skills in db.session.query(CVData.id, CVData.keywords, CVData.skills).filter(
+            CVData.id.in_(ids)
+        )
+    }
+
+    mappings = []
+    for result in results:
+        keywords, old_skills = previous.get(result['id'], (None, None))
+        # Keywords are skills plus AI keywords; keep the AI part, refresh the rest
+        ai_keywords = set(json.loads(keywords or '[]')) - set(json.loads(old_skills or '[]'))
+        mapping = {
+            'id': result['id'],
+            'skills': json.dumps(result['skills']),
+            'keywords': json.dumps(sorted(ai_keywords | set(result['skills']))),
+            'experience_years': result['experience_years'],
+            'education_level': result['education_level'],
+            'job_titles': json.dumps(result['job_titles'])
+        }
+        if from_files:
+            mapping['extracted_text'] = result['extracted_text']
+        mappings.append(mapping)
+
+    db.session.bulk_update_mappings(CVData, mappings)
+    db.session.commit()
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return {'last_id': 0, 'processed': 0}
+    with open(path) as file:
+        return json.load(file)
+
+def save_checkpoint(path, checkpoint):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as file:
+        json.dump(checkpoint, file)
+    os.replace(temp_path, path)
+
+def commit_next(pending, checkpoint, args, start, processed, total):
+    """Write the oldest in-flight chunk, checkpoint it and report throughput"""
+    last_id, result = pending.popleft()
+    results = result.get()
+    write_chunk(results, args.from_files)
+
+    checkpoint['last_id'] = last_id
+    checkpoint['processed'] += len(results)
+    save_checkpoint(args.checkpoint, checkpoint)
+
+    done = processed + len(results)
+    elapsed = time.monotonic() - start
+    print(f"   • {done}/{total} CVs, {done / elapsed:.1f} CVs/sec")
+    return len(results)
+
+def main():
+    """Re-parse CV data rows in parallel"""
+    parser = argparse.ArgumentParser(description='Re-parse stored CVs with the current parser')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=200)
+    parser.add_argument('--limit', type=int, help='Stop after this many CVs')
+    parser.add_argument('--from-files', action='store_true', help='Re-extract text from the stored files')
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT)
+    parser.add_argument('--resume', action='store_true', help='Continue after the last checkpointed CV')
+    args = parser.parse_args()
+
+    checkpoint = load_checkpoint(args.checkpoint) if args.resume else {'last_id': 0, 'processed': 0}
+    if checkpoint.get('parser_version') not in (None, CV_PARSER_VERSION):
+        print(f"⚠️  Checkpoint was written by parser version {checkpoint['parser_version']}, starting over")
+        checkpoint = {'last_id': 0, 'processed': 0}
+    checkpoint['parser_version'] = CV_PARSER_VERSION
+
+    with app.app_context():
+        total = CVData.query.filter(CVData.id > checkpoint['last_id']).count()
+        if args.limit:
+            total = min(total, args.limit)
+        print(f"📊 Re-parsing {total} CVs with {args.workers} workers (parser version {CV_PARSER_VERSION})")
+        if checkpoint['last_id']:
+            print(f"   • Resuming after CV id {checkpoint['last_id']} ({checkpoint['processed']} done earlier)")
+
+        start = time.monotonic()
+        processed = 0
+        with multiprocessing.Pool(args.workers, initializer=init_worker) as pool:
+            # Keep a bounded window of chunks in flight and commit them in id order
+            pending = deque()
+            chunks = iter_chunks(checkpoint['last_id'], args.chunk_size, args.limit)
+            for chunk in chunks:
+                pending.append((chunk[-1][0], pool.apply_async(reparse_chunk, (chunk, args.from_files))))
+                while pending and (len(pending) >= args.workers * 2 or pending[0][1].ready()):
+                    processed += commit_next(pending, checkpoint, args, start, processed, total)
+            while pending:
+                processed += commit_next(pending, checkpoint, args, start, processed, total)
+
+        elapsed = time.monotonic() - start
+        rate = processed / elapsed if elapsed else 0.0
+        print(f"✅ Re-parsed {processed} CVs in {elapsed:.1f}s ({rate:.1f} CVs/sec)")
+
+if __name__ == "__main__":
+    main()
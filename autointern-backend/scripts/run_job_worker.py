@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Run background job queue workers outside the web process
+Set JOB_QUEUE_WORKERS=0 on the web servers to only enqueue there and let
+this process do the work.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from main_enhanced import app
+from src.utils.job_queue import job_queue
+
+def main():
+    """Start the worker pool and wait until interrupted"""
+    parser = argparse.ArgumentParser(description='Run job queue workers')
+    parser.add_argument('--workers', type=int, default=app.config.get('JOB_QUEUE_WORKERS') or 4)
+    args = parser.parse_args()
+
+    job_queue.workers = args.workers
+    job_queue.start()
+    print(f"🚀 {args.workers} job workers running ({', '.join(sorted(job_queue.handlers))})")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("Stopping workers...")
+        job_queue.stop()
+        print("✅ Workers stopped")
+
+if __name__ == "__main__":
+    main()
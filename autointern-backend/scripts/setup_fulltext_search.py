@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Set up database full-text search for internships
+Creates the FTS5 table (SQLite) or tsvector column (PostgreSQL) with its sync
+triggers, backfills existing rows in short batches and, on PostgreSQL,
+builds the GIN index concurrently so the table stays writable throughout.
+Searches switch to the index only after all of that has finished.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Add the project root to the path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+from src.utils.fulltext_search import backfill_fulltext, create_search_index, install_fulltext, mark_fulltext_ready
+
+def main():
+    """Install and backfill the full-text index"""
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description='Set up internship full-text search')
+    parser.add_argument('--database-url', default=os.getenv('DATABASE_URL'))
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--skip-backfill', action='store_true')
+    args = parser.parse_args()
+
+    if not args.database_url:
+        print("❌ DATABASE_URL is not set (use --database-url)")
+        sys.exit(1)
+
+    engine = create_engine(args.database_url)
+
+    print(f"🚀 Setting up full-text search on {engine.dialect.name}...")
+    install_fulltext(engine)
+    print("✅ Search table/column and triggers created")
+
+    if not args.skip_backfill:
+        start = time.monotonic()
+
+        def progress(done, total, indexed):
+            print(f"   • {done}/{total} ids scanned, {indexed} rows indexed")
+
+        indexed = backfill_fulltext(engine, batch_size=args.batch_size, progress=progress)
+        print(f"✅ Backfilled {indexed} rows in {time.monotonic() - start:.1f}s")
+
+    create_search_index(engine)
+
+    if args.skip_backfill:
+        print("⚠️  Backfill skipped: searches keep the fallback until this runs without --skip-backfill")
+        return
+
+    mark_fulltext_ready(engine)
+    print("🎉 Full-text search is ready")
+
+if __name__ == "__main__":
+    main()
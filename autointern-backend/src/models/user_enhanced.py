@@ -115,6 +115,66 @@ class CVData(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+class CVProcessingJob(db.Model):
+    __tablename__ = 'cv_processing_jobs'
+    
+    # One row per upload; stages run on the background job queue (see cv_parser.process_cv_item)
+    id = db.Column(db.String(36), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    file_path = db.Column(db.String(500), nullable=False)
+    content_hash = db.Column(db.String(64), index=True)  # SHA-256 of the uploaded file
+    language = db.Column(db.String(10), default='en')
+    cache_hit = db.Column(db.Boolean, default=False)  # Parsed data reused from cv_parse_results
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, processing, completed, failed
+    current_stage = db.Column(db.String(50))
+    stages = db.Column(db.Text)  # JSON object of stage -> {status, started_at, duration_ms}
+    result = db.Column(db.Text)  # JSON of the parsed data once completed
+    error = db.Column(db.Text)
+    cv_data_id = db.Column(db.Integer, db.ForeignKey('cv_data.id'))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)
+    
+    def to_dict(self):
+        """Convert CV processing job to dictionary"""
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'content_hash': self.content_hash,
+            'language': self.language,
+            'cache_hit': self.cache_hit,
+            'status': self.status,
+            'current_stage': self.current_stage,
+            'stages': self.stages,
+            'result': self.result,
+            'error': self.error,
+            'cv_data_id': self.cv_data_id,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+        }
+
+class CVParseResult(db.Model):
+    __tablename__ = 'cv_parse_results'
+    
+    # Parsed output of a CV file, shared by every upload with the same content (see src/utils/cv_store.py)
+    content_hash = db.Column(db.String(64), primary_key=True)
+    parser_version = db.Column(db.Integer, primary_key=True)
+    language = db.Column(db.String(10), primary_key=True)
+    extracted_text = db.Column(db.Text)
+    parsed_data = db.Column(db.Text)  # JSON of email, phone, skills, keywords, experience, education, job titles
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convert parse result to dictionary"""
+        return {
+            'content_hash': self.content_hash,
+            'parser_version': self.parser_version,
+            'language': self.language,
+            'parsed_data': self.parsed_data,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
 class Internship(db.Model):
     __tablename__ = 'internships'
     
@@ -130,6 +190,7 @@ class Internship(db.Model):
     application_deadline = db.Column(db.Date)
     source = db.Column(db.String(100))  # Added source (e.g., 'scraped', 'manual')
     keywords = db.Column(db.Text)  # JSON string of job keywords
+    dedupe_key = db.Column(db.String(40), unique=True, index=True)  # Hash of normalized title/company/url
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -155,8 +216,27 @@ class Internship(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+class InternshipSkill(db.Model):
+    __tablename__ = 'internship_skills'
+    
+    # Inverted index: one posting per (skill, internship)
+    skill = db.Column(db.String(100), primary_key=True)
+    internship_id = db.Column(db.Integer, db.ForeignKey('internships.id', ondelete='CASCADE'), primary_key=True, index=True)
+    keyword_count = db.Column(db.Integer, nullable=False, default=1)  # Total keywords of the internship, for scoring
+    
+    def to_dict(self):
+        """Convert skill posting to dictionary"""
+        return {
+            'skill': self.skill,
+            'internship_id': self.internship_id,
+            'keyword_count': self.keyword_count
+        }
+
 class Application(db.Model):
     __tablename__ = 'applications'
+    __table_args__ = (
+        db.Index('ix_applications_user_status_applied', 'user_id', 'status', 'applied_date'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -194,6 +274,30 @@ class Application(db.Model):
             'internship': self.internship.to_dict() if self.internship else None
         }
 
+class UserApplicationStats(db.Model):
+    __tablename__ = 'user_application_stats'
+    
+    # Maintained in the same transaction as application writes (see src/utils/application_stats.py)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    total_applications = db.Column(db.Integer, nullable=False, default=0, index=True)
+    accepted_count = db.Column(db.Integer, nullable=False, default=0)
+    accepted_rate = db.Column(db.Float, nullable=False, default=0.0, index=True)
+    status_counts = db.Column(db.Text)  # JSON object of status -> count
+    last_applied_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convert application stats to dictionary"""
+        return {
+            'user_id': self.user_id,
+            'total_applications': self.total_applications,
+            'accepted_count': self.accepted_count,
+            'accepted_rate': self.accepted_rate,
+            'status_counts': self.status_counts,
+            'last_applied_at': self.last_applied_at.isoformat() if self.last_applied_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
 class ApplicationTracking(db.Model):
     __tablename__ = 'application_tracking'
     
@@ -217,6 +321,9 @@ class ApplicationTracking(db.Model):
 
 class ChatSession(db.Model):
     __tablename__ = 'chat_sessions'
+    __table_args__ = (
+        db.Index('ix_chat_sessions_user_updated', 'user_id', 'updated_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -224,6 +331,13 @@ class ChatSession(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Rolling conversation summary (see src/utils/chat_context.py)
+    summary = db.Column(db.Text)
+    summary_message_id = db.Column(db.Integer, default=0)  # Last message folded into the summary
+    summary_tokens = db.Column(db.Integer, default=0)
+    history_tokens = db.Column(db.Integer, default=0)  # Tokens in messages after the summary
+    summary_updated_at = db.Column(db.DateTime)
+    
     # Relationships
     messages = db.relationship('ChatMessage', backref='session', lazy=True, cascade='all, delete-orphan')
     
@@ -233,18 +347,25 @@ class ChatSession(db.Model):
             'id': self.id,
             'user_id': self.user_id,
             'session_id': self.session_id,
+            'summary': self.summary,
+            'summary_tokens': self.summary_tokens,
+            'history_tokens': self.history_tokens,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
 class ChatMessage(db.Model):
     __tablename__ = 'chat_messages'
+    __table_args__ = (
+        db.Index('ix_chat_messages_session_created', 'session_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     session_id = db.Column(db.Integer, db.ForeignKey('chat_sessions.id'), nullable=False)
     message_type = db.Column(db.String(20), nullable=False)  # 'user' or 'assistant'
     content = db.Column(db.Text, nullable=False)
     message_metadata = db.Column(db.Text)  # JSON string for additional data
+    token_count = db.Column(db.Integer)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def to_dict(self):
@@ -255,6 +376,36 @@ class ChatMessage(db.Model):
             'message_type': self.message_type,
             'content': self.content,
             'message_metadata': self.message_metadata,
+            'token_count': self.token_count,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+class FormFieldMapping(db.Model):
+    __tablename__ = 'form_field_mappings'
+    __table_args__ = (
+        db.Index('ix_form_field_mappings_url_detected', 'url_key', 'detected_at'),
+    )
+    
+    # Detected form fields shared by every user applying through the same page layout (see src/utils/field_mapping_cache.py)
+    url_key = db.Column(db.String(500), primary_key=True)  # normalized URL, job ids replaced by *
+    fingerprint = db.Column(db.String(40), primary_key=True)  # hash of the form's control structure
+    domain = db.Column(db.String(255), nullable=False, index=True)
+    field_mappings = db.Column(db.Text, nullable=False)  # JSON of field type -> selector and element info
+    tier = db.Column(db.String(20))  # detection tier that produced it: 'static' or 'browser'
+    hits = db.Column(db.Integer, default=0)
+    detected_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_hit_at = db.Column(db.DateTime)
+    
+    def to_dict(self):
+        """Convert field mapping to dictionary"""
+        return {
+            'url_key': self.url_key,
+            'fingerprint': self.fingerprint,
+            'domain': self.domain,
+            'field_mappings': self.field_mappings,
+            'tier': self.tier,
+            'hits': self.hits,
+            'detected_at': self.detected_at.isoformat() if self.detected_at else None,
+            'last_hit_at': self.last_hit_at.isoformat() if self.last_hit_at else None
+        }
+
@@ -1,15 +1,18 @@
-from flask import Blueprint, request, jsonify, current_app
-import openai
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 import json
+import time
 import uuid
 from datetime import datetime
 from src.models.user_enhanced import db, User, ChatSession, ChatMessage, Internship, Application
 from src.routes.auth_enhanced_github import verify_token
+from src.utils.llm_client import llm_client
+from src.utils.chat_context import chat_context
+from src.utils.pagination import keyset_page, page_size
+from sqlalchemy import func
 
 ai_chatbot_bp = Blueprint('ai_chatbot', __name__)
 
-# Initialize OpenAI client
-openai.api_key = current_app.config.get('OPENAI_API_KEY') if current_app else None
+MESSAGE_PREVIEW_LENGTH = 120
 
 def get_user_from_token(request):
     """Extract user from JWT token"""
@@ -48,6 +51,20 @@ def get_system_prompt(language='en'):
         
         Be helpful and professional in your responses."""
 
+def get_fallback_response(language='en'):
+    """Reply shown when the AI service fails"""
+    if language == 'ar':
+        return "عذراً، حدث خطأ في الاتصال بخدمة الذكاء الاصطناعي. يرجى المحاولة مرة أخرى."
+    return "Sorry, there was an error connecting to the AI service. Please try again."
+
+def build_chat_messages(chat_session, message, language='en'):
+    """Build the conversation context sent to the model (summary + recent messages within the token budget)"""
+    return chat_context.build_messages(chat_session, message, get_system_prompt(language))
+
+def format_sse(event, data):
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
 @ai_chatbot_bp.route('/chat/start', methods=['POST'])
 def start_chat_session():
     """Start a new chat session"""
@@ -99,63 +116,35 @@ def send_message(session_id):
         if not chat_session:
             return jsonify({'error': 'Chat session not found'}), 404
         
-        # Save user message
-        user_message = ChatMessage(
-            session_id=chat_session.id,
-            message_type='user',
-            content=message
-        )
-        db.session.add(user_message)
-        
-        # Get chat history for context
-        previous_messages = ChatMessage.query.filter_by(
-            session_id=chat_session.id
-        ).order_by(ChatMessage.created_at.desc()).limit(10).all()
-        
-        # Build conversation context
-        messages = [
-            {"role": "system", "content": get_system_prompt(language)}
-        ]
-        
-        # Add previous messages in reverse order (oldest first)
-        for msg in reversed(previous_messages):
-            role = "user" if msg.message_type == "user" else "assistant"
-            messages.append({"role": role, "content": msg.content})
+        messages = build_chat_messages(chat_session, message, language)
         
-        # Add current message
-        messages.append({"role": "user", "content": message})
+        # Save user message
+        chat_context.add_message(chat_session, 'user', message)
         
         # Get AI response
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
+            ai_response = llm_client.chat(
                 messages=messages,
                 max_tokens=1000,
                 temperature=0.7
             )
             
-            ai_response = response.choices[0].message.content
-            
         except Exception as openai_error:
             # Fallback response if OpenAI fails
-            if language == 'ar':
-                ai_response = "عذراً، حدث خطأ في الاتصال بخدمة الذكاء الاصطناعي. يرجى المحاولة مرة أخرى."
-            else:
-                ai_response = "Sorry, there was an error connecting to the AI service. Please try again."
+            ai_response = get_fallback_response(language)
         
         # Save AI response
-        ai_message = ChatMessage(
-            session_id=chat_session.id,
-            message_type='assistant',
-            content=ai_response
-        )
-        db.session.add(ai_message)
+        chat_context.add_message(chat_session, 'assistant', ai_response)
         
         # Update session timestamp
         chat_session.updated_at = datetime.utcnow()
         
         db.session.commit()
         
+        # Fold older turns into the session summary in the background
+        if chat_context.needs_summary(chat_session):
+            chat_context.schedule_summary(current_app._get_current_object(), chat_session.id)
+        
         return jsonify({
             'response': ai_response,
             'session_id': session_id
@@ -165,6 +154,114 @@ def send_message(session_id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@ai_chatbot_bp.route('/chat/<session_id>/message/stream', methods=['POST'])
+def stream_message(session_id):
+    """Send a message to the AI chatbot and stream the reply as server-sent events"""
+    started = time.monotonic()
+    try:
+        user = get_user_from_token(request)
+        if not user:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        data = request.get_json()
+        message = data.get('message', '').strip()
+        language = data.get('language', 'en')
+        
+        if not message:
+            return jsonify({'error': 'Message is required'}), 400
+        
+        # Find chat session
+        chat_session = ChatSession.query.filter_by(
+            session_id=session_id,
+            user_id=user.id
+        ).first()
+        
+        if not chat_session:
+            return jsonify({'error': 'Chat session not found'}), 404
+        
+        messages = build_chat_messages(chat_session, message, language)
+        
+        # Save user message
+        user_message = chat_context.add_message(chat_session, 'user', message)
+        
+        # Commit before streaming so no transaction stays open while tokens arrive
+        chat_session.updated_at = datetime.utcnow()
+        db.session.commit()
+        chat_session_id = chat_session.id
+        user_message_id = user_message.id
+        app = current_app._get_current_object()
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+    
+    def save_reply(content, timings, interrupted=False):
+        """Persist the assistant reply once the stream ends"""
+        if not content:
+            return None
+        timings['total_ms'] = round((time.monotonic() - started) * 1000, 1)
+        chat_session = db.session.get(ChatSession, chat_session_id)
+        ai_message = chat_context.add_message(
+            chat_session, 'assistant', content,
+            metadata=json.dumps(dict(timings, streamed=True, interrupted=interrupted))
+        )
+        chat_session.updated_at = datetime.utcnow()
+        db.session.commit()
+        
+        if chat_context.needs_summary(chat_session):
+            chat_context.schedule_summary(app, chat_session_id)
+        return ai_message
+    
+    def generate():
+        reply = []
+        timings = {'ttft_ms': None}
+        interrupted = False
+        
+        yield format_sse('start', {'session_id': session_id, 'message_id': user_message_id})
+        
+        try:
+            try:
+                for delta in llm_client.stream(messages, max_tokens=1000, temperature=0.7):
+                    if timings['ttft_ms'] is None:
+                        timings['ttft_ms'] = round((time.monotonic() - started) * 1000, 1)
+                    reply.append(delta)
+                    yield format_sse('token', {'delta': delta})
+            except Exception as openai_error:
+                if reply:
+                    # Keep what was already sent and tell the client the rest is missing
+                    interrupted = True
+                    yield format_sse('error', {'error': 'The AI response was interrupted'})
+                else:
+                    fallback = get_fallback_response(language)
+                    timings['ttft_ms'] = round((time.monotonic() - started) * 1000, 1)
+                    reply.append(fallback)
+                    yield format_sse('token', {'delta': fallback})
+        except GeneratorExit:
+            # Client disconnected: keep the partial reply
+            save_reply(''.join(reply), timings, interrupted=True)
+            raise
+        
+        try:
+            ai_message = save_reply(''.join(reply), timings, interrupted=interrupted)
+        except Exception as e:
+            db.session.rollback()
+            yield format_sse('error', {'error': str(e)})
+            return
+        
+        yield format_sse('done', {
+            'response': ''.join(reply),
+            'session_id': session_id,
+            'message_id': ai_message.id if ai_message else None,
+            'ttft_ms': timings['ttft_ms'],
+            'total_ms': timings.get('total_ms')
+        })
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @ai_chatbot_bp.route('/chat/<session_id>/history', methods=['GET'])
 def get_chat_history(session_id):
     """Get chat history for a session"""
@@ -182,35 +279,78 @@ def get_chat_history(session_id):
         if not chat_session:
             return jsonify({'error': 'Chat session not found'}), 404
         
-        # Get messages
-        messages = ChatMessage.query.filter_by(
-            session_id=chat_session.id
-        ).order_by(ChatMessage.created_at.asc()).all()
+        limit = page_size(request.args.get('limit'), default=50)
+        before = request.args.get('before')
+        after = request.args.get('after')
+        
+        # Latest page by default; ?before= pages back in time, ?after= fetches newer messages
+        messages, next_cursor = keyset_page(
+            ChatMessage.query.filter_by(session_id=chat_session.id),
+            ChatMessage.created_at, ChatMessage.id,
+            cursor=after or before, limit=limit, descending=not after
+        )
+        if not after:
+            messages.reverse()
         
         return jsonify({
             'session_id': session_id,
-            'messages': [msg.to_dict() for msg in messages]
+            'messages': [msg.to_dict() for msg in messages],
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None
         }), 200
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @ai_chatbot_bp.route('/chat/sessions', methods=['GET'])
 def get_user_chat_sessions():
-    """Get all chat sessions for the current user"""
+    """Get chat sessions for the current user, most recently active first"""
     try:
         user = get_user_from_token(request)
         if not user:
             return jsonify({'error': 'Authentication required'}), 401
         
-        sessions = ChatSession.query.filter_by(
-            user_id=user.id
-        ).order_by(ChatSession.updated_at.desc()).all()
+        sessions, next_cursor = keyset_page(
+            ChatSession.query.filter_by(user_id=user.id),
+            ChatSession.updated_at, ChatSession.id,
+            cursor=request.args.get('cursor'), limit=page_size(request.args.get('limit'))
+        )
+        
+        # Last message of every session on the page in two queries
+        previews = {}
+        if sessions:
+            last_ids = db.session.query(func.max(ChatMessage.id)).filter(
+                ChatMessage.session_id.in_([session.id for session in sessions])
+            ).group_by(ChatMessage.session_id)
+            rows = db.session.query(
+                ChatMessage.session_id,
+                ChatMessage.message_type,
+                func.substr(ChatMessage.content, 1, MESSAGE_PREVIEW_LENGTH),
+                ChatMessage.created_at
+            ).filter(ChatMessage.id.in_(last_ids)).all()
+            for chat_session_id, message_type, content, created_at in rows:
+                previews[chat_session_id] = {
+                    'message_type': message_type,
+                    'content': content,
+                    'created_at': created_at.isoformat() if created_at else None
+                }
+        
+        session_list = []
+        for session in sessions:
+            session_data = session.to_dict()
+            session_data['last_message'] = previews.get(session.id)
+            session_list.append(session_data)
         
         return jsonify({
-            'sessions': [session.to_dict() for session in sessions]
+            'sessions': session_list,
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None
         }), 200
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -229,6 +369,7 @@ def generate_cover_letter():
         user_skills = data.get('user_skills', '')
         user_experience = data.get('user_experience', '')
         language = data.get('language', 'en')
+        regenerate = data.get('regenerate', False)
         
         if not job_title or not company_name:
             return jsonify({'error': 'Job title and company name are required'}), 400
@@ -260,18 +401,16 @@ Experience: {user_experience}
 Please write a professional and compelling cover letter that highlights the applicant's qualifications and their fit for the position."""
         
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
+            cover_letter = llm_client.chat(
                 messages=[
                     {"role": "system", "content": "You are a professional career advisor specialized in writing cover letters."},
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=1500,
-                temperature=0.7
+                temperature=0.7,
+                cache_endpoint=None if regenerate else 'cover_letter'
             )
             
-            cover_letter = response.choices[0].message.content
-            
         except Exception as openai_error:
             if language == 'ar':
                 cover_letter = "عذراً، حدث خطأ في توليد رسالة التغطية. يرجى المحاولة مرة أخرى."
@@ -340,8 +479,7 @@ Please select the top 5 most suitable internship opportunities from the followin
 Please rank the choices by suitability and provide a reason for each selection."""
         
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
+            recommendations = llm_client.chat(
                 messages=[
                     {"role": "system", "content": "You are a career advisor specialized in matching candidates with suitable job opportunities."},
                     {"role": "user", "content": prompt}
@@ -350,8 +488,6 @@ Please rank the choices by suitability and provide a reason for each selection."
                 temperature=0.7
             )
             
-            recommendations = response.choices[0].message.content
-            
         except Exception as openai_error:
             if language == 'ar':
                 recommendations = "عذراً، حدث خطأ في توليد التوصيات. يرجى المحاولة مرة أخرى."
@@ -410,8 +546,7 @@ Please provide:
 4. Important keywords to add"""
         
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
+            suggestions = llm_client.chat(
                 messages=[
                     {"role": "system", "content": "You are a professional resume reviewer and career advisor."},
                     {"role": "user", "content": prompt}
@@ -420,8 +555,6 @@ Please provide:
                 temperature=0.7
             )
             
-            suggestions = response.choices[0].message.content
-            
         except Exception as openai_error:
             if language == 'ar':
                 suggestions = "عذراً، حدث خطأ في تحليل السيرة الذاتية. يرجى المحاولة مرة أخرى."
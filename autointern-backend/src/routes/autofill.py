@@ -4,15 +4,24 @@ import requests
 from datetime import datetime
 from src.models.user_enhanced import db, User, UserProfile, CVData, Internship, Application
 from src.routes.auth_enhanced_github import verify_token
-from selenium import webdriver
+from src.utils.application_stats import record_application
+from src.utils.browser_pool import browser_pool, BrowserPoolExhausted
+from src.utils.page_waits import page_waiter, phrases_in_text, text_contains_any
+from src.utils.form_fields import field_classifier, scan_form_fields
+from src.utils.static_forms import static_form_detector
+from src.utils.field_mapping_cache import field_mapping_cache, dom_fingerprint
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementNotInteractableException
 import time
 import os
 
+# Page text that indicates an application went through
+SUBMISSION_SUCCESS_INDICATORS = [
+    'thank you', 'success', 'submitted', 'received',
+    'شكرا', 'نجح', 'تم الإرسال', 'تم الاستلام'
+]
+
 autofill_bp = Blueprint('autofill', __name__)
 
 def get_user_from_token(request):
@@ -29,22 +38,6 @@ def get_user_from_token(request):
     
     return User.query.get(user_id)
 
-def setup_chrome_driver():
-    """Setup Chrome driver for web automation"""
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--disable-gpu')
-    chrome_options.add_argument('--window-size=1920,1080')
-    
-    try:
-        driver = webdriver.Chrome(options=chrome_options)
-        return driver
-    except Exception as e:
-        print(f"Error setting up Chrome driver: {e}")
-        return None
-
 @autofill_bp.route('/autofill/profile', methods=['GET'])
 def get_autofill_profile():
     """Get user's autofill profile data"""
@@ -133,62 +126,78 @@ def detect_form_fields():
         
         data = request.get_json()
         url = data.get('url')
+        refresh = data.get('refresh', False)
         
         if not url:
             return jsonify({'error': 'URL is required'}), 400
         
-        driver = setup_chrome_driver()
-        if not driver:
+        # Forms detected recently for the same page layout are shared by all users
+        cached = None if refresh else field_mapping_cache.get(url)
+        if cached:
+            db.session.commit()
+            return jsonify({
+                'url': url,
+                'detected_fields': cached['field_mappings'],
+                'total_fields': len(cached['field_mappings']),
+                'tier': 'cache',
+                'detected_by': cached['tier'],
+                'fingerprint': cached['fingerprint'],
+                'cached_at': cached['cached_at']
+            }), 200
+        
+        # Server-rendered forms are answered from the HTML alone, without a browser
+        static_result = static_form_detector.detect(url)
+        if static_result['answered']:
+            fingerprint = dom_fingerprint(static_result['controls'])
+            field_mapping_cache.put(db.session, url, fingerprint, static_result['detected_fields'], 'static')
+            db.session.commit()
+            return jsonify({
+                'url': url,
+                'detected_fields': static_result['detected_fields'],
+                'total_fields': len(static_result['detected_fields']),
+                'controls_scanned': len(static_result['controls']),
+                'tier': 'static',
+                'fingerprint': fingerprint,
+                'static_seconds': static_result['seconds']
+            }), 200
+        
+        try:
+            session = browser_pool.checkout()
+        except BrowserPoolExhausted:
+            return jsonify({'error': 'All browser sessions are busy, please retry shortly'}), 503
+        except Exception as e:
+            print(f"Error setting up Chrome driver: {e}")
             return jsonify({'error': 'Failed to setup web driver'}), 500
+        driver = session.driver
         
         try:
-            driver.get(url)
-            time.sleep(3)  # Wait for page to load
-            
-            # Common field selectors and their types
-            field_mappings = {
-                'name': ['input[name*="name"]', 'input[id*="name"]', 'input[placeholder*="name"]'],
-                'first_name': ['input[name*="first"]', 'input[id*="first"]', 'input[placeholder*="first"]'],
-                'last_name': ['input[name*="last"]', 'input[id*="last"]', 'input[placeholder*="last"]'],
-                'email': ['input[type="email"]', 'input[name*="email"]', 'input[id*="email"]'],
-                'phone': ['input[type="tel"]', 'input[name*="phone"]', 'input[id*="phone"]'],
-                'linkedin': ['input[name*="linkedin"]', 'input[id*="linkedin"]', 'input[placeholder*="linkedin"]'],
-                'github': ['input[name*="github"]', 'input[id*="github"]', 'input[placeholder*="github"]'],
-                'portfolio': ['input[name*="portfolio"]', 'input[id*="portfolio"]', 'input[name*="website"]'],
-                'cover_letter': ['textarea[name*="cover"]', 'textarea[id*="cover"]', 'textarea[name*="letter"]'],
-                'resume': ['input[type="file"]', 'input[name*="resume"]', 'input[name*="cv"]']
-            }
-            
-            detected_fields = {}
+            waits = page_waiter.session(driver)
+            waits.page_ready(url)
             
-            for field_type, selectors in field_mappings.items():
-                for selector in selectors:
-                    try:
-                        elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                        if elements:
-                            element = elements[0]
-                            detected_fields[field_type] = {
-                                'selector': selector,
-                                'tag': element.tag_name,
-                                'type': element.get_attribute('type'),
-                                'name': element.get_attribute('name'),
-                                'id': element.get_attribute('id'),
-                                'placeholder': element.get_attribute('placeholder')
-                            }
-                            break
-                    except Exception:
-                        continue
+            # One script describes every form control, then each is classified locally
+            controls = scan_form_fields(driver)
+            detected_fields = field_classifier.classify(controls)
+            fingerprint = dom_fingerprint(controls)
+            field_mapping_cache.put(db.session, url, fingerprint, detected_fields, 'browser')
+            db.session.commit()
             
             return jsonify({
                 'url': url,
                 'detected_fields': detected_fields,
-                'total_fields': len(detected_fields)
+                'total_fields': len(detected_fields),
+                'controls_scanned': len(controls),
+                'tier': 'browser',
+                'fingerprint': fingerprint,
+                'static_fallback_reason': static_result['reason'],
+                'static_seconds': static_result['seconds'],
+                'waits': waits.to_dict()
             }), 200
             
         finally:
-            driver.quit()
+            browser_pool.checkin(session)
             
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @autofill_bp.route('/autofill/fill-form', methods=['POST'])
@@ -207,6 +216,13 @@ def autofill_form():
         if not url:
             return jsonify({'error': 'URL is required'}), 400
         
+        # Without explicit mappings, use the ones detected for this page layout
+        cached = None
+        if not field_mappings:
+            cached = field_mapping_cache.get(url)
+            if cached:
+                field_mappings = cached['field_mappings']
+        
         # Get user profile data
         profile = UserProfile.query.filter_by(user_id=user.id).first()
         
@@ -224,16 +240,36 @@ def autofill_form():
             **custom_data
         }
         
-        driver = setup_chrome_driver()
-        if not driver:
+        try:
+            session = browser_pool.checkout()
+        except BrowserPoolExhausted:
+            return jsonify({'error': 'All browser sessions are busy, please retry shortly'}), 503
+        except Exception as e:
+            print(f"Error setting up Chrome driver: {e}")
             return jsonify({'error': 'Failed to setup web driver'}), 500
+        driver = session.driver
         
         try:
-            driver.get(url)
-            time.sleep(3)  # Wait for page to load
+            # Ready once any of the mapped fields has rendered
+            selectors = [info.get('selector') for info in field_mappings.values() if info.get('selector')]
+            waits = page_waiter.session(driver)
+            waits.page_ready(url, ', '.join(selectors))
+            
+            if cached:
+                # The form may have changed since it was cached: compare its structure (one round trip)
+                controls = scan_form_fields(driver)
+                fingerprint = dom_fingerprint(controls)
+                if fingerprint != cached['fingerprint']:
+                    variant = field_mapping_cache.get_variant(url, fingerprint)
+                    if variant:
+                        field_mappings = variant['field_mappings']
+                    else:
+                        field_mappings = field_classifier.classify(controls)
+                        field_mapping_cache.put(db.session, url, fingerprint, field_mappings, 'browser')
             
             filled_fields = []
             errors = []
+            stale_selectors = []
             
             for field_type, field_info in field_mappings.items():
                 if field_type in fill_data and fill_data[field_type]:
@@ -261,12 +297,24 @@ def autofill_form():
                                 'selector': selector
                             })
                             
+                    except (NoSuchElementException, ElementNotInteractableException) as e:
+                        # Only a cached selector that no longer matches the page says anything about the cache
+                        if cached:
+                            stale_selectors.append(field_info.get('selector'))
+                        errors.append({
+                            'field': field_type,
+                            'error': str(e)
+                        })
                     except Exception as e:
                         errors.append({
                             'field': field_type,
                             'error': str(e)
                         })
             
+            # Selectors that no longer work must not be handed to the next user
+            invalidated = field_mapping_cache.invalidate(db.session, url, stale_selectors) if stale_selectors else 0
+            db.session.commit()
+            
             # Take screenshot for verification
             screenshot_path = f"/tmp/autofill_screenshot_{user.id}_{int(time.time())}.png"
             driver.save_screenshot(screenshot_path)
@@ -276,13 +324,17 @@ def autofill_form():
                 'filled_fields': filled_fields,
                 'errors': errors,
                 'screenshot_path': screenshot_path,
+                'mappings_source': 'cache' if cached else 'request',
+                'cache_invalidated': invalidated,
+                'waits': waits.to_dict(),
                 'message': f'Successfully filled {len(filled_fields)} fields'
             }), 200
             
         finally:
-            driver.quit()
+            browser_pool.checkin(session)
             
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @autofill_bp.route('/autofill/submit-application', methods=['POST'])
@@ -301,32 +353,43 @@ def submit_application():
         if not url:
             return jsonify({'error': 'URL is required'}), 400
         
-        driver = setup_chrome_driver()
-        if not driver:
+        try:
+            session = browser_pool.checkout()
+        except BrowserPoolExhausted:
+            return jsonify({'error': 'All browser sessions are busy, please retry shortly'}), 503
+        except Exception as e:
+            print(f"Error setting up Chrome driver: {e}")
             return jsonify({'error': 'Failed to setup web driver'}), 500
+        driver = session.driver
         
         try:
-            driver.get(url)
-            time.sleep(3)
+            waits = page_waiter.session(driver)
+            waits.page_ready(url, selector=None)
             
             # Find and click submit button
             try:
-                submit_button = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, submit_selector))
+                submit_button = waits.until(
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, submit_selector)),
+                    'submit_clickable', page_waiter.element_timeout, required=True
                 )
+                submitted_from = driver.current_url
+                # Indicators the form page already shows (e.g. in help text) say nothing about the submission
+                shown_before = phrases_in_text(driver, SUBMISSION_SUCCESS_INDICATORS)
                 submit_button.click()
                 
-                # Wait for submission to complete
-                time.sleep(5)
+                # Wait for submission to complete: the page navigates or re-renders, or shows a confirmation
+                waits.until(EC.any_of(
+                    EC.url_changes(submitted_from),
+                    EC.staleness_of(submit_button),
+                    text_contains_any(SUBMISSION_SUCCESS_INDICATORS, shown_before)
+                ), 'submit_response', page_waiter.submit_timeout)
+                waits.document_ready('submit_document_ready')
+                waits.network_idle('submit_network_idle')
                 
-                # Check for success indicators
-                success_indicators = [
-                    'thank you', 'success', 'submitted', 'received',
-                    'شكرا', 'نجح', 'تم الإرسال', 'تم الاستلام'
-                ]
-                
-                page_text = driver.page_source.lower()
-                submission_successful = any(indicator in page_text for indicator in success_indicators)
+                # Successful when a new indicator appeared, or the browser moved to a page showing one
+                shown_after = phrases_in_text(driver, SUBMISSION_SUCCESS_INDICATORS)
+                navigated = driver.current_url != submitted_from
+                submission_successful = bool(set(shown_after) - set(shown_before)) or (navigated and bool(shown_after))
                 
                 # Record application in database
                 if internship_id and submission_successful:
@@ -340,22 +403,25 @@ def submit_application():
                             applied_date=datetime.utcnow()
                         )
                         db.session.add(application)
+                        record_application(db.session, user.id, application.status, application.applied_date)
                         db.session.commit()
                 
                 return jsonify({
                     'success': submission_successful,
                     'message': 'Application submitted successfully' if submission_successful else 'Submission status unclear',
-                    'current_url': driver.current_url
+                    'current_url': driver.current_url,
+                    'waits': waits.to_dict()
                 }), 200
                 
             except TimeoutException:
                 return jsonify({
                     'success': False,
-                    'error': 'Submit button not found or not clickable'
+                    'error': 'Submit button not found or not clickable',
+                    'waits': waits.to_dict()
                 }), 400
                 
         finally:
-            driver.quit()
+            browser_pool.checkin(session)
             
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -404,6 +470,10 @@ def get_autofill_templates():
         }
     }
     
+    # Sites whose forms were detected recently become templates as well
+    for key, template in field_mapping_cache.templates().items():
+        templates.setdefault(key, template)
+    
     return jsonify({'templates': templates}), 200
 
 @autofill_bp.route('/autofill/history', methods=['GET'])
@@ -1,25 +1,25 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, url_for
 import os
 import json
-import re
+import time
+import uuid
 from datetime import datetime
-from werkzeug.utils import secure_filename
-import PyPDF2
 import docx
-from src.models.user_enhanced import db, User, UserProfile, CVData
+from src.models.user_enhanced import db, User, UserProfile, CVData, CVProcessingJob
 from src.routes.auth_enhanced_github import verify_token
-import openai
-import spacy
+from src.utils.skill_matcher import extract_skills_from_text
+from src.utils.cv_fields import (
+    FieldAccumulator, extract_fields, find_email, find_phone, find_experience_years, find_education_level, find_job_titles
+)
+from src.utils.llm_client import llm_client
+from src.utils.job_queue import job_queue
+from src.utils.pdf_extract import pdf_extractor
+from src.utils.nlp_pipeline import nlp_pipeline
+from src.utils.cv_store import save_upload, get_parse_result, store_parse_result
 from collections import Counter
 
 cv_parser_bp = Blueprint('cv_parser', __name__)
 
-# Load spaCy model for NLP (you might need to install: python -m spacy download en_core_web_sm)
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    nlp = None
-
 def get_user_from_token(request):
     """Extract user from JWT token"""
     auth_header = request.headers.get('Authorization')
@@ -42,24 +42,32 @@ def allowed_file(filename):
 def extract_text_from_pdf(file_path):
     """Extract text from PDF file"""
     try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-        return text
+        return pdf_extractor.extract_text(file_path)
     except Exception as e:
         print(f"Error extracting PDF text: {e}")
         return ""
 
+def parse_pdf_pages(file_path):
+    """Extract a PDF while matching skills and CV fields on each page as it arrives
+
+    Returns (text, dictionary skills, fields); text is '' when extraction fails.
+    """
+    fields = FieldAccumulator()
+    skills = set()
+    try:
+        for page in pdf_extractor.iter_pages(file_path):
+            skills.update(extract_skills_from_text(fields.tail + page))
+            fields.feed(page)
+    except Exception as e:
+        print(f"Error extracting PDF text: {e}")
+        return "", [], None
+    return fields.text, list(skills), fields.result()
+
 def extract_text_from_docx(file_path):
     """Extract text from DOCX file"""
     try:
         doc = docx.Document(file_path)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+        return ''.join(paragraph.text + "\n" for paragraph in doc.paragraphs)
     except Exception as e:
         print(f"Error extracting DOCX text: {e}")
         return ""
@@ -88,123 +96,60 @@ def extract_text_from_file(file_path):
 
 def extract_email(text):
     """Extract email addresses from text"""
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    emails = re.findall(email_pattern, text)
-    return emails[0] if emails else None
+    return find_email(text)
 
 def extract_phone(text):
     """Extract phone numbers from text"""
-    phone_patterns = [
-        r'\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}',
-        r'\+?[0-9]{1,3}[-.\s]?[0-9]{3,4}[-.\s]?[0-9]{3,4}[-.\s]?[0-9]{3,4}',
-        r'\b[0-9]{10,15}\b'
-    ]
+    return find_phone(text)
+
+# Noun phrases containing one of these are kept as skills
+TECH_INDICATORS = ['development', 'programming', 'software', 'web', 'mobile', 'data']
+
+def add_noun_phrase_skills(doc, found_skills):
+    """Add tech-related noun phrases from a parsed spaCy doc to found_skills"""
+    if doc is None:
+        return found_skills
     
-    for pattern in phone_patterns:
-        phones = re.findall(pattern, text)
-        if phones:
-            return phones[0]
-    return None
+    # Extract noun phrases that might be skills
+    for chunk in doc.noun_chunks:
+        phrase = chunk.text.lower()
+        if len(phrase.split()) <= 3 and phrase not in found_skills:
+            # Simple heuristic: if it contains tech-related words
+            if any(indicator in phrase for indicator in TECH_INDICATORS):
+                found_skills.append(phrase)
+    
+    return found_skills
 
 def extract_skills(text):
     """Extract skills from CV text"""
-    # Common technical skills
-    tech_skills = [
-        'python', 'java', 'javascript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'swift',
-        'html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask',
-        'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch',
-        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'github',
-        'machine learning', 'deep learning', 'ai', 'data science', 'analytics',
-        'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy',
-        'project management', 'agile', 'scrum', 'leadership', 'communication'
-    ]
-    
-    text_lower = text.lower()
-    found_skills = []
-    
-    for skill in tech_skills:
-        if skill in text_lower:
-            found_skills.append(skill)
+    # Match the shared skill dictionary in a single pass
+    found_skills = extract_skills_from_text(text)
     
     # Use spaCy for additional skill extraction if available
-    if nlp:
-        doc = nlp(text)
-        # Extract noun phrases that might be skills
-        for chunk in doc.noun_chunks:
-            if len(chunk.text.split()) <= 3 and chunk.text.lower() not in found_skills:
-                # Simple heuristic: if it contains tech-related words
-                tech_indicators = ['development', 'programming', 'software', 'web', 'mobile', 'data']
-                if any(indicator in chunk.text.lower() for indicator in tech_indicators):
-                    found_skills.append(chunk.text.lower())
+    add_noun_phrase_skills(nlp_pipeline.process(text), found_skills)
     
     return list(set(found_skills))
 
+def extract_skills_batch(texts, batch_size=None, n_process=None):
+    """Extract skills from many CV texts through one batched spaCy pipeline"""
+    texts = list(texts)
+    docs = nlp_pipeline.pipe(texts, batch_size=batch_size, n_process=n_process)
+    return [
+        list(set(add_noun_phrase_skills(doc, extract_skills_from_text(text))))
+        for text, doc in zip(texts, docs)
+    ]
+
 def extract_experience_years(text):
     """Extract years of experience from CV text"""
-    experience_patterns = [
-        r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-        r'experience\s*:?\s*(\d+)\+?\s*years?',
-        r'(\d+)\+?\s*years?\s*in\s*(?:the\s*)?(?:field|industry)',
-    ]
-    
-    text_lower = text.lower()
-    
-    for pattern in experience_patterns:
-        matches = re.findall(pattern, text_lower)
-        if matches:
-            try:
-                return int(matches[0])
-            except ValueError:
-                continue
-    
-    return 0
+    return find_experience_years(text.lower())
 
 def extract_education_level(text):
     """Extract education level from CV text"""
-    education_keywords = {
-        'phd': ['phd', 'ph.d', 'doctorate', 'doctoral'],
-        'masters': ['masters', 'master', 'm.s', 'msc', 'm.sc', 'mba', 'm.a'],
-        'bachelors': ['bachelors', 'bachelor', 'b.s', 'bsc', 'b.sc', 'b.a', 'ba', 'bs'],
-        'associates': ['associates', 'associate', 'a.s', 'aa'],
-        'high_school': ['high school', 'secondary', 'diploma']
-    }
-    
-    text_lower = text.lower()
-    
-    for level, keywords in education_keywords.items():
-        if any(keyword in text_lower for keyword in keywords):
-            return level
-    
-    return 'unknown'
+    return find_education_level(text.lower())
 
 def extract_job_titles(text):
     """Extract job titles from CV text"""
-    # Common job title patterns
-    title_patterns = [
-        r'(?:^|\n)\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s*(?:at|@|\|)',
-        r'(?:position|role|title)\s*:?\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-        r'(?:worked as|served as)\s+(?:a\s+)?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
-    ]
-    
-    job_titles = []
-    
-    for pattern in title_patterns:
-        matches = re.findall(pattern, text, re.MULTILINE)
-        job_titles.extend(matches)
-    
-    # Common job titles to look for
-    common_titles = [
-        'software engineer', 'developer', 'programmer', 'analyst', 'manager',
-        'intern', 'associate', 'specialist', 'consultant', 'coordinator',
-        'designer', 'architect', 'lead', 'senior', 'junior', 'data scientist'
-    ]
-    
-    text_lower = text.lower()
-    for title in common_titles:
-        if title in text_lower:
-            job_titles.append(title)
-    
-    return list(set(job_titles))
+    return find_job_titles(text, text.lower())
 
 def extract_keywords_ai(text, language='en'):
     """Use AI to extract keywords from CV"""
@@ -234,17 +179,15 @@ Please extract:
 
 Provide the result as a comma-separated list."""
         
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
+        keywords_text = llm_client.chat(
             messages=[
                 {"role": "system", "content": "You are an expert CV analyzer."},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=500,
-            temperature=0.3
+            temperature=0.3,
+            cache_endpoint='cv_keywords'
         )
-        
-        keywords_text = response.choices[0].message.content
         keywords = [kw.strip() for kw in keywords_text.split(',')]
         return keywords
         
@@ -252,9 +195,191 @@ Provide the result as a comma-separated list."""
         print(f"Error extracting keywords with AI: {e}")
         return []
 
+# Processing stages in the order they run, used for progress reporting
+CV_PROCESSING_STAGES = ['extract', 'parse', 'ai_keywords', 'save']
+
+# Bump when extraction or parsing changes so stored parse results are not reused
+CV_PARSER_VERSION = 1
+
+def start_cv_stage(processing, stages, stage):
+    """Mark a processing stage as running and publish it for status polling"""
+    stages[stage] = {'status': 'running', 'started_at': datetime.utcnow().isoformat(), 'duration_ms': None}
+    processing.current_stage = stage
+    processing.stages = json.dumps(stages)
+    db.session.commit()
+    return time.perf_counter()
+
+def finish_cv_stage(processing, stages, stage, started, commit=True):
+    """Record a finished stage with its duration"""
+    stages[stage]['status'] = 'completed'
+    stages[stage]['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    processing.stages = json.dumps(stages)
+    if commit:
+        db.session.commit()
+
+def skip_cv_stages(stages, names):
+    """Mark stages answered from a stored parse result"""
+    for name in names:
+        stages[name] = {'status': 'skipped', 'started_at': None, 'duration_ms': 0.0}
+
+def save_parsed_cv(user_id, file_path, extracted_text, parsed_data):
+    """Write CV data and backfill the profile in the current transaction (no commit)"""
+    cv_data = CVData.query.filter_by(user_id=user_id).with_for_update().first()
+    if not cv_data:
+        cv_data = CVData(user_id=user_id)
+        db.session.add(cv_data)
+    
+    cv_data.file_path = file_path
+    cv_data.extracted_text = extracted_text
+    cv_data.keywords = json.dumps(parsed_data['keywords'])
+    cv_data.skills = json.dumps(parsed_data['skills'])
+    cv_data.experience_years = parsed_data['experience_years']
+    cv_data.education_level = parsed_data['education_level']
+    cv_data.job_titles = json.dumps(parsed_data['job_titles'])
+    cv_data.updated_at = datetime.utcnow()
+    
+    # Update user profile with extracted information
+    profile = UserProfile.query.filter_by(user_id=user_id).first()
+    if not profile:
+        profile = UserProfile(user_id=user_id)
+        db.session.add(profile)
+    
+    # Update profile only if fields are empty
+    if not profile.phone and parsed_data['phone']:
+        profile.phone = parsed_data['phone']
+    if not profile.skills and parsed_data['skills']:
+        profile.skills = ', '.join(parsed_data['skills'])
+    
+    db.session.flush()
+    return cv_data
+
+def complete_cv_processing(processing, stages, cv_data, parsed_data):
+    """Set the final job fields (committed with the CV data by the caller)"""
+    processing.stages = json.dumps(stages)
+    processing.status = 'completed'
+    processing.current_stage = None
+    processing.cv_data_id = cv_data.id
+    processing.result = json.dumps(parsed_data)
+    processing.completed_at = datetime.utcnow()
+
+def process_cv_item(payload, meta):
+    """Run the extraction, NLP and AI keyword stages for an uploaded CV (runs on a queue worker)"""
+    processing = CVProcessingJob.query.get(payload['processing_id'])
+    if not processing:
+        raise ValueError('CV processing job not found')
+    
+    stages = json.loads(processing.stages) if processing.stages else {}
+    processing.status = 'processing'
+    processing.started_at = datetime.utcnow()
+    processing.error = None
+    
+    try:
+        # An identical file may have been parsed since this one was queued
+        stored = None
+        if processing.content_hash:
+            stored = get_parse_result(processing.content_hash, CV_PARSER_VERSION, processing.language)
+        
+        if stored:
+            extracted_text, parsed_data = stored
+            skip_cv_stages(stages, ['extract', 'parse', 'ai_keywords'])
+            processing.cache_hit = True
+        else:
+            # Extract text from file; PDF pages are matched as they arrive
+            started = start_cv_stage(processing, stages, 'extract')
+            if processing.file_path.lower().endswith('.pdf'):
+                extracted_text, skills, fields = parse_pdf_pages(processing.file_path)
+            else:
+                extracted_text = extract_text_from_file(processing.file_path)
+                skills, fields = None, None
+            if not extracted_text:
+                raise ValueError('Could not extract text from file')
+            finish_cv_stage(processing, stages, 'extract', started)
+            
+            # Parse CV data
+            started = start_cv_stage(processing, stages, 'parse')
+            if fields is None:
+                skills = extract_skills(extracted_text)
+                # Email, phone, experience, education and job titles in one call
+                fields = extract_fields(extracted_text)
+            else:
+                # Only the noun phrases need the whole document
+                skills = list(set(add_noun_phrase_skills(nlp_pipeline.process(extracted_text), skills)))
+            parsed_data = {
+                'email': fields['email'],
+                'phone': fields['phone'],
+                'skills': skills,
+                'keywords': [],
+                'experience_years': fields['experience_years'],
+                'education_level': fields['education_level'],
+                'job_titles': fields['job_titles'],
+                'text_length': len(extracted_text)
+            }
+            finish_cv_stage(processing, stages, 'parse', started)
+            
+            # Extract keywords using AI
+            started = start_cv_stage(processing, stages, 'ai_keywords')
+            ai_keywords = extract_keywords_ai(extracted_text, processing.language)
+            parsed_data['keywords'] = list(set(skills + ai_keywords))
+            finish_cv_stage(processing, stages, 'ai_keywords', started)
+        
+        # Write CV data, profile and job status in one transaction
+        started = start_cv_stage(processing, stages, 'save')
+        cv_data = save_parsed_cv(processing.user_id, processing.file_path, extracted_text, parsed_data)
+        if not stored and processing.content_hash:
+            store_parse_result(
+                db.session, processing.content_hash, CV_PARSER_VERSION, processing.language,
+                extracted_text, parsed_data
+            )
+        finish_cv_stage(processing, stages, 'save', started, commit=False)
+        complete_cv_processing(processing, stages, cv_data, parsed_data)
+        db.session.commit()
+        
+    except Exception as e:
+        db.session.rollback()
+        # Record the failure against the stage that was running
+        processing = CVProcessingJob.query.get(payload['processing_id'])
+        if processing:
+            stages = json.loads(processing.stages) if processing.stages else {}
+            if processing.current_stage in stages:
+                stages[processing.current_stage]['status'] = 'failed'
+            processing.stages = json.dumps(stages)
+            processing.status = 'failed'
+            processing.error = str(e)
+            processing.completed_at = datetime.utcnow()
+            db.session.commit()
+        raise
+    
+    return {'processing_id': processing.id, 'cv_data_id': cv_data.id, 'cache_hit': bool(stored)}
+
+job_queue.register('cv_process', process_cv_item)
+
+def cv_processing_status(processing):
+    """Build the status response for a CV processing job"""
+    stages = json.loads(processing.stages) if processing.stages else {}
+    # Stages answered from a stored parse result count as done
+    completed = sum(1 for stage in stages.values() if stage.get('status') in ('completed', 'skipped'))
+    
+    return {
+        'processing_id': processing.id,
+        'status': processing.status,
+        'cache_hit': bool(processing.cache_hit),
+        'current_stage': processing.current_stage,
+        'progress': round(completed / len(CV_PROCESSING_STAGES) * 100, 2),
+        'stages': [
+            dict({'name': name, 'status': 'pending', 'started_at': None, 'duration_ms': None}, **stages.get(name, {}))
+            for name in CV_PROCESSING_STAGES
+        ],
+        'error': processing.error,
+        'parsed_data': json.loads(processing.result) if processing.result else None,
+        'cv_data_id': processing.cv_data_id,
+        'created_at': processing.created_at.isoformat() if processing.created_at else None,
+        'started_at': processing.started_at.isoformat() if processing.started_at else None,
+        'completed_at': processing.completed_at.isoformat() if processing.completed_at else None
+    }
+
 @cv_parser_bp.route('/cv/upload', methods=['POST'])
 def upload_cv():
-    """Upload and parse CV file"""
+    """Upload a CV file and queue it for parsing"""
     try:
         user = get_user_from_token(request)
         if not user:
@@ -276,79 +401,80 @@ def upload_cv():
         upload_dir = os.path.join(current_app.config.get('UPLOAD_FOLDER', '/tmp'), 'cvs')
         os.makedirs(upload_dir, exist_ok=True)
         
-        # Save file
-        filename = secure_filename(file.filename)
-        timestamp = int(datetime.utcnow().timestamp())
-        filename = f"{user.id}_{timestamp}_{filename}"
-        file_path = os.path.join(upload_dir, filename)
-        file.save(file_path)
-        
-        # Extract text from file
-        extracted_text = extract_text_from_file(file_path)
-        
-        if not extracted_text:
-            return jsonify({'error': 'Could not extract text from file'}), 400
-        
-        # Parse CV data
-        email = extract_email(extracted_text)
-        phone = extract_phone(extracted_text)
-        skills = extract_skills(extracted_text)
-        experience_years = extract_experience_years(extracted_text)
-        education_level = extract_education_level(extracted_text)
-        job_titles = extract_job_titles(extracted_text)
-        
-        # Extract keywords using AI
-        ai_keywords = extract_keywords_ai(extracted_text, language)
-        all_keywords = list(set(skills + ai_keywords))
-        
-        # Save or update CV data
-        cv_data = CVData.query.filter_by(user_id=user.id).first()
-        if not cv_data:
-            cv_data = CVData(user_id=user.id)
-            db.session.add(cv_data)
-        
-        cv_data.file_path = file_path
-        cv_data.extracted_text = extracted_text
-        cv_data.keywords = json.dumps(all_keywords)
-        cv_data.skills = json.dumps(skills)
-        cv_data.experience_years = experience_years
-        cv_data.education_level = education_level
-        cv_data.job_titles = json.dumps(job_titles)
-        cv_data.updated_at = datetime.utcnow()
-        
-        # Update user profile with extracted information
-        profile = UserProfile.query.filter_by(user_id=user.id).first()
-        if not profile:
-            profile = UserProfile(user_id=user.id)
-            db.session.add(profile)
-        
-        # Update profile only if fields are empty
-        if not profile.phone and phone:
-            profile.phone = phone
-        if not profile.skills and skills:
-            profile.skills = ', '.join(skills)
+        # Stream to disk while hashing; identical files are stored once
+        extension = file.filename.rsplit('.', 1)[1].lower()
+        file_path, content_hash, file_size, duplicate = save_upload(file, upload_dir, extension)
+        
+        processing = CVProcessingJob(
+            id=str(uuid.uuid4()),
+            user_id=user.id,
+            file_path=file_path,
+            content_hash=content_hash,
+            language=language,
+            status='queued'
+        )
+        db.session.add(processing)
+        
+        # Same content parsed before: skip extraction, NLP and AI entirely
+        stored = get_parse_result(content_hash, CV_PARSER_VERSION, language)
+        if stored:
+            extracted_text, parsed_data = stored
+            stages = {}
+            skip_cv_stages(stages, CV_PROCESSING_STAGES[:-1])
+            started = time.perf_counter()
+            stages['save'] = {'status': 'running', 'started_at': datetime.utcnow().isoformat(), 'duration_ms': None}
+            cv_data = save_parsed_cv(user.id, file_path, extracted_text, parsed_data)
+            finish_cv_stage(processing, stages, 'save', started, commit=False)
+            processing.cache_hit = True
+            processing.started_at = datetime.utcnow()
+            complete_cv_processing(processing, stages, cv_data, parsed_data)
+            db.session.commit()
+            
+            return jsonify({
+                'success': True,
+                'message': 'CV uploaded and parsed successfully',
+                'processing_id': processing.id,
+                'status': 'completed',
+                'cache_hit': True,
+                'parsed_data': parsed_data,
+                'status_url': url_for('cv_parser.get_cv_processing_status', processing_id=processing.id)
+            }), 200
         
         db.session.commit()
         
+        # Extraction, NLP and AI keywords run in the background
+        job_queue.submit('cv_process', [{'processing_id': processing.id}], {'user_id': user.id})
+        
         return jsonify({
             'success': True,
-            'message': 'CV uploaded and parsed successfully',
-            'parsed_data': {
-                'email': email,
-                'phone': phone,
-                'skills': skills,
-                'keywords': all_keywords,
-                'experience_years': experience_years,
-                'education_level': education_level,
-                'job_titles': job_titles,
-                'text_length': len(extracted_text)
-            }
-        }), 200
+            'message': 'CV uploaded, processing started',
+            'processing_id': processing.id,
+            'status': 'queued',
+            'cache_hit': False,
+            'status_url': url_for('cv_parser.get_cv_processing_status', processing_id=processing.id)
+        }), 202
         
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@cv_parser_bp.route('/cv/status/<processing_id>', methods=['GET'])
+def get_cv_processing_status(processing_id):
+    """Get stage-level progress and timings of a CV upload"""
+    try:
+        user = get_user_from_token(request)
+        if not user:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        processing = CVProcessingJob.query.filter_by(id=processing_id, user_id=user.id).first()
+        if not processing:
+            return jsonify({'error': 'CV processing job not found'}), 404
+        
+        return jsonify(cv_processing_status(processing)), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @cv_parser_bp.route('/cv/data', methods=['GET'])
 def get_cv_data():
     """Get parsed CV data for the current user"""
@@ -448,18 +574,16 @@ Please provide a comprehensive analysis including:
 5. Overall rating out of 10"""
         
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
+            analysis = llm_client.chat(
                 messages=[
                     {"role": "system", "content": "You are an expert CV reviewer and career advisor."},
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=1500,
-                temperature=0.7
+                temperature=0.7,
+                cache_endpoint='cv_analysis'
             )
             
-            analysis = response.choices[0].message.content
-            
         except Exception as e:
             if language == 'ar':
                 analysis = "عذراً، حدث خطأ في تحليل السيرة الذاتية. يرجى المحاولة مرة أخرى."
@@ -545,18 +669,16 @@ And current CV keywords:
 Suggest additional keywords that should be added to the CV to improve chances of acceptance."""
         
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
+            ai_suggestions = llm_client.chat(
                 messages=[
                     {"role": "system", "content": "You are an expert in CV optimization and keyword matching."},
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=800,
-                temperature=0.5
+                temperature=0.5,
+                cache_endpoint='keyword_suggestions'
             )
             
-            ai_suggestions = response.choices[0].message.content
-            
         except Exception as e:
             ai_suggestions = "Error generating AI suggestions"
         
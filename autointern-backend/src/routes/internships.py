@@ -1,10 +1,20 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from src.models.user import db, Internship, Application, ApplicationTracking
 from src.routes.auth import verify_token
+from src.utils.search_ranking import InternshipRanker
+from src.utils.fulltext_search import fulltext_installed, search_fulltext
+from src.utils.application_stats import record_application, record_application_removed, record_status_change
 from datetime import datetime
+import math
 
 internships_bp = Blueprint('internships', __name__)
 
+# BM25 ranking over title/description/requirements (falls back to LIKE without NumPy/SciPy)
+internship_ranker = InternshipRanker(Internship)
+
+# How many ranked hits are considered when location/company filters are also applied
+MAX_RANKED_CANDIDATES = 5000
+
 def require_auth(f):
     """Decorator to require authentication"""
     def decorated_function(*args, **kwargs):
@@ -36,6 +46,13 @@ def get_internships():
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 20))
         
+        if query:
+            backend = get_search_backend()
+            if backend == 'fulltext':
+                return jsonify(search_internships_fulltext(query, location, company, page, per_page)), 200
+            if backend == 'bm25':
+                return jsonify(search_internships_ranked(query, location, company, page, per_page)), 200
+        
         # Build query
         internships_query = Internship.query
         
@@ -75,6 +92,66 @@ def get_internships():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def get_search_backend():
+    """Pick the backend answering ?query= searches (SEARCH_BACKEND: auto, fulltext, bm25 or like)"""
+    backend = current_app.config.get('SEARCH_BACKEND', 'auto')
+    if backend in ('auto', 'fulltext') and fulltext_installed(db.engine):
+        return 'fulltext'
+    if backend in ('auto', 'bm25') and internship_ranker.available:
+        return 'bm25'
+    return 'like'
+
+def ranked_page(ranked, total, page, per_page):
+    """Load a page of (internship_id, score, extra fields) hits in rank order"""
+    internships_by_id = {
+        internship.id: internship
+        for internship in Internship.query.filter(Internship.id.in_([hit[0] for hit in ranked])).all()
+    } if ranked else {}
+    
+    results = []
+    for internship_id, score, extra in ranked:
+        internship = internships_by_id.get(internship_id)
+        if internship:
+            internship_data = internship.to_dict()
+            internship_data['relevance'] = round(score, 4)
+            internship_data.update(extra)
+            results.append(internship_data)
+    
+    return {
+        'internships': results,
+        'total': total,
+        'pages': math.ceil(total / per_page) if per_page else 0,
+        'current_page': page,
+        'per_page': per_page
+    }
+
+def search_internships_fulltext(query, location, company, page, per_page):
+    """Database full-text search (FTS5 / tsvector) with highlighted fields"""
+    hits, total = search_fulltext(db.session, query, location, company, page, per_page)
+    ranked = [(hit['id'], hit['rank'], {'highlights': hit['highlights']}) for hit in hits]
+    return ranked_page(ranked, total, page, per_page)
+
+def search_internships_ranked(query, location, company, page, per_page):
+    """Relevance-ranked, paginated internship search"""
+    if location or company:
+        # Rank first, then apply the filters to the best candidates
+        ranked_ids, scores, _ = internship_ranker.search(query, page=1, per_page=MAX_RANKED_CANDIDATES)
+        filtered_query = Internship.query.with_entities(Internship.id).filter(Internship.id.in_(ranked_ids))
+        if location:
+            filtered_query = filtered_query.filter(Internship.location.contains(location))
+        if company:
+            filtered_query = filtered_query.filter(Internship.company.contains(company))
+        allowed = {row.id for row in filtered_query}
+        
+        ranked = [(internship_id, score) for internship_id, score in zip(ranked_ids, scores) if internship_id in allowed]
+        total = len(ranked)
+        ranked = ranked[(page - 1) * per_page:page * per_page]
+    else:
+        ranked_ids, scores, total = internship_ranker.search(query, page=page, per_page=per_page)
+        ranked = list(zip(ranked_ids, scores))
+    
+    return ranked_page([(internship_id, score, {}) for internship_id, score in ranked], total, page, per_page)
+
 @internships_bp.route('/internships/<int:internship_id>', methods=['GET'])
 @require_auth
 def get_internship(internship_id):
@@ -128,6 +205,7 @@ def apply_to_internship():
         )
         
         db.session.add(application)
+        record_application(db.session, request.current_user_id, application.status)
         db.session.commit()
         
         # Create tracking entry
@@ -230,6 +308,7 @@ def update_application(application_id):
                 else:
                     setattr(application, field, data[field])
         
+        record_status_change(db.session, application.user_id, old_status, application.status)
         db.session.commit()
         
         # Create tracking entry if status changed
@@ -263,6 +342,7 @@ def delete_application(application_id):
             return jsonify({'error': 'Access denied'}), 403
         
         db.session.delete(application)
+        record_application_removed(db.session, application.user_id, application.status)
         db.session.commit()
         
         return jsonify({'message': 'Application deleted successfully'}), 200
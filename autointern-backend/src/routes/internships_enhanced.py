@@ -1,6 +1,8 @@
 from flask import Blueprint, jsonify, request
 from src.models.user import Internship, Application, db
 from src.routes.auth import token_required
+from src.utils.fulltext_search import fulltext_installed, search_fulltext
+from src.utils.application_stats import record_application, record_status_change
 
 internships_bp = Blueprint('internships', __name__)
 
@@ -11,6 +13,24 @@ def get_internships():
         query = request.args.get('query', '')
         location = request.args.get('location', '')
         
+        # Ranked full-text search with highlights when the index is installed
+        if query and fulltext_installed(db.engine):
+            hits, _ = search_fulltext(db.session, query, location=location, per_page=None)
+            internships_by_id = {
+                internship.id: internship
+                for internship in Internship.query.filter(Internship.id.in_([hit['id'] for hit in hits])).all()
+            } if hits else {}
+            
+            results = []
+            for hit in hits:
+                internship = internships_by_id.get(hit['id'])
+                if internship:
+                    internship_data = internship.to_dict()
+                    internship_data['relevance'] = round(hit['rank'], 4)
+                    internship_data['highlights'] = hit['highlights']
+                    results.append(internship_data)
+            return jsonify(results), 200
+        
         # Build query
         internships_query = Internship.query
         
@@ -94,6 +114,7 @@ def apply_for_internship(current_user):
         )
         
         db.session.add(application)
+        record_application(db.session, current_user.id, application.status)
         db.session.commit()
         
         return jsonify({
@@ -138,7 +159,9 @@ def update_application_status(current_user, application_id):
         if not application:
             return jsonify({'message': 'Application not found'}), 404
         
+        old_status = application.status
         application.status = status
+        record_status_change(db.session, current_user.id, old_status, status)
         db.session.commit()
         
         return jsonify({
@@ -1,12 +1,21 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, url_for
 import requests
 from bs4 import BeautifulSoup
 import json
-import openai
 from datetime import datetime, timedelta
 from src.models.user_enhanced import db, User, UserProfile, CVData, Internship, Application, ApplicationTracking
 from src.routes.auth_enhanced_github import verify_token
 from src.routes.ai_chatbot import get_user_from_token
+from src.utils.job_sources import JobSource, job_source_engine
+from src.utils.job_ingest import bulk_upsert_internships
+from src.utils.skill_matcher import extract_skills_from_text
+from src.utils.skill_index import count_candidates, index_internships_by_keys, internship_keywords, recommend
+from src.utils.application_stats import get_user_stats, record_application, record_status_change
+from src.utils.job_queue import job_queue
+from src.utils.llm_client import llm_client
+from sqlalchemy import case, func
+from sqlalchemy.orm import joinedload
+import math
 import re
 import time
 from urllib.parse import urljoin, urlparse
@@ -26,23 +35,8 @@ def extract_keywords_from_text(text):
     if not text:
         return []
     
-    # Common tech keywords and skills
-    tech_keywords = [
-        'python', 'javascript', 'java', 'react', 'node.js', 'sql', 'html', 'css',
-        'machine learning', 'data science', 'artificial intelligence', 'ai',
-        'web development', 'mobile development', 'frontend', 'backend', 'fullstack',
-        'database', 'api', 'rest', 'graphql', 'docker', 'kubernetes', 'aws', 'azure',
-        'git', 'github', 'agile', 'scrum', 'testing', 'debugging'
-    ]
-    
-    text_lower = text.lower()
-    found_keywords = []
-    
-    for keyword in tech_keywords:
-        if keyword in text_lower:
-            found_keywords.append(keyword)
-    
-    return found_keywords
+    # Single pass over the text with the shared skill dictionary
+    return extract_skills_from_text(text)
 
 @job_search_bp.route('/jobs/search', methods=['POST'])
 def search_jobs():
@@ -71,54 +65,30 @@ def search_jobs():
         # Combine user skills with search keywords
         all_keywords = list(set(keywords + user_skills))
         
-        # Search multiple job sites
-        job_results = []
-        
-        # Search LinkedIn (simulated - in real implementation, you'd use LinkedIn API)
-        linkedin_jobs = search_linkedin_jobs(all_keywords, location, job_type)
-        job_results.extend(linkedin_jobs)
-        
-        # Search Indeed (simulated)
-        indeed_jobs = search_indeed_jobs(all_keywords, location, job_type)
-        job_results.extend(indeed_jobs)
-        
-        # Search company websites (simulated)
-        company_jobs = search_company_websites(all_keywords, location)
-        job_results.extend(company_jobs)
+        # Search all registered job sites concurrently
+        search_result = job_source_engine.search(
+            all_keywords, location, job_type, sources=data.get('sources')
+        )
+        job_results = search_result['jobs']
         
-        # Save new jobs to database
-        saved_jobs = []
-        for job in job_results:
-            existing_job = Internship.query.filter_by(
-                title=job['title'],
-                company=job['company']
-            ).first()
-            
-            if not existing_job:
-                new_job = Internship(
-                    title=job['title'],
-                    company=job['company'],
-                    location=job['location'],
-                    description=job['description'],
-                    url=job['url'],
-                    requirements=job.get('requirements', ''),
-                    source='scraped',
-                    keywords=json.dumps(job.get('keywords', []))
-                )
-                db.session.add(new_job)
-                saved_jobs.append(new_job)
+        # Save new jobs and refresh known ones in one bulk upsert
+        ingest_result = bulk_upsert_internships(job_results, source='scraped')
+        index_internships_by_keys(ingest_result['keys'])
         
         db.session.commit()
         
         return jsonify({
             'jobs': [job for job in job_results],
             'total_found': len(job_results),
-            'new_jobs_saved': len(saved_jobs),
+            'new_jobs_saved': ingest_result['inserted'],
+            'jobs_updated': ingest_result['updated'],
             'search_criteria': {
                 'keywords': all_keywords,
                 'location': location,
                 'job_type': job_type
-            }
+            },
+            'sources': search_result['sources'],
+            'partial_results': search_result['partial']
         }), 200
         
     except Exception as e:
@@ -185,63 +155,19 @@ def search_company_websites(keywords, location):
     ]
     return sample_jobs
 
-@job_search_bp.route('/jobs/auto-apply', methods=['POST'])
-def auto_apply_jobs():
-    """Automatically apply to jobs based on user preferences"""
+# Register job sources with the concurrent search engine
+job_source_engine.register(JobSource('linkedin', search_linkedin_jobs))
+job_source_engine.register(JobSource('indeed', search_indeed_jobs))
+job_source_engine.register(JobSource(
+    'company_website',
+    lambda keywords, location, job_type: search_company_websites(keywords, location)
+))
+
+def generate_application_cover_letter(job, user_skills, user_experience, language='en'):
+    """Generate a cover letter for a job, falling back to a template if AI fails"""
     try:
-        user = get_user_from_token(request)
-        if not user:
-            return jsonify({'error': 'Authentication required'}), 401
-        
-        data = request.get_json()
-        job_ids = data.get('job_ids', [])
-        auto_generate_cover_letter = data.get('auto_generate_cover_letter', True)
-        language = data.get('language', 'en')
-        
-        if not job_ids:
-            return jsonify({'error': 'Job IDs are required'}), 400
-        
-        # Get user profile for cover letter generation
-        profile = UserProfile.query.filter_by(user_id=user.id).first()
-        cv_data = CVData.query.filter_by(user_id=user.id).first()
-        
-        user_skills = profile.skills if profile else ''
-        user_experience = profile.experience if profile else ''
-        
-        applied_jobs = []
-        failed_applications = []
-        
-        for job_id in job_ids:
-            try:
-                job = Internship.query.get(job_id)
-                if not job:
-                    failed_applications.append({
-                        'job_id': job_id,
-                        'error': 'Job not found'
-                    })
-                    continue
-                
-                # Check if already applied
-                existing_application = Application.query.filter_by(
-                    user_id=user.id,
-                    internship_id=job_id
-                ).first()
-                
-                if existing_application:
-                    failed_applications.append({
-                        'job_id': job_id,
-                        'error': 'Already applied to this job'
-                    })
-                    continue
-                
-                # Generate cover letter if requested
-                cover_letter = ''
-                ai_generated = False
-                
-                if auto_generate_cover_letter:
-                    try:
-                        if language == 'ar':
-                            prompt = f"""اكتب رسالة تغطية مهنية باللغة العربية للوظيفة التالية:
+        if language == 'ar':
+            prompt = f"""اكتب رسالة تغطية مهنية باللغة العربية للوظيفة التالية:
 
 المسمى الوظيفي: {job.title}
 اسم الشركة: {job.company}
@@ -252,8 +178,8 @@ def auto_apply_jobs():
 الخبرة: {user_experience}
 
 يرجى كتابة رسالة تغطية مختصرة ومهنية."""
-                        else:
-                            prompt = f"""Write a professional cover letter for the following job:
+        else:
+            prompt = f"""Write a professional cover letter for the following job:
 
 Job Title: {job.title}
 Company: {job.company}
@@ -264,77 +190,178 @@ Skills: {user_skills}
 Experience: {user_experience}
 
 Please write a concise and professional cover letter."""
-                        
-                        response = openai.ChatCompletion.create(
-                            model="gpt-3.5-turbo",
-                            messages=[
-                                {"role": "system", "content": "You are a professional career advisor."},
-                                {"role": "user", "content": prompt}
-                            ],
-                            max_tokens=800,
-                            temperature=0.7
-                        )
-                        
-                        cover_letter = response.choices[0].message.content
-                        ai_generated = True
-                        
-                    except Exception as e:
-                        # Use default cover letter if AI fails
-                        if language == 'ar':
-                            cover_letter = f"عزيزي فريق التوظيف في {job.company}،\n\nأتقدم بطلب للحصول على منصب {job.title}. أعتقد أن مهاراتي وخبرتي تجعلني مرشحاً مناسباً لهذا المنصب.\n\nأتطلع إلى سماع ردكم.\n\nمع أطيب التحيات"
-                        else:
-                            cover_letter = f"Dear {job.company} Hiring Team,\n\nI am writing to apply for the {job.title} position. I believe my skills and experience make me a suitable candidate for this role.\n\nI look forward to hearing from you.\n\nBest regards"
-                
-                # Create application record
-                application = Application(
-                    user_id=user.id,
-                    internship_id=job_id,
-                    status='submitted',
-                    cover_letter=cover_letter,
-                    auto_applied=True,
-                    ai_generated_cover_letter=ai_generated,
-                    applied_date=datetime.utcnow()
-                )
-                
-                db.session.add(application)
-                
-                # Add tracking record
-                tracking = ApplicationTracking(
-                    application_id=application.id,
-                    status='submitted',
-                    notes='Auto-applied via system',
-                    changed_by=user.id,
-                    changed_at=datetime.utcnow()
-                )
-                
-                db.session.add(tracking)
-                
-                applied_jobs.append({
-                    'job_id': job_id,
-                    'job_title': job.title,
-                    'company': job.company,
-                    'application_id': application.id,
-                    'ai_generated_cover_letter': ai_generated
-                })
-                
-            except Exception as e:
-                failed_applications.append({
-                    'job_id': job_id,
-                    'error': str(e)
-                })
         
+        cover_letter = llm_client.chat(
+            messages=[
+                {"role": "system", "content": "You are a professional career advisor."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=800,
+            temperature=0.7,
+            cache_endpoint='cover_letter'
+        )
+        
+        return cover_letter, True
+        
+    except Exception as e:
+        # Use default cover letter if AI fails
+        if language == 'ar':
+            return f"عزيزي فريق التوظيف في {job.company}،\n\nأتقدم بطلب للحصول على منصب {job.title}. أعتقد أن مهاراتي وخبرتي تجعلني مرشحاً مناسباً لهذا المنصب.\n\nأتطلع إلى سماع ردكم.\n\nمع أطيب التحيات", False
+        else:
+            return f"Dear {job.company} Hiring Team,\n\nI am writing to apply for the {job.title} position. I believe my skills and experience make me a suitable candidate for this role.\n\nI look forward to hearing from you.\n\nBest regards", False
+
+def process_auto_apply_item(payload, meta):
+    """Apply to a single job of an auto-apply batch (runs on a queue worker)"""
+    user_id = meta['user_id']
+    job_id = payload['job_id']
+    
+    job = Internship.query.get(job_id)
+    if not job:
+        raise ValueError('Job not found')
+    
+    # Check if already applied
+    existing_application = Application.query.filter_by(
+        user_id=user_id,
+        internship_id=job_id
+    ).first()
+    
+    if existing_application:
+        raise ValueError('Already applied to this job')
+    
+    # Generate cover letter if requested
+    cover_letter = ''
+    ai_generated = False
+    
+    if meta.get('auto_generate_cover_letter', True):
+        cover_letter, ai_generated = generate_application_cover_letter(
+            job, meta.get('user_skills', ''), meta.get('user_experience', ''), meta.get('language', 'en')
+        )
+    
+    try:
+        # Create application record
+        application = Application(
+            user_id=user_id,
+            internship_id=job_id,
+            status='submitted',
+            cover_letter=cover_letter,
+            auto_applied=True,
+            ai_generated_cover_letter=ai_generated,
+            applied_date=datetime.utcnow()
+        )
+        
+        db.session.add(application)
+        db.session.flush()
+        
+        # Add tracking record
+        tracking = ApplicationTracking(
+            application_id=application.id,
+            status='submitted',
+            notes='Auto-applied via system',
+            changed_by=user_id,
+            changed_at=datetime.utcnow()
+        )
+        
+        db.session.add(tracking)
+        record_application(db.session, user_id, application.status, application.applied_date)
         db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    
+    return {
+        'job_id': job_id,
+        'job_title': job.title,
+        'company': job.company,
+        'application_id': application.id,
+        'ai_generated_cover_letter': ai_generated
+    }
+
+job_queue.register('auto_apply', process_auto_apply_item)
+
+@job_search_bp.route('/jobs/auto-apply', methods=['POST'])
+def auto_apply_jobs():
+    """Queue a batch job that applies to jobs based on user preferences"""
+    try:
+        user = get_user_from_token(request)
+        if not user:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        data = request.get_json()
+        job_ids = data.get('job_ids', [])
+        auto_generate_cover_letter = data.get('auto_generate_cover_letter', True)
+        language = data.get('language', 'en')
+        
+        if not job_ids:
+            return jsonify({'error': 'Job IDs are required'}), 400
+        
+        # Get user profile for cover letter generation
+        profile = UserProfile.query.filter_by(user_id=user.id).first()
+        
+        meta = {
+            'user_id': user.id,
+            'auto_generate_cover_letter': auto_generate_cover_letter,
+            'language': language,
+            'user_skills': profile.skills if profile else '',
+            'user_experience': profile.experience if profile else ''
+        }
+        
+        # One queue item per distinct job, processed concurrently by the workers
+        unique_job_ids = list(dict.fromkeys(job_ids))
+        job_id = job_queue.submit('auto_apply', [{'job_id': jid} for jid in unique_job_ids], meta)
         
         return jsonify({
             'success': True,
+            'job_id': job_id,
+            'status': 'queued',
+            'total_jobs': len(unique_job_ids),
+            'status_url': url_for('job_search.get_auto_apply_status', job_id=job_id)
+        }), 202
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@job_search_bp.route('/jobs/auto-apply/<job_id>', methods=['GET'])
+def get_auto_apply_status(job_id):
+    """Get status and progress of an auto-apply batch job"""
+    try:
+        user = get_user_from_token(request)
+        if not user:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        job = job_queue.status(job_id)
+        if not job or job['meta'].get('user_id') != user.id:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        applied_jobs = []
+        failed_applications = []
+        for item in job['items']:
+            if item['status'] == 'done':
+                applied_jobs.append(item['result'])
+            elif item['status'] == 'failed':
+                failed_applications.append({
+                    'job_id': item['payload'].get('job_id'),
+                    'error': item['error']
+                })
+        
+        return jsonify({
+            'job_id': job_id,
+            'status': job['status'],
+            'progress': {
+                'total': job['total'],
+                'completed': job['completed'],
+                'failed': job['failed'],
+                'percent': job['progress']
+            },
             'applied_jobs': applied_jobs,
             'failed_applications': failed_applications,
             'total_applied': len(applied_jobs),
-            'total_failed': len(failed_applications)
+            'total_failed': len(failed_applications),
+            'created_at': job['created_at'],
+            'started_at': job['started_at'],
+            'finished_at': job['finished_at']
         }), 200
         
     except Exception as e:
-        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @job_search_bp.route('/applications/tracker', methods=['GET'])
@@ -345,52 +372,104 @@ def get_application_tracker():
         if not user:
             return jsonify({'error': 'Authentication required'}), 401
         
-        # Get all user applications with tracking
-        applications = Application.query.filter_by(user_id=user.id).order_by(
-            Application.applied_date.desc()
-        ).all()
+        status_filter = request.args.get('status')
+        page = max(int(request.args.get('page', 1)), 1)
+        per_page = min(max(int(request.args.get('per_page', 20)), 1), 100)
         
-        # Group by status
-        status_counts = {}
-        applications_by_status = {}
+        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+        stats = get_user_stats(user.id)
+        
+        if stats is not None:
+            # Summary from the materialized stats row
+            status_counts = stats['status_counts']
+            total_apps = stats['total_applications']
+            success_rate = stats['success_rate']
+            recent_count = Application.query.filter(
+                Application.user_id == user.id,
+                Application.applied_date >= thirty_days_ago
+            ).count() if total_apps else 0
+        else:
+            # Stats not built yet: status counts and 30-day activity in one grouped query
+            status_rows = db.session.query(
+                Application.status,
+                func.count(Application.id),
+                func.sum(case((Application.applied_date >= thirty_days_ago, 1), else_=0))
+            ).filter(
+                Application.user_id == user.id
+            ).group_by(Application.status).all()
+            
+            status_counts = {status: count for status, count, _ in status_rows}
+            recent_count = sum(int(recent or 0) for _, _, recent in status_rows)
+            
+            # Calculate success rate (accepted / total)
+            total_apps = sum(status_counts.values())
+            accepted_apps = status_counts.get('accepted', 0)
+            success_rate = (accepted_apps / total_apps * 100) if total_apps > 0 else 0
         
-        for app in applications:
-            status = app.status
-            if status not in status_counts:
-                status_counts[status] = 0
-                applications_by_status[status] = []
+        applications_by_status = {}
+        if status_filter:
+            # One page of a single status
+            applications = Application.query.filter_by(
+                user_id=user.id,
+                status=status_filter
+            ).options(joinedload(Application.internship)).order_by(
+                Application.applied_date.desc(), Application.id.desc()
+            ).offset((page - 1) * per_page).limit(per_page).all()
+            
+            applications_by_status[status_filter] = [app.to_dict() for app in applications]
+        elif status_counts:
+            # First page of every status in one windowed query
+            row_number = func.row_number().over(
+                partition_by=Application.status,
+                order_by=(Application.applied_date.desc(), Application.id.desc())
+            ).label('row_number')
+            ranked = db.session.query(Application.id.label('id'), row_number).filter(
+                Application.user_id == user.id
+            ).subquery()
             
-            status_counts[status] += 1
-            applications_by_status[status].append(app.to_dict())
+            applications = Application.query.join(
+                ranked, Application.id == ranked.c.id
+            ).filter(
+                ranked.c.row_number <= per_page
+            ).options(joinedload(Application.internship)).order_by(
+                Application.applied_date.desc(), Application.id.desc()
+            ).all()
+            
+            for app in applications:
+                applications_by_status.setdefault(app.status, []).append(app.to_dict())
         
         # Get recent activity (last 30 days)
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        recent_applications = [
-            app for app in applications 
-            if app.applied_date and app.applied_date >= thirty_days_ago
-        ]
-        
-        # Calculate success rate (accepted / total)
-        total_apps = len(applications)
-        accepted_apps = status_counts.get('accepted', 0)
-        success_rate = (accepted_apps / total_apps * 100) if total_apps > 0 else 0
+        recent_applications = Application.query.filter(
+            Application.user_id == user.id,
+            Application.applied_date >= thirty_days_ago
+        ).options(joinedload(Application.internship)).order_by(
+            Application.applied_date.desc(), Application.id.desc()
+        ).limit(10).all()
         
         return jsonify({
             'summary': {
                 'total_applications': total_apps,
                 'status_counts': status_counts,
                 'success_rate': round(success_rate, 2),
-                'recent_applications': len(recent_applications)
+                'recent_applications': recent_count
             },
             'applications_by_status': applications_by_status,
-            'recent_activity': [app.to_dict() for app in recent_applications[:10]]
+            'recent_activity': [app.to_dict() for app in recent_applications],
+            'pagination': {
+                'status': status_filter,
+                'page': page if status_filter else 1,
+                'per_page': per_page,
+                'pages': {
+                    status: math.ceil(count / per_page) for status, count in status_counts.items()
+                }
+            }
         }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @job_search_bp.route('/applications/<int:application_id>/status', methods=['PUT'])
-def update_application_status():
+def update_application_status(application_id):
     """Update application status"""
     try:
         user = get_user_from_token(request)
@@ -436,6 +515,7 @@ def update_application_status():
         )
         
         db.session.add(tracking)
+        record_status_change(db.session, user.id, old_status, new_status)
         db.session.commit()
         
         return jsonify({
@@ -498,49 +578,51 @@ def get_job_recommendations():
             except:
                 user_skills = cv_data.skills.split(',') if cv_data.skills else []
         
-        # Get available jobs
-        available_jobs = Internship.query.limit(50).all()
+        limit = min(int(request.args.get('limit', 10)), 100)
         
-        if not available_jobs:
-            return jsonify({
-                'recommendations': [],
-                'message': 'No jobs available for recommendations'
-            }), 200
+        # Score every internship sharing a skill via the inverted skill index
+        scored = recommend(user_skills, limit=limit)
+        jobs_by_id = {
+            job.id: job for job in Internship.query.filter(
+                Internship.id.in_([internship_id for internship_id, _, _, _ in scored])
+            ).all()
+        } if scored else {}
         
-        # Score jobs based on skill matching
-        job_scores = []
+        top_recommendations = [
+            {
+                'job': jobs_by_id[internship_id].to_dict(),
+                'score': round(score, 2),
+                'matching_skills': matching_skills,
+                'total_job_keywords': total_keywords
+            }
+            for internship_id, score, matching_skills, total_keywords in scored
+            if internship_id in jobs_by_id
+        ]
         
-        for job in available_jobs:
-            score = 0
-            job_keywords = []
+        # Fill up with the newest internships when too few match
+        if len(top_recommendations) < limit:
+            filler = Internship.query.filter(
+                ~Internship.id.in_(list(jobs_by_id.keys()))
+            ).order_by(Internship.created_at.desc()).limit(limit - len(top_recommendations)).all()
             
-            if job.keywords:
-                try:
-                    job_keywords = json.loads(job.keywords)
-                except:
-                    job_keywords = extract_keywords_from_text(job.description)
-            else:
-                job_keywords = extract_keywords_from_text(job.description)
-            
-            # Calculate match score
-            matching_skills = set(user_skills).intersection(set(job_keywords))
-            score = len(matching_skills) / max(len(job_keywords), 1) * 100
-            
-            job_scores.append({
-                'job': job.to_dict(),
-                'score': round(score, 2),
-                'matching_skills': list(matching_skills),
-                'total_job_keywords': len(job_keywords)
-            })
+            for job in filler:
+                top_recommendations.append({
+                    'job': job.to_dict(),
+                    'score': 0,
+                    'matching_skills': [],
+                    'total_job_keywords': len(internship_keywords(job.keywords, job.description))
+                })
         
-        # Sort by score and get top recommendations
-        job_scores.sort(key=lambda x: x['score'], reverse=True)
-        top_recommendations = job_scores[:10]
+        if not top_recommendations:
+            return jsonify({
+                'recommendations': [],
+                'message': 'No jobs available for recommendations'
+            }), 200
         
         return jsonify({
             'recommendations': top_recommendations,
             'user_skills': user_skills,
-            'total_jobs_analyzed': len(available_jobs)
+            'total_jobs_analyzed': count_candidates(user_skills)
         }), 200
         
     except Exception as e:
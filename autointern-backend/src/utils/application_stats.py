@@ -0,0 +1,176 @@
+"""
+Materialized per-user application statistics
+Keeps user_application_stats in step with the applications table. Every
+helper works on the caller's session and never commits, so the stats change
+in the same transaction as the application write. Call them once that write
+is in the session: a user without a stats row gets one seeded from their
+applications, which then already includes it.
+"""
+
+import json
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from src.models.user_enhanced import db, Application, UserApplicationStats
+
+ACCEPTED_STATUS = 'accepted'
+
+def _current_counts(session, user_id):
+    """The user's status counts and last applied date, straight from applications"""
+    rows = session.query(
+        Application.status, func.count(Application.id), func.max(Application.applied_date)
+    ).filter(Application.user_id == user_id).group_by(Application.status).all()
+
+    counts = {}
+    last_applied_at = None
+    for status, count, last_applied in rows:
+        counts[status or 'unknown'] = count
+        if last_applied and (last_applied_at is None or last_applied > last_applied_at):
+            last_applied_at = last_applied
+    return counts, last_applied_at
+
+def _seed_values(session, user_id):
+    counts, last_applied_at = _current_counts(session, user_id)
+    total = sum(counts.values())
+    accepted = counts.get(ACCEPTED_STATUS, 0)
+    return {
+        'user_id': user_id,
+        'total_applications': total,
+        'accepted_count': accepted,
+        'accepted_rate': round(accepted / total * 100, 2) if total else 0.0,
+        'status_counts': json.dumps(counts),
+        'last_applied_at': last_applied_at,
+        'updated_at': datetime.utcnow()
+    }
+
+def _locked_stats(session, user_id):
+    """Get the user's stats row locked for update, and whether it was just created
+
+    A missing row is seeded from the applications table as the session sees
+    it, so it already includes the caller's pending change.
+    """
+    stats = session.query(UserApplicationStats).filter_by(user_id=user_id).with_for_update().first()
+    if stats is not None:
+        return stats, False
+
+    values = _seed_values(session, user_id)
+    dialect_name = session.get_bind().dialect.name
+    if dialect_name in ('sqlite', 'postgresql'):
+        insert = postgresql.insert if dialect_name == 'postgresql' else sqlite.insert
+        result = session.execute(insert(UserApplicationStats.__table__).values(
+            **values
+        ).on_conflict_do_nothing(index_elements=['user_id']))
+        stats = session.query(UserApplicationStats).filter_by(user_id=user_id).with_for_update().first()
+        return stats, result.rowcount == 1
+
+    stats = UserApplicationStats(**values)
+    session.add(stats)
+    return stats, True
+
+def _apply(session, user_id, deltas, applied_at=None):
+    stats, created = _locked_stats(session, user_id)
+    if created:
+        # Seeded from applications after the change was flushed
+        return stats
+
+    counts = json.loads(stats.status_counts or '{}')
+    for status, delta in deltas.items():
+        if not status or not delta:
+            continue
+        counts[status] = max(counts.get(status, 0) + delta, 0)
+        if not counts[status]:
+            del counts[status]
+
+    total = sum(counts.values())
+    stats.status_counts = json.dumps(counts)
+    stats.total_applications = total
+    stats.accepted_count = counts.get(ACCEPTED_STATUS, 0)
+    stats.accepted_rate = round(stats.accepted_count / total * 100, 2) if total else 0.0
+    if applied_at and (stats.last_applied_at is None or applied_at > stats.last_applied_at):
+        stats.last_applied_at = applied_at
+    stats.updated_at = datetime.utcnow()
+    return stats
+
+def record_applications(session, user_id, statuses, applied_at=None):
+    """Count new applications, given as a list of their statuses"""
+    deltas = {}
+    for status in statuses:
+        deltas[status] = deltas.get(status, 0) + 1
+    if not deltas:
+        return None
+    return _apply(session, user_id, deltas, applied_at or datetime.utcnow())
+
+def record_application(session, user_id, status, applied_at=None):
+    """Count one new application"""
+    return record_applications(session, user_id, [status], applied_at)
+
+def record_status_change(session, user_id, old_status, new_status):
+    """Move one application from old_status to new_status"""
+    if old_status == new_status:
+        return None
+    return _apply(session, user_id, {old_status: -1, new_status: 1})
+
+def record_application_removed(session, user_id, status):
+    """Uncount a deleted application"""
+    return _apply(session, user_id, {status: -1})
+
+def get_user_stats(user_id, session=None):
+    """Read a user's stats as a summary dict, or None if they were never computed"""
+    session = session or db.session
+    stats = session.query(UserApplicationStats).filter_by(user_id=user_id).first()
+    if stats is None:
+        return None
+    return {
+        'total_applications': stats.total_applications,
+        'status_counts': json.loads(stats.status_counts or '{}'),
+        'accepted_count': stats.accepted_count,
+        'success_rate': stats.accepted_rate,
+        'last_applied_at': stats.last_applied_at.isoformat() if stats.last_applied_at else None
+    }
+
+def get_leaderboard(limit=10, order_by='total_applications', session=None):
+    """Top users by total applications or accepted rate, read straight from the stats table"""
+    session = session or db.session
+    column = getattr(UserApplicationStats, order_by)
+    rows = session.query(UserApplicationStats).order_by(column.desc(), UserApplicationStats.user_id).limit(limit).all()
+    leaderboard = []
+    for stats in rows:
+        entry = stats.to_dict()
+        entry['status_counts'] = json.loads(stats.status_counts or '{}')
+        leaderboard.append(entry)
+    return leaderboard
+
+def rebuild_stats(session=None, batch_size=1000):
+    """Recompute the whole table from applications with one grouped query"""
+    session = session or db.session
+    rows = session.query(
+        Application.user_id, Application.status, func.count(Application.id), func.max(Application.applied_date)
+    ).group_by(Application.user_id, Application.status).all()
+
+    by_user = {}
+    for user_id, status, count, last_applied in rows:
+        entry = by_user.setdefault(user_id, {'counts': {}, 'last_applied_at': None})
+        entry['counts'][status or 'unknown'] = count
+        if last_applied and (entry['last_applied_at'] is None or last_applied > entry['last_applied_at']):
+            entry['last_applied_at'] = last_applied
+
+    now = datetime.utcnow()
+    mappings = []
+    for user_id, entry in by_user.items():
+        total = sum(entry['counts'].values())
+        accepted = entry['counts'].get(ACCEPTED_STATUS, 0)
+        mappings.append({
+            'user_id': user_id,
+            'total_applications': total,
+            'accepted_count': accepted,
+            'accepted_rate': round(accepted / total * 100, 2) if total else 0.0,
+            'status_counts': json.dumps(entry['counts']),
+            'last_applied_at': entry['last_applied_at'],
+            'updated_at': now
+        })
+
+    session.query(UserApplicationStats).delete()
+    for i in range(0, len(mappings), batch_size):
+        session.bulk_insert_mappings(UserApplicationStats, mappings[i:i + batch_size])
+    session.commit()
+    return len(mappings)
@@ -0,0 +1,266 @@
+"""
+Pool of warm headless Chrome sessions
+Launching Chrome costs seconds per request and unbounded launches under load
+can exhaust memory, so autofill requests borrow a WebDriver session from a
+bounded pool instead. Sessions are started ahead of time (from the first
+request a process serves, so scripts importing the app never launch Chrome),
+health-checked on checkout, wiped (cookies, storage, cache) on checkin so
+nothing leaks between users, and recycled after max_uses. When every session is busy, callers
+queue for up to checkout_timeout seconds and then get BrowserPoolExhausted.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+
+try:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+except ImportError:
+    webdriver = None
+    Options = None
+
+DEFAULT_SIZE = 2
+DEFAULT_PREWARM = 1
+DEFAULT_MAX_USES = 50
+DEFAULT_CHECKOUT_TIMEOUT = 30
+DEFAULT_PAGE_LOAD_TIMEOUT = 20
+
+CHROME_ARGUMENTS = (
+    '--headless',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--window-size=1920,1080'
+)
+
+# Clears the storage of whatever origin the session is on
+CLEAR_STORAGE_SCRIPT = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+class BrowserPoolExhausted(Exception):
+    """No browser session became free within the checkout timeout"""
+
+def create_chrome_driver():
+    """Start a headless Chrome WebDriver session"""
+    if webdriver is None:
+        raise RuntimeError('selenium is required for browser automation')
+    chrome_options = Options()
+    for argument in CHROME_ARGUMENTS:
+        chrome_options.add_argument(argument)
+    # get() returns once the DOM is parsed; readiness waits (page_waits) take it from there
+    chrome_options.page_load_strategy = 'eager'
+    return webdriver.Chrome(options=chrome_options)
+
+class BrowserSession:
+    """A pooled WebDriver and how often it has been handed out"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.monotonic()
+
+class BrowserPool:
+    """Bounded pool of reusable WebDriver sessions"""
+
+    def __init__(self, size=DEFAULT_SIZE, prewarm=DEFAULT_PREWARM, max_uses=DEFAULT_MAX_USES,
+                 checkout_timeout=DEFAULT_CHECKOUT_TIMEOUT, page_load_timeout=DEFAULT_PAGE_LOAD_TIMEOUT,
+                 driver_factory=create_chrome_driver):
+        self.size = size
+        self.prewarm = prewarm
+        self.max_uses = max_uses
+        self.checkout_timeout = checkout_timeout
+        self.page_load_timeout = page_load_timeout
+        self.driver_factory = driver_factory
+        self._idle = []
+        # Sessions alive or being launched, idle or checked out; never above size
+        self._open = 0
+        self._cond = threading.Condition()
+        self._warm_started = False
+        self._stats = {'checkouts': 0, 'launches': 0, 'recycled': 0, 'unhealthy': 0, 'timeouts': 0, 'waited': 0.0}
+
+    def init_app(self, app):
+        """Read pool limits from the Flask app config and warm sessions once the app serves requests"""
+        self.size = int(app.config.get('BROWSER_POOL_SIZE', self.size))
+        self.prewarm = min(self.size, int(app.config.get('BROWSER_POOL_PREWARM', self.prewarm)))
+        self.max_uses = int(app.config.get('BROWSER_POOL_MAX_USES', self.max_uses))
+        self.checkout_timeout = float(app.config.get('BROWSER_POOL_CHECKOUT_TIMEOUT', self.checkout_timeout))
+        self.page_load_timeout = float(app.config.get('AUTOFILL_NAVIGATION_TIMEOUT', self.page_load_timeout))
+        # Not at create_app(): scripts import the app too and must not launch Chrome
+        app.before_request(self.start_warming)
+
+    def start_warming(self):
+        """Warm prewarm sessions in the background, once per process"""
+        with self._cond:
+            if self._warm_started or self.prewarm <= 0:
+                return
+            self._warm_started = True
+        # In the background: requests must not wait for (or fail on) Chrome
+        threading.Thread(target=self.warm, name='browser-pool-warm', daemon=True).start()
+
+    def _count(self, key, amount=1):
+        with self._cond:
+            self._stats[key] += amount
+
+    def _launch(self):
+        driver = self.driver_factory()
+        try:
+            # A hanging page must not hold a pooled session for WebDriver's 300 s default
+            driver.set_page_load_timeout(self.page_load_timeout)
+        except Exception:
+            driver.quit()
+            raise
+        session = BrowserSession(driver)
+        self._count('launches')
+        return session
+
+    def _discard(self, session):
+        try:
+            session.driver.quit()
+        except Exception as e:
+            print(f"Error closing browser session: {e}")
+
+    def _release_slot(self):
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    def warm(self, count=None):
+        """Launch idle sessions until count (default: prewarm) are open"""
+        count = self.prewarm if count is None else count
+        while True:
+            with self._cond:
+                if self._open >= min(count, self.size):
+                    return
+                self._open += 1
+            try:
+                session = self._launch()
+            except Exception as e:
+                self._release_slot()
+                print(f"Error warming browser session: {e}")
+                return
+            with self._cond:
+                self._idle.append(session)
+                self._cond.notify()
+
+    def is_healthy(self, session):
+        """Whether the browser behind a session still answers commands"""
+        try:
+            return session.driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    def reset(self, session):
+        """Remove everything the last user left behind; raises if the browser is broken"""
+        driver = session.driver
+        driver.execute_script(CLEAR_STORAGE_SCRIPT)
+        origin = driver.execute_script('return window.location.origin')
+        if hasattr(driver, 'execute_cdp_cmd'):
+            # CDP reaches every origin the session visited, not just the current one
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+            if origin and origin.startswith('http'):
+                driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+        else:
+            driver.delete_all_cookies()
+        driver.get('about:blank')
+
+    def _acquire(self, timeout):
+        """Take an idle session, or a free slot to launch one (returns None then)"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while not self._idle and self._open >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise BrowserPoolExhausted(f'No browser session free after {timeout:g}s')
+                self._cond.wait(remaining)
+            if self._idle:
+                return self._idle.pop()
+            self._open += 1
+            return None
+
+    def checkout(self, timeout=None):
+        """Borrow a healthy session, waiting up to timeout seconds for a free one"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        start = time.monotonic()
+        while True:
+            session = self._acquire(timeout)
+            if session is None:
+                try:
+                    session = self._launch()
+                except Exception:
+                    self._release_slot()
+                    raise
+            elif not self.is_healthy(session):
+                self._count('unhealthy')
+                self._discard(session)
+                self._release_slot()
+                continue
+            break
+        session.uses += 1
+        with self._cond:
+            self._stats['checkouts'] += 1
+            self._stats['waited'] += time.monotonic() - start
+        return session
+
+    def checkin(self, session, healthy=True):
+        """Return a session: reset and keep it, or close it when broken or worn out"""
+        keep = healthy and session.uses < self.max_uses
+        if keep:
+            try:
+                self.reset(session)
+            except Exception as e:
+                print(f"Error resetting browser session: {e}")
+                self._count('unhealthy')
+                keep = False
+        elif healthy:
+            self._count('recycled')
+
+        if keep:
+            with self._cond:
+                self._idle.append(session)
+                self._cond.notify()
+            return
+
+        self._discard(session)
+        self._release_slot()
+        # Replace the closed session in the background so the next request finds a warm one
+        if self.prewarm > 0:
+            threading.Thread(target=self.warm, name='browser-pool-warm', daemon=True).start()
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """Context manager yielding a pooled WebDriver, checked back in on exit"""
+        session = self.checkout(timeout)
+        try:
+            yield session.driver
+        finally:
+            self.checkin(session)
+
+    def shutdown(self):
+        """Close all idle sessions; checked-out ones are closed on checkin"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self.prewarm = 0
+        for session in idle:
+            self._discard(session)
+            self._release_slot()
+
+    def stats(self):
+        """Pool occupancy and counters"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                'size': self.size,
+                'open': self._open,
+                'idle': len(self._idle),
+                'in_use': self._open - len(self._idle)
+            })
+        stats['waited'] = round(stats['waited'], 3)
+        return stats
+
+# Global browser pool instance
+browser_pool = BrowserPool()
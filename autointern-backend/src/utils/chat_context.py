@@ -0,0 +1,225 @@
+"""
+Token-budgeted chat context
+Builds the messages sent to the model from the session's rolling summary
+plus as many recent messages as fit in the budget. Older messages are folded
+into the summary incrementally in the background, and token counts are kept
+on ChatSession/ChatMessage so nothing is recounted per turn.
+"""
+
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import case, func
+from src.models.user_enhanced import db, ChatSession, ChatMessage
+from src.utils.llm_client import llm_client
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding('cl100k_base')
+except Exception:
+    _encoding = None
+
+TRUNCATION_MARKER = ' … [truncated]'
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running summary of a career-assistant conversation. "
+    "Merge the new messages into the existing summary. Keep facts about the user "
+    "(skills, experience, goals, target roles, documents they shared) and any open "
+    "questions. Be concise and write in the language of the conversation."
+)
+
+def count_tokens(text):
+    """Token count of text (tiktoken when installed, otherwise ~4 characters per token)"""
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return len(text) // 4 + 1
+
+def truncate_to_tokens(text, max_tokens):
+    """Cut text down to about max_tokens, marking the cut"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    if _encoding is not None:
+        return _encoding.decode(_encoding.encode(text)[:max_tokens]) + TRUNCATION_MARKER
+    return text[:max_tokens * 4] + TRUNCATION_MARKER
+
+class ChatContextManager:
+    """Assembles budgeted model context and maintains the per-session summary"""
+
+    def __init__(self, max_context_tokens=3000, max_message_tokens=600, max_current_tokens=1500,
+                 summary_trigger_tokens=1500, summary_max_tokens=300, keep_recent_messages=4,
+                 max_history_messages=50):
+        self.max_context_tokens = max_context_tokens
+        self.max_message_tokens = max_message_tokens
+        self.max_current_tokens = max_current_tokens
+        self.summary_trigger_tokens = summary_trigger_tokens
+        self.summary_max_tokens = summary_max_tokens
+        self.keep_recent_messages = keep_recent_messages
+        self.max_history_messages = max_history_messages
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='chat-summary')
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Read budgets from the Flask app config"""
+        self.max_context_tokens = int(app.config.get('CHAT_CONTEXT_MAX_TOKENS', self.max_context_tokens))
+        self.summary_trigger_tokens = int(app.config.get('CHAT_SUMMARY_TRIGGER_TOKENS', self.summary_trigger_tokens))
+
+    def add_message(self, chat_session, message_type, content, metadata=None):
+        """Add a message to the session and keep the token counters current"""
+        tokens = count_tokens(content)
+        if chat_session.history_tokens is None:
+            self._backfill_history_tokens(chat_session)
+        message = ChatMessage(
+            session_id=chat_session.id,
+            message_type=message_type,
+            content=content,
+            message_metadata=metadata,
+            token_count=tokens
+        )
+        db.session.add(message)
+        # Increment in SQL: a background summary may decrement the same counter meanwhile
+        ChatSession.query.filter_by(id=chat_session.id).update({
+            'history_tokens': ChatSession.history_tokens + tokens
+        }, synchronize_session=False)
+        db.session.expire(chat_session, ['history_tokens'])
+        return message
+
+    def _backfill_history_tokens(self, chat_session):
+        """Compute the unsummarized token total once for sessions that predate the counter"""
+        total = db.session.query(
+            func.coalesce(func.sum(func.coalesce(ChatMessage.token_count, func.length(ChatMessage.content) / 4)), 0)
+        ).filter(
+            ChatMessage.session_id == chat_session.id,
+            ChatMessage.id > (chat_session.summary_message_id or 0)
+        ).scalar()
+        ChatSession.query.filter(
+            ChatSession.id == chat_session.id,
+            ChatSession.history_tokens.is_(None)
+        ).update({'history_tokens': int(total or 0)}, synchronize_session=False)
+
+    def build_messages(self, chat_session, message, system_prompt):
+        """Build the model context for a new user message within the token budget"""
+        current = truncate_to_tokens(message, self.max_current_tokens)
+        context = [{"role": "system", "content": system_prompt}]
+        budget = self.max_context_tokens - count_tokens(system_prompt) - count_tokens(current)
+
+        if chat_session.summary:
+            summary = "Summary of the earlier conversation:\n" + chat_session.summary
+            context.append({"role": "system", "content": summary})
+            budget -= chat_session.summary_tokens or count_tokens(summary)
+
+        # Pick messages newest-first from their stored sizes, then load only those
+        candidates = db.session.query(
+            ChatMessage.id,
+            func.coalesce(ChatMessage.token_count, func.length(ChatMessage.content) / 4)
+        ).filter(
+            ChatMessage.session_id == chat_session.id,
+            ChatMessage.id > (chat_session.summary_message_id or 0)
+        ).order_by(ChatMessage.id.desc()).limit(self.max_history_messages).all()
+
+        selected = []
+        for message_id, tokens in candidates:
+            cost = min(int(tokens or 0), self.max_message_tokens)
+            if cost > budget:
+                break
+            budget -= cost
+            selected.append(message_id)
+
+        if selected:
+            history = ChatMessage.query.filter(ChatMessage.id.in_(selected)).order_by(ChatMessage.id).all()
+            for msg in history:
+                role = "user" if msg.message_type == "user" else "assistant"
+                context.append({"role": role, "content": truncate_to_tokens(msg.content, self.max_message_tokens)})
+
+        context.append({"role": "user", "content": current})
+        return context
+
+    def needs_summary(self, chat_session):
+        """Whether enough unsummarized history has built up to fold some of it"""
+        return (chat_session.history_tokens or 0) > self.summary_trigger_tokens
+
+    def schedule_summary(self, app, chat_session_id):
+        """Update the session summary in the background (at most one job per session)"""
+        with self._lock:
+            if chat_session_id in self._pending:
+                return
+            self._pending.add(chat_session_id)
+
+        def run():
+            try:
+                with app.app_context():
+                    self.update_summary(chat_session_id)
+            except Exception as e:
+                print(f"Error updating chat summary: {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(chat_session_id)
+
+        self._executor.submit(run)
+
+    def update_summary(self, chat_session_id):
+        """Fold all but the most recent messages into the rolling summary"""
+        chat_session = db.session.get(ChatSession, chat_session_id)
+        if chat_session is None or not self.needs_summary(chat_session):
+            return False
+
+        since = chat_session.summary_message_id or 0
+        recent = ChatMessage.query.filter(
+            ChatMessage.session_id == chat_session_id,
+            ChatMessage.id > since
+        ).order_by(ChatMessage.id.desc()).limit(self.keep_recent_messages).all()
+        if not recent:
+            return False
+        keep_from = recent[-1].id
+
+        folded = ChatMessage.query.filter(
+            ChatMessage.session_id == chat_session_id,
+            ChatMessage.id > since,
+            ChatMessage.id < keep_from
+        ).order_by(ChatMessage.id).all()
+        if not folded:
+            return False
+
+        transcript = '\n'.join(
+            f"{'User' if msg.message_type == 'user' else 'Assistant'}: "
+            f"{truncate_to_tokens(msg.content, self.max_message_tokens)}"
+            for msg in folded
+        )
+        prompt = (
+            f"Existing summary:\n{chat_session.summary or '(none)'}\n\n"
+            f"New messages:\n{transcript}\n\n"
+            f"Write the updated summary in at most {self.summary_max_tokens} tokens."
+        )
+        folded_tokens = sum(msg.token_count or count_tokens(msg.content) for msg in folded)
+        folded_until = folded[-1].id
+        previous_until = chat_session.summary_message_id
+
+        # Don't hold the read transaction open during the LLM call
+        db.session.commit()
+
+        summary = llm_client.chat(
+            messages=[
+                {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=self.summary_max_tokens,
+            temperature=0.2
+        )
+
+        # Only apply if no other update moved the summary meanwhile
+        updated = ChatSession.query.filter_by(id=chat_session_id, summary_message_id=previous_until).update({
+            'summary': summary,
+            'summary_message_id': folded_until,
+            'summary_tokens': count_tokens(summary),
+            'history_tokens': case(
+                (ChatSession.history_tokens > folded_tokens, ChatSession.history_tokens - folded_tokens), else_=0
+            ),
+            'summary_updated_at': datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+        return bool(updated)
+
+# Global chat context manager instance
+chat_context = ChatContextManager()
@@ -0,0 +1,186 @@
+"""
+Compiled CV field extraction
+Email, phone, years of experience, education level and job titles are read
+from a CV in one call. Patterns are compiled once at import, the text is
+lowercased once, first-match fields stop at the first hit instead of
+collecting every match, each education level is one alternation search,
+phone patterns are only tried next to digit runs, and patterns whose
+required words are absent are skipped. Results
+are identical to the original per-field functions (see
+src/data/cv_field_corpus.json and scripts/benchmark_cv_fields.py).
+"""
+
+import re
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+# Tried in order; the first pattern with any match wins. Every match holds a
+# run of 3+ digits starting at most `lead` characters after the match start,
+# so only positions near such runs are tried. A third pattern,
+# \b[0-9]{10,15}\b, never matches when the first one fails (any 10 digits in
+# a row match the first), so it is left out.
+PHONE_PATTERNS = [
+    (4, re.compile(r'\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}')),
+    (5, re.compile(r'\+?[0-9]{1,3}[-.\s]?[0-9]{3,4}[-.\s]?[0-9]{3,4}[-.\s]?[0-9]{3,4}'))
+]
+DIGIT_RUN_PATTERN = re.compile(r'[0-9]{3,}')
+
+# Matched against the lowercased text, tried in order; a pattern is skipped
+# when one of its required words is missing
+EXPERIENCE_PATTERNS = [
+    (('year', 'experience'), re.compile(r'(\d+)\+?\s*years?\s*(?:of\s*)?experience')),
+    (('year', 'experience'), re.compile(r'experience\s*:?\s*(\d+)\+?\s*years?')),
+    (('year',), re.compile(r'(\d+)\+?\s*years?\s*in\s*(?:the\s*)?(?:field|industry)'))
+]
+
+# Highest level first; a level applies if any keyword occurs anywhere in the text
+EDUCATION_KEYWORDS = {
+    'phd': ['phd', 'ph.d', 'doctorate', 'doctoral'],
+    'masters': ['masters', 'master', 'm.s', 'msc', 'm.sc', 'mba', 'm.a'],
+    'bachelors': ['bachelors', 'bachelor', 'b.s', 'bsc', 'b.sc', 'b.a', 'ba', 'bs'],
+    'associates': ['associates', 'associate', 'a.s', 'aa'],
+    'high_school': ['high school', 'secondary', 'diploma']
+}
+
+COMMON_JOB_TITLES = [
+    'software engineer', 'developer', 'programmer', 'analyst', 'manager',
+    'intern', 'associate', 'specialist', 'consultant', 'coordinator',
+    'designer', 'architect', 'lead', 'senior', 'junior', 'data scientist'
+]
+
+def _keyword_alternation(keywords):
+    return '|'.join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+
+# One alternation per level, searched highest level first. A combined
+# lookahead over all levels is exact too but several times slower in re.
+EDUCATION_PATTERNS = [
+    (level, re.compile(_keyword_alternation(keywords))) for level, keywords in EDUCATION_KEYWORDS.items()
+]
+
+# (literal that must occur for any match, pattern); the pattern is skipped
+# when its literal is absent. Searched separately since matches can overlap
+# (e.g. "role" inside "Controle").
+TITLE_PATTERNS = [
+    (None, re.compile(r'(?:^|\n)\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s*(?:at|@|\|)', re.MULTILINE)),
+    (('position', 'role', 'title'), re.compile(r'(?:position|role|title)\s*:?\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)')),
+    (('worked as', 'served as'), re.compile(r'(?:worked as|served as)\s+(?:a\s+)?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'))
+]
+
+def find_email(text):
+    """First email address in the text, or None"""
+    if '@' not in text:
+        return None
+    match = EMAIL_PATTERN.search(text)
+    return match.group(0) if match else None
+
+def _search_near_digit_runs(pattern, text, lead):
+    """Same result as pattern.search(text), trying only starts near digit runs"""
+    tried = 0
+    for run in DIGIT_RUN_PATTERN.finditer(text):
+        for start in range(max(tried, run.start() - lead), run.end() - 2):
+            match = pattern.match(text, start)
+            if match:
+                return match
+        tried = max(tried, run.end() - 2)
+    return None
+
+def find_phone(text):
+    """First phone number, by pattern priority, or None"""
+    for lead, pattern in PHONE_PATTERNS:
+        match = _search_near_digit_runs(pattern, text, lead)
+        if match:
+            return match.group(0)
+    return None
+
+def find_experience_years(text_lower):
+    """Years of experience stated in the lowercased text, or 0"""
+    for required, pattern in EXPERIENCE_PATTERNS:
+        if not all(word in text_lower for word in required):
+            continue
+        match = pattern.search(text_lower)
+        if match:
+            return int(match.group(1))
+    return 0
+
+def find_education_level(text_lower):
+    """Highest education level with a keyword in the lowercased text, or 'unknown'"""
+    for level, pattern in EDUCATION_PATTERNS:
+        if pattern.search(text_lower):
+            return level
+    return 'unknown'
+
+def find_job_titles(text, text_lower):
+    """Distinct job titles from title patterns and the common title list"""
+    titles = set()
+    for required, pattern in TITLE_PATTERNS:
+        if required is None or any(literal in text for literal in required):
+            titles.update(pattern.findall(text))
+    # Plain substring checks beat a regex alternation over this short list
+    titles.update(title for title in COMMON_JOB_TITLES if title in text_lower)
+    return list(titles)
+
+def extract_fields(text):
+    """All regex-derived CV fields in one call"""
+    text_lower = text.lower()
+    return {
+        'email': find_email(text),
+        'phone': find_phone(text),
+        'experience_years': find_experience_years(text_lower),
+        'education_level': find_education_level(text_lower),
+        'job_titles': find_job_titles(text, text_lower)
+    }
+
+class FieldAccumulator:
+    """extract_fields over a document that arrives page by page
+
+    First-match fields keep the earliest hit per pattern and pick by pattern
+    priority at the end, so the result matches extract_fields on the joined
+    text. Each page is searched together with the last line of the previous
+    one, so matches across a page break are still found. Job titles come from
+    a non-overlapping scan of the whole text, so they are found once at the end.
+    """
+
+    def __init__(self):
+        self.email = None
+        self.phones = [None] * len(PHONE_PATTERNS)
+        self.experience = [None] * len(EXPERIENCE_PATTERNS)
+        self.levels = set()
+        self.pages = []
+        self.tail = ''
+
+    def feed(self, page):
+        """Search one page (pages are joined by newlines)"""
+        text = self.tail + page
+        text_lower = text.lower()
+        self.tail = text[text.rfind('\n') + 1:] + '\n'
+
+        if self.email is None:
+            self.email = find_email(text)
+        for number, (lead, pattern) in enumerate(PHONE_PATTERNS):
+            if self.phones[number] is None:
+                match = _search_near_digit_runs(pattern, text, lead)
+                self.phones[number] = match.group(0) if match else None
+        for number, (required, pattern) in enumerate(EXPERIENCE_PATTERNS):
+            if self.experience[number] is None and all(word in text_lower for word in required):
+                match = pattern.search(text_lower)
+                self.experience[number] = int(match.group(1)) if match else None
+        for level, pattern in EDUCATION_PATTERNS:
+            if level not in self.levels and pattern.search(text_lower):
+                self.levels.add(level)
+        self.pages.append(page)
+
+    @property
+    def text(self):
+        """The pages fed so far, joined by newlines"""
+        return '\n'.join(self.pages) + '\n' if self.pages else ''
+
+    def result(self):
+        """The fields extract_fields returns"""
+        text = self.text
+        return {
+            'email': self.email,
+            'phone': next((phone for phone in self.phones if phone), None),
+            'experience_years': next((years for years in self.experience if years is not None), 0),
+            'education_level': next((level for level, _ in EDUCATION_PATTERNS if level in self.levels), 'unknown'),
+            'job_titles': find_job_titles(text, text.lower())
+        }
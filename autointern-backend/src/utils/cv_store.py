@@ -0,0 +1,80 @@
+"""
+Content-addressed CV storage
+Uploads are hashed (SHA-256) while they stream to disk and kept once per
+content as UPLOAD_FOLDER/cvs/<hash>.<ext>. Parse results are stored per
+(content hash, parser version, language), so re-uploading an identical file
+skips text extraction, NLP and the AI keyword call.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from datetime import datetime
+from sqlalchemy.dialects import postgresql, sqlite
+from src.models.user_enhanced import db, CVParseResult
+
+CHUNK_SIZE = 64 * 1024
+
+def save_upload(file, upload_dir, extension, chunk_size=CHUNK_SIZE):
+    """Stream an uploaded file to disk while hashing it
+
+    Returns (file_path, content_hash, size, duplicate); duplicate is True when
+    a file with the same content was already stored and the new copy dropped.
+    """
+    os.makedirs(upload_dir, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=upload_dir, prefix='.upload-')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = file.stream.read(chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+
+        content_hash = digest.hexdigest()
+        file_path = os.path.join(upload_dir, f'{content_hash}.{extension}')
+        if os.path.exists(file_path):
+            os.remove(temp_path)
+            return file_path, content_hash, size, True
+
+        # Atomic, so concurrent uploads of the same file are harmless
+        os.replace(temp_path, file_path)
+        return file_path, content_hash, size, False
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def get_parse_result(content_hash, parser_version, language):
+    """Return (extracted_text, parsed_data) stored for this content, or None"""
+    result = db.session.get(CVParseResult, (content_hash, parser_version, language))
+    if result is None:
+        return None
+    return result.extracted_text, json.loads(result.parsed_data)
+
+def store_parse_result(session, content_hash, parser_version, language, extracted_text, parsed_data):
+    """Save a parse result in the caller's transaction (first writer wins, no commit)"""
+    values = {
+        'content_hash': content_hash,
+        'parser_version': parser_version,
+        'language': language,
+        'extracted_text': extracted_text,
+        'parsed_data': json.dumps(parsed_data),
+        'created_at': datetime.utcnow()
+    }
+
+    dialect_name = session.get_bind().dialect.name
+    if dialect_name in ('sqlite', 'postgresql'):
+        insert = postgresql.insert if dialect_name == 'postgresql' else sqlite.insert
+        session.execute(insert(CVParseResult.__table__).values(**values).on_conflict_do_nothing(
+            index_elements=['content_hash', 'parser_version', 'language']
+        ))
+        return
+
+    if session.get(CVParseResult, (content_hash, parser_version, language)) is None:
+        session.add(CVParseResult(**values))
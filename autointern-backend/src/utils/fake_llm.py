@@ -0,0 +1,162 @@
+"""
+Local fake of the OpenAI chat completions API
+Serves /v1/chat/completions on localhost with configurable latency and
+injected rate-limit errors, so the LLM client and the AI routes can be
+exercised without network access (point OPENAI_API_BASE at api_base).
+Requests with "stream": true are answered as server-sent event chunks, one
+word at a time, after first_token_latency and token_delay.
+"""
+
+import json
+import time
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class FakeCompletionServer:
+    """Threaded HTTP server answering chat completions with canned text"""
+
+    def __init__(self, latency=0.2, error_rate=0.0, reply=None, port=0, seed=None,
+                 first_token_latency=0.2, token_delay=0.02):
+        self.latency = latency
+        self.first_token_latency = first_token_latency
+        self.token_delay = token_delay
+        self.error_rate = error_rate
+        self.reply = reply or (lambda messages: f"Fake reply to: {messages[-1]['content'][:80]}")
+        self.requests = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def api_base(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/v1'
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                request = json.loads(self.rfile.read(length) or b'{}')
+                if request.get('stream'):
+                    status, chunks = fake.handle_stream(self.path, request)
+                    if status != 200:
+                        self._send(status, chunks)
+                        return
+                    # HTTP/1.0 response: the body ends when the connection closes
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/event-stream')
+                    self.end_headers()
+                    try:
+                        for chunk in chunks:
+                            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+                            self.wfile.flush()
+                        self.wfile.write(b"data: [DONE]\n\n")
+                        self.wfile.flush()
+                    except (BrokenPipeError, ConnectionResetError):
+                        # Client stopped reading mid-stream
+                        pass
+                    return
+                status, body = fake.handle(self.path, request)
+                self._send(status, body)
+
+        return Handler
+
+    def handle(self, path, request):
+        """Build the (status, body) answer for a request"""
+        with self._lock:
+            self.requests += 1
+            limited = self._random.random() < self.error_rate
+            if limited:
+                self.rate_limited += 1
+
+        if not path.endswith('/chat/completions'):
+            return 404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}}
+        if limited:
+            return 429, {'error': {'message': 'Rate limit reached', 'type': 'rate_limit_error'}}
+
+        time.sleep(self.latency)
+        messages = request.get('messages', [])
+        content = self.reply(messages)
+        prompt_tokens = sum(len(message.get('content') or '') for message in messages) // 4
+        completion_tokens = len(content) // 4
+        return 200, {
+            'id': f'chatcmpl-fake-{self.requests}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens
+            }
+        }
+
+    def handle_stream(self, path, request):
+        """Build (status, chunk iterator) for a streaming request"""
+        with self._lock:
+            self.requests += 1
+            limited = self._random.random() < self.error_rate
+            if limited:
+                self.rate_limited += 1
+
+        if not path.endswith('/chat/completions'):
+            return 404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}}
+        if limited:
+            return 429, {'error': {'message': 'Rate limit reached', 'type': 'rate_limit_error'}}
+
+        content = self.reply(request.get('messages', []))
+        words = content.split(' ')
+
+        def chunks():
+            created = int(time.time())
+            base = {'id': f'chatcmpl-fake-{self.requests}', 'object': 'chat.completion.chunk',
+                    'created': created, 'model': request.get('model')}
+            time.sleep(self.first_token_latency)
+            yield dict(base, choices=[{'index': 0, 'delta': {'role': 'assistant'}, 'finish_reason': None}])
+            for position, word in enumerate(words):
+                if position:
+                    time.sleep(self.token_delay)
+                    word = ' ' + word
+                yield dict(base, choices=[{'index': 0, 'delta': {'content': word}, 'finish_reason': None}])
+            yield dict(base, choices=[{'index': 0, 'delta': {}, 'finish_reason': 'stop'}])
+
+        return 200, chunks()
+
+    def start(self):
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
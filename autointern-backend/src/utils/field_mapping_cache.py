@@ -0,0 +1,190 @@
+"""
+Shared cache of detected form field mappings
+Many users apply through the same ATS pages (Greenhouse, Lever, Workday
+tenants), so a form detected once is reused by everyone until the entry
+expires (AUTOFILL_FIELD_CACHE_TTL). Entries are keyed by the normalized URL
+(job ids replaced by *, so every job of a tenant shares one key) plus a
+fingerprint of the form's control structure, which keeps different layouts
+under one URL pattern apart. An entry is dropped when filling against one of
+its selectors fails, and the most used entry of each domain is offered as an
+autofill template.
+"""
+
+import re
+import json
+import hashlib
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from sqlalchemy.dialects import postgresql, sqlite
+from src.models.user_enhanced import FormFieldMapping
+
+DEFAULT_TTL = 24 * 3600  # seconds
+DEFAULT_TEMPLATE_LIMIT = 50
+
+# Path segments and query values that identify one job rather than the form:
+# anything with 3+ digits in a row, a UUID or a long hex id
+ID_PATTERN = re.compile(r'[0-9]{3,}|[0-9a-f]{8}-[0-9a-f]{4}-|^[0-9a-f]{16,}$', re.IGNORECASE)
+DIGITS_PATTERN = re.compile(r'[0-9]+')
+
+# Query parameters that select the tenant's form (Greenhouse embeds use ?for=acme);
+# all others (tracking, sources, tokens) are dropped from the key
+FORM_QUERY_KEYS = {'for', 'board', 'company', 'tenant'}
+
+def normalize_url(url):
+    """Cache key for a form URL: lowercase host without www, job ids as *, only FORM_QUERY_KEYS kept
+
+    https://boards.greenhouse.io/acme/jobs/4012345?gh_src=x1&for=acme
+    becomes boards.greenhouse.io/acme/jobs/*?for=acme
+    """
+    parts = urlsplit(url if '://' in url else 'https://' + url)
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    segments = ['*' if ID_PATTERN.search(segment) else segment for segment in parts.path.split('/') if segment]
+    query = sorted(
+        (key.lower(), value) for key, value in parse_qsl(parts.query)
+        if key.lower() in FORM_QUERY_KEYS and not ID_PATTERN.search(value)
+    )
+    url_key = host + '/' + '/'.join(segments)
+    return (url_key + '?' + urlencode(query) if query else url_key)[:500]
+
+def dom_fingerprint(controls):
+    """Hash of the form's structure: tag, type, name and id of every control, digits ignored
+
+    Labels are left out so translated pages share a fingerprint; digits
+    are left out so generated ids (field_1234) do not change it.
+    """
+    structure = '|'.join(
+        ':'.join(DIGITS_PATTERN.sub('#', control.get(key) or '') for key in ('tag', 'type', 'name', 'id'))
+        for control in controls
+    )
+    return hashlib.sha1(structure.encode('utf-8')).hexdigest()
+
+class FieldMappingCache:
+    """Detected field mappings per (normalized URL, DOM fingerprint), shared through the database"""
+
+    def __init__(self, enabled=True, ttl=DEFAULT_TTL, template_limit=DEFAULT_TEMPLATE_LIMIT):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.template_limit = template_limit
+
+    def init_app(self, app):
+        """Read the cache settings from the Flask app config"""
+        self.enabled = bool(app.config.get('AUTOFILL_FIELD_CACHE_ENABLED', self.enabled))
+        self.ttl = int(app.config.get('AUTOFILL_FIELD_CACHE_TTL', self.ttl))
+        self.template_limit = int(app.config.get('AUTOFILL_TEMPLATE_LIMIT', self.template_limit))
+
+    def _fresh(self):
+        return FormFieldMapping.detected_at >= datetime.utcnow() - timedelta(seconds=self.ttl)
+
+    def _entry(self, mapping):
+        return {
+            'url_key': mapping.url_key,
+            'fingerprint': mapping.fingerprint,
+            'field_mappings': json.loads(mapping.field_mappings),
+            'tier': mapping.tier,
+            'cached_at': mapping.detected_at.isoformat() if mapping.detected_at else None
+        }
+
+    def _hit(self, mapping):
+        """Count a use in the caller's transaction (no commit)"""
+        mapping.hits = (mapping.hits or 0) + 1
+        mapping.last_hit_at = datetime.utcnow()
+        return self._entry(mapping)
+
+    def get(self, url):
+        """Most recently detected fresh mapping for this URL's key, or None"""
+        if not self.enabled:
+            return None
+        mapping = FormFieldMapping.query.filter(
+            FormFieldMapping.url_key == normalize_url(url),
+            self._fresh()
+        ).order_by(FormFieldMapping.detected_at.desc()).first()
+        return self._hit(mapping) if mapping else None
+
+    def get_variant(self, url, fingerprint):
+        """Fresh mapping for this URL's key and exactly this form structure, or None"""
+        if not self.enabled:
+            return None
+        mapping = FormFieldMapping.query.filter(
+            FormFieldMapping.url_key == normalize_url(url),
+            FormFieldMapping.fingerprint == fingerprint,
+            self._fresh()
+        ).first()
+        return self._hit(mapping) if mapping else None
+
+    def put(self, session, url, fingerprint, detected_fields, tier):
+        """Store a detection result in the caller's transaction (last writer wins, no commit)"""
+        if not self.enabled or not detected_fields:
+            return
+        url_key = normalize_url(url)
+        values = {
+            'url_key': url_key,
+            'fingerprint': fingerprint,
+            'domain': url_key.split('/', 1)[0],
+            'field_mappings': json.dumps(detected_fields),
+            'tier': tier,
+            'hits': 0,
+            'detected_at': datetime.utcnow()
+        }
+
+        dialect_name = session.get_bind().dialect.name
+        if dialect_name in ('sqlite', 'postgresql'):
+            insert = (postgresql.insert if dialect_name == 'postgresql' else sqlite.insert)(FormFieldMapping.__table__)
+            session.execute(insert.values(**values).on_conflict_do_update(
+                index_elements=['url_key', 'fingerprint'],
+                set_={key: values[key] for key in ('field_mappings', 'tier', 'detected_at')}
+            ))
+            return
+
+        mapping = session.get(FormFieldMapping, (url_key, fingerprint))
+        if mapping is None:
+            session.add(FormFieldMapping(**values))
+        else:
+            mapping.field_mappings = values['field_mappings']
+            mapping.tier = tier
+            mapping.detected_at = values['detected_at']
+
+    def invalidate(self, session, url, selectors=None):
+        """Drop this URL key's mappings that use any of the selectors (all of them without selectors)
+
+        Runs in the caller's transaction (no commit); returns the number of mappings dropped.
+        """
+        dropped = 0
+        for mapping in session.query(FormFieldMapping).filter_by(url_key=normalize_url(url)).all():
+            used = {info.get('selector') for info in json.loads(mapping.field_mappings).values()}
+            if selectors is None or used.intersection(selectors):
+                session.delete(mapping)
+                dropped += 1
+        return dropped
+
+    def templates(self):
+        """Autofill templates from the most used fresh mapping of each domain"""
+        if not self.enabled:
+            return {}
+        mappings = FormFieldMapping.query.filter(self._fresh()).order_by(
+            FormFieldMapping.hits.desc(), FormFieldMapping.detected_at.desc()
+        ).limit(self.template_limit * 5).all()
+
+        templates = {}
+        for mapping in mappings:
+            if mapping.domain in templates:
+                continue
+            # Only the domain: url_key holds paths other users filled
+            templates[mapping.domain] = {
+                'name': mapping.domain,
+                'url_pattern': mapping.domain,
+                'field_mappings': {
+                    field: {'selector': info.get('selector')}
+                    for field, info in json.loads(mapping.field_mappings).items()
+                },
+                'source': 'detected',
+                'hits': mapping.hits or 0,
+                'detected_at': mapping.detected_at.isoformat() if mapping.detected_at else None
+            }
+            if len(templates) >= self.template_limit:
+                break
+        return templates
+
+# Global field mapping cache instance
+field_mapping_cache = FieldMappingCache()
@@ -0,0 +1,380 @@
+"""
+Form field detection
+One injected script walks the DOM once and returns, for every input,
+textarea and select, the signals that describe it: attributes, autocomplete
+hint, associated <label>, aria-label/aria-labelledby text, and the text
+right next to it. The whole page costs one WebDriver round trip instead of a
+find_elements call per selector plus a get_attribute call per attribute.
+scan_html() extracts the same signals from static HTML with BeautifulSoup.
+The signals are then scored in Python against declarative field rules, so
+new fields, keywords (including Arabic) or signal weights are a data change.
+"""
+
+import re
+
+try:
+    from bs4 import BeautifulSoup, NavigableString
+except ImportError:
+    BeautifulSoup = None
+
+# Runs in the page; returns one compact dict per form control, empty values left out
+FIELD_SCAN_SCRIPT = """
+var SKIP_TYPES = {hidden: 1, submit: 1, button: 1, reset: 1, image: 1, checkbox: 1, radio: 1};
+var LIMIT = 120;
+
+function clip(text) {
+    return (text || '').replace(/\\s+/g, ' ').trim().slice(0, LIMIT);
+}
+
+function unique(selector) {
+    try { return document.querySelectorAll(selector).length === 1; } catch (e) { return false; }
+}
+
+function selectorFor(el) {
+    var tag = el.tagName.toLowerCase();
+    if (el.id && unique('#' + CSS.escape(el.id))) return '#' + CSS.escape(el.id);
+    var name = el.getAttribute('name');
+    if (name) {
+        var byName = tag + '[name="' + name.replace(/(["\\\\])/g, '\\\\$1') + '"]';
+        if (unique(byName)) return byName;
+    }
+    var parts = [];
+    for (var node = el; node && node.parentElement; node = node.parentElement) {
+        var index = 1;
+        for (var sibling = node.previousElementSibling; sibling; sibling = sibling.previousElementSibling) {
+            if (sibling.tagName === node.tagName) index++;
+        }
+        parts.unshift(node.tagName.toLowerCase() + ':nth-of-type(' + index + ')');
+    }
+    return parts.join(' > ');
+}
+
+function labelText(el) {
+    var texts = [];
+    for (var i = 0; el.labels && i < el.labels.length; i++) texts.push(el.labels[i].textContent);
+    return clip(texts.join(' '));
+}
+
+function ariaText(el) {
+    var texts = [el.getAttribute('aria-label')];
+    var ids = (el.getAttribute('aria-labelledby') || '').split(/\\s+/);
+    for (var i = 0; i < ids.length; i++) {
+        var labelledBy = ids[i] && document.getElementById(ids[i]);
+        if (labelledBy) texts.push(labelledBy.textContent);
+    }
+    return clip(texts.join(' '));
+}
+
+function nearbyText(el) {
+    var texts = [];
+    var previous = el.previousElementSibling;
+    // A previous sibling wrapping another control holds that control's label, not this one's
+    if (previous && !previous.querySelector('input, textarea, select')) texts.push(previous.textContent);
+    var parent = el.parentElement;
+    for (var i = 0; parent && i < parent.childNodes.length; i++) {
+        if (parent.childNodes[i].nodeType === 3) texts.push(parent.childNodes[i].textContent);
+    }
+    return clip(texts.join(' '));
+}
+
+var controls = [];
+var elements = document.querySelectorAll('input, textarea, select');
+for (var i = 0; i < elements.length; i++) {
+    var el = elements[i];
+    var type = (el.getAttribute('type') || '').toLowerCase();
+    if (SKIP_TYPES[type] || el.disabled) continue;
+    var control = {
+        index: i,
+        tag: el.tagName.toLowerCase(),
+        type: type,
+        name: el.getAttribute('name'),
+        id: el.id,
+        placeholder: el.getAttribute('placeholder'),
+        autocomplete: el.getAttribute('autocomplete'),
+        title: el.getAttribute('title'),
+        label: labelText(el),
+        aria: ariaText(el),
+        nearby: nearbyText(el),
+        visible: !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length),
+        selector: selectorFor(el)
+    };
+    for (var key in control) {
+        if (control[key] === '' || control[key] === null) delete control[key];
+    }
+    controls.push(control);
+}
+return controls;
+"""
+
+# Mirrors SKIP_TYPES and LIMIT in FIELD_SCAN_SCRIPT
+SKIPPED_INPUT_TYPES = ('hidden', 'submit', 'button', 'reset', 'image', 'checkbox', 'radio')
+TEXT_LIMIT = 120
+
+TEXT_TYPES = ('', 'text', 'email', 'tel', 'url', 'search', 'number')
+
+# How much a keyword hit in each signal counts; autocomplete and type are
+# matched exactly against the rule's autocomplete tokens and input types
+SIGNAL_WEIGHTS = {
+    'autocomplete': 6,
+    'type': 5,
+    'name': 3,
+    'id': 3,
+    'label': 3,
+    'aria': 3,
+    'placeholder': 2,
+    'nearby': 2,
+    'title': 1
+}
+
+TEXT_SIGNALS = ('name', 'id', 'label', 'aria', 'placeholder', 'nearby', 'title')
+
+# A control needs at least this score to be assigned a field
+MIN_SCORE = 2
+
+# keywords: matched as whole words in the normalized signal text
+# exclude: words that rule the field out when any signal has them (e.g. "first" for name)
+# tags / types: which elements and input types the field can be
+FIELD_RULES = {
+    'first_name': {
+        'keywords': ['first name', 'firstname', 'given name', 'fname', 'forename', 'الاسم الأول'],
+        'autocomplete': ['given-name']
+    },
+    'last_name': {
+        'keywords': ['last name', 'lastname', 'surname', 'family name', 'lname', 'اسم العائلة'],
+        'autocomplete': ['family-name']
+    },
+    'name': {
+        'keywords': ['full name', 'fullname', 'your name', 'name', 'الاسم'],
+        'exclude': ['first', 'last', 'given', 'family', 'middle', 'user', 'username', 'company', 'file', 'sur', 'fname', 'lname',
+                    'الأول', 'العائلة'],
+        'autocomplete': ['name']
+    },
+    'email': {
+        'keywords': ['email', 'e mail', 'mail', 'البريد الإلكتروني', 'البريد'],
+        'types': ['email'],
+        'autocomplete': ['email']
+    },
+    'phone': {
+        'keywords': ['phone', 'mobile', 'telephone', 'tel', 'cell', 'phone number', 'الهاتف', 'الجوال', 'رقم الهاتف'],
+        'types': ['tel'],
+        'autocomplete': ['tel', 'tel-national']
+    },
+    'linkedin': {
+        'keywords': ['linkedin', 'linked in', 'linkedin url', 'linkedin profile']
+    },
+    'github': {
+        'keywords': ['github', 'git hub']
+    },
+    'portfolio': {
+        'keywords': ['portfolio', 'website', 'personal website', 'personal site', 'homepage', 'الموقع'],
+        'exclude': ['linkedin', 'github'],
+        'types': ['url'],
+        'autocomplete': ['url']
+    },
+    'cover_letter': {
+        'keywords': ['cover letter', 'coverletter', 'cover', 'letter', 'motivation', 'رسالة التغطية'],
+        'tags': ['textarea']
+    },
+    'resume': {
+        'keywords': ['resume', 'résumé', 'cv', 'curriculum vitae', 'السيرة الذاتية'],
+        'types': ['file'],
+        'allowed_types': ('file',) + TEXT_TYPES
+    }
+}
+
+CAMEL_CASE_PATTERN = re.compile(r'([a-z0-9])([A-Z])')
+SEPARATOR_PATTERN = re.compile(r'[\W_]+')
+
+def normalize_text(text):
+    """Lowercase words separated by single spaces, with a space at both ends
+
+    "applicant.firstName" becomes " applicant first name ", so keywords can
+    be matched as whole words with a plain substring check.
+    """
+    words = SEPARATOR_PATTERN.sub(' ', CAMEL_CASE_PATTERN.sub(r'\1 \2', text or '')).lower().split()
+    return ' ' + ' '.join(words) + ' '
+
+def text_signals(control):
+    """Normalized text of each keyword-matched signal a control has"""
+    texts = {}
+    for signal in TEXT_SIGNALS:
+        if control.get(signal):
+            texts[signal] = normalize_text(control[signal])
+    return texts
+
+def _compile_rule(rule):
+    return {
+        'keywords': [normalize_text(keyword) for keyword in rule.get('keywords', [])],
+        'exclude': [normalize_text(word) for word in rule.get('exclude', [])],
+        'types': set(rule.get('types', [])),
+        'autocomplete': set(rule.get('autocomplete', [])),
+        'tags': set(rule.get('tags', ['input'])),
+        'allowed_types': set(rule.get('allowed_types', TEXT_TYPES + tuple(rule.get('types', []))))
+    }
+
+class FieldClassifier:
+    """Assigns autofill field types to scanned form controls"""
+
+    def __init__(self, rules=None, weights=None, min_score=MIN_SCORE):
+        self.weights = dict(weights or SIGNAL_WEIGHTS)
+        self.min_score = min_score
+        self.rules = {}
+        for field, rule in (rules or FIELD_RULES).items():
+            self.add_rule(field, rule)
+
+    def add_rule(self, field, rule):
+        """Add or replace the rule for a field type"""
+        self.rules[field] = _compile_rule(rule)
+
+    def score(self, control, rule, texts=None):
+        """How strongly a control's signals point at one rule"""
+        tag = control.get('tag', 'input')
+        input_type = control.get('type', '')
+        if tag not in rule['tags'] or (tag == 'input' and input_type not in rule['allowed_types']):
+            return 0
+        texts = texts if texts is not None else text_signals(control)
+        if any(word in text for text in texts.values() for word in rule['exclude']):
+            return 0
+
+        score = 0
+        if input_type and input_type in rule['types']:
+            score += self.weights['type']
+        autocomplete = (control.get('autocomplete') or '').lower().split()
+        if rule['autocomplete'].intersection(autocomplete):
+            score += self.weights['autocomplete']
+
+        for signal, text in texts.items():
+            if any(keyword in text for keyword in rule['keywords']):
+                score += self.weights[signal]
+        return score
+
+    def classify(self, controls):
+        """Best control per field type as {field: description}
+
+        Every (control, field) pair is scored; the highest scores are
+        assigned first, each control and each field at most once. Ties go to
+        visible controls, then to the first in document order.
+        """
+        candidates = []
+        for position, control in enumerate(controls):
+            texts = text_signals(control)
+            for field, rule in self.rules.items():
+                score = self.score(control, rule, texts)
+                if score >= self.min_score:
+                    candidates.append((-score, not control.get('visible', True), position, field))
+        candidates.sort()
+
+        detected = {}
+        used = set()
+        for negative_score, _, position, field in candidates:
+            if field in detected or position in used:
+                continue
+            control = controls[position]
+            used.add(position)
+            detected[field] = {
+                'selector': control.get('selector'),
+                'tag': control.get('tag'),
+                'type': control.get('type') or ('text' if control.get('tag') == 'input' else control.get('tag')),
+                'name': control.get('name'),
+                'id': control.get('id'),
+                'placeholder': control.get('placeholder'),
+                'label': control.get('label') or control.get('aria'),
+                'score': -negative_score
+            }
+        return detected
+
+def scan_form_fields(driver):
+    """Describe every form control on the current page in one round trip"""
+    return driver.execute_script(FIELD_SCAN_SCRIPT) or []
+
+CSS_IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_][\w-]*$')
+HIDDEN_STYLE_PATTERN = re.compile(r'display\s*:\s*none|visibility\s*:\s*hidden')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+def _clip(text):
+    return WHITESPACE_PATTERN.sub(' ', text or '').strip()[:TEXT_LIMIT]
+
+def _css_string(value):
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def _html_selector(soup, element):
+    """Unique CSS selector for an element, built like selectorFor() in the scan script"""
+    element_id = element.get('id')
+    if element_id:
+        selector = '#' + element_id if CSS_IDENTIFIER_PATTERN.match(element_id) else f'{element.name}[id={_css_string(element_id)}]'
+        if len(soup.select(selector, limit=2)) == 1:
+            return selector
+    name = element.get('name')
+    if name:
+        selector = f'{element.name}[name={_css_string(name)}]'
+        if len(soup.select(selector, limit=2)) == 1:
+            return selector
+    parts = []
+    for node in [element] + list(element.parents):
+        if node.parent is None or node.name == 'html':
+            break
+        index = 1 + len(node.find_previous_siblings(node.name))
+        parts.insert(0, f'{node.name}:nth-of-type({index})')
+    return ' > '.join(parts)
+
+def _html_visible(element):
+    for node in [element] + list(element.parents):
+        if node.name in (None, '[document]'):
+            break
+        if node.has_attr('hidden') or HIDDEN_STYLE_PATTERN.search(node.get('style', '')):
+            return False
+    return True
+
+def _html_nearby(element):
+    texts = []
+    previous = element.find_previous_sibling()
+    if previous is not None and previous.find(['input', 'textarea', 'select']) is None:
+        texts.append(previous.get_text(' '))
+    if element.parent is not None:
+        texts.extend(str(child) for child in element.parent.children if isinstance(child, NavigableString))
+    return _clip(' '.join(texts))
+
+def scan_html(html):
+    """Describe every form control in static HTML, in the format of scan_form_fields()"""
+    if BeautifulSoup is None:
+        raise RuntimeError('beautifulsoup4 is required for static form detection')
+    soup = html if isinstance(html, BeautifulSoup) else BeautifulSoup(html, 'html.parser')
+    labels_for = {}
+    for label in soup.find_all('label', attrs={'for': True}):
+        labels_for.setdefault(label['for'], []).append(label.get_text(' '))
+
+    controls = []
+    for index, element in enumerate(soup.find_all(['input', 'textarea', 'select'])):
+        input_type = (element.get('type') or '').lower()
+        if input_type in SKIPPED_INPUT_TYPES or element.has_attr('disabled'):
+            continue
+        label_texts = list(labels_for.get(element.get('id'), [])) if element.get('id') else []
+        wrapping_label = element.find_parent('label')
+        if wrapping_label is not None:
+            label_texts.append(wrapping_label.get_text(' '))
+        aria_texts = [element.get('aria-label') or '']
+        for labelled_by in (element.get('aria-labelledby') or '').split():
+            target = soup.find(id=labelled_by)
+            if target is not None:
+                aria_texts.append(target.get_text(' '))
+
+        control = {
+            'index': index,
+            'tag': element.name,
+            'type': input_type,
+            'name': element.get('name'),
+            'id': element.get('id'),
+            'placeholder': element.get('placeholder'),
+            'autocomplete': element.get('autocomplete'),
+            'title': element.get('title'),
+            'label': _clip(' '.join(label_texts)),
+            'aria': _clip(' '.join(aria_texts)),
+            'nearby': _html_nearby(element),
+            'visible': _html_visible(element),
+            'selector': _html_selector(soup, element)
+        }
+        controls.append({key: value for key, value in control.items() if value not in ('', None)})
+    return controls
+
+# Global field classifier instance
+field_classifier = FieldClassifier()
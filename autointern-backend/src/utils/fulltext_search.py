@@ -0,0 +1,263 @@
+"""
+Database-native full-text search for internships
+SQLite: FTS5 table internships_fts kept in sync by triggers.
+PostgreSQL: internships.search_vector tsvector column kept in sync by a
+trigger and indexed with GIN.
+Search is only used once scripts/setup_fulltext_search.py has recorded a
+finished setup in fulltext_search_status, never against a half-built index.
+"""
+
+import re
+import time
+from sqlalchemy import text
+
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_END = '</mark>'
+
+# Relative weights of title, description and requirements
+SQLITE_BM25_WEIGHTS = '10.0, 2.0, 1.0'
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS internships_fts USING fts5(
+        title, description, requirements, tokenize = 'porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS internships_fts_insert AFTER INSERT ON internships BEGIN
+        INSERT INTO internships_fts(rowid, title, description, requirements)
+        VALUES (new.id, new.title, new.description, new.requirements);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS internships_fts_update AFTER UPDATE OF title, description, requirements ON internships BEGIN
+        DELETE FROM internships_fts WHERE rowid = old.id;
+        INSERT INTO internships_fts(rowid, title, description, requirements)
+        VALUES (new.id, new.title, new.description, new.requirements);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS internships_fts_delete AFTER DELETE ON internships BEGIN
+        DELETE FROM internships_fts WHERE rowid = old.id;
+    END
+    """
+]
+
+POSTGRES_VECTOR_SQL = """
+    setweight(to_tsvector('english', coalesce({prefix}title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce({prefix}description, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce({prefix}requirements, '')), 'C')
+"""
+
+POSTGRES_DDL = [
+    "ALTER TABLE internships ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    """
+    CREATE OR REPLACE FUNCTION internships_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := """ + POSTGRES_VECTOR_SQL.format(prefix='NEW.') + """;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS internships_search_vector_trigger ON internships",
+    """
+    CREATE TRIGGER internships_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description, requirements ON internships
+    FOR EACH ROW EXECUTE FUNCTION internships_search_vector_update()
+    """
+]
+
+POSTGRES_INDEX_DDL = (
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_internships_search_vector "
+    "ON internships USING GIN (search_vector)"
+)
+
+# Written once the backfill (and on PostgreSQL the GIN index) is done
+STATUS_TABLE_DDL = """
+    CREATE TABLE IF NOT EXISTS fulltext_search_status (
+        id INTEGER PRIMARY KEY,
+        ready_at TIMESTAMP NOT NULL
+    )
+"""
+
+# The status is re-checked after this many seconds, so finishing or undoing
+# scripts/setup_fulltext_search.py takes effect without a restart
+INSTALLED_RECHECK_SECONDS = 60
+
+# engine.url -> (installed, checked_at)
+_installed_cache = {}
+
+def install_fulltext(engine):
+    """Create the FTS table / tsvector column and the sync triggers"""
+    statements = SQLITE_DDL if engine.dialect.name == 'sqlite' else POSTGRES_DDL
+    if engine.dialect.name not in ('sqlite', 'postgresql'):
+        raise ValueError(f'Full-text search is not supported on {engine.dialect.name}')
+
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+    _installed_cache.pop(engine.url, None)
+
+def create_search_index(engine):
+    """Build the GIN index without blocking writes (PostgreSQL only)"""
+    if engine.dialect.name != 'postgresql':
+        return
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        conn.execute(text(POSTGRES_INDEX_DDL))
+
+def mark_fulltext_ready(engine):
+    """Record that setup finished, so searches start using the index"""
+    with engine.begin() as conn:
+        conn.execute(text(STATUS_TABLE_DDL))
+        conn.execute(text("DELETE FROM fulltext_search_status"))
+        conn.execute(text("INSERT INTO fulltext_search_status (id, ready_at) VALUES (1, CURRENT_TIMESTAMP)"))
+    _installed_cache.pop(engine.url, None)
+
+def backfill_fulltext(engine, batch_size=1000, progress=None):
+    """Index existing internships in id-ordered batches, one short transaction each
+
+    Rows written while the backfill runs are indexed by the triggers; batches
+    skip rows that are already indexed, so the command is safe to re-run.
+    """
+    with engine.connect() as conn:
+        max_id = conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM internships")).scalar()
+
+    if engine.dialect.name == 'sqlite':
+        statement = text("""
+            INSERT INTO internships_fts(rowid, title, description, requirements)
+            SELECT id, title, description, requirements FROM internships
+            WHERE id > :low AND id <= :high
+              AND id NOT IN (SELECT rowid FROM internships_fts WHERE rowid > :low AND rowid <= :high)
+        """)
+    else:
+        statement = text(
+            "UPDATE internships SET search_vector = " + POSTGRES_VECTOR_SQL.format(prefix='') +
+            " WHERE id > :low AND id <= :high AND search_vector IS NULL"
+        )
+
+    indexed = 0
+    low = 0
+    while low < max_id:
+        high = low + batch_size
+        with engine.begin() as conn:
+            indexed += conn.execute(statement, {'low': low, 'high': high}).rowcount or 0
+        if progress:
+            progress(min(high, max_id), max_id, indexed)
+        low = high
+    return indexed
+
+def fulltext_installed(engine):
+    """Check whether full-text setup has finished (cached per database for a short while)"""
+    cached = _installed_cache.get(engine.url)
+    if cached is not None and time.monotonic() - cached[1] < INSTALLED_RECHECK_SECONDS:
+        return cached[0]
+
+    with engine.connect() as conn:
+        if engine.dialect.name == 'sqlite':
+            has_status = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'fulltext_search_status'"
+            )).first() is not None
+        elif engine.dialect.name == 'postgresql':
+            has_status = conn.execute(text(
+                "SELECT to_regclass('fulltext_search_status') IS NOT NULL"
+            )).scalar()
+        else:
+            has_status = False
+        installed = has_status and conn.execute(text(
+            "SELECT 1 FROM fulltext_search_status"
+        )).first() is not None
+    _installed_cache[engine.url] = (installed, time.monotonic())
+    return installed
+
+def build_match_query(query):
+    """Turn free text into a safe FTS5 query (all terms, last one as prefix)"""
+    tokens = re.findall(r'\w+', query or '')
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens[:-1]] + [f'"{tokens[-1]}"*']
+    return ' '.join(terms)
+
+def _filters(location, company, params):
+    clauses = []
+    if location:
+        clauses.append("i.location LIKE :location")
+        params['location'] = f'%{location}%'
+    if company:
+        clauses.append("i.company LIKE :company")
+        params['company'] = f'%{company}%'
+    return ''.join(f' AND {clause}' for clause in clauses)
+
+def search_fulltext(session, query, location='', company='', page=1, per_page=20):
+    """Ranked full-text search with highlighted fields
+
+    Returns (hits, total) where each hit is a dict with 'id', 'rank' (higher is
+    better) and 'highlights' for title, description and requirements.
+    Pass per_page=None to return every match.
+    """
+    engine = session.get_bind()
+    params = {}
+
+    if engine.dialect.name == 'sqlite':
+        match = build_match_query(query)
+        if not match:
+            return [], 0
+        params['match'] = match
+        where = "internships_fts MATCH :match" + _filters(location, company, params)
+        base = "FROM internships_fts JOIN internships i ON i.id = internships_fts.rowid WHERE " + where
+        select = f"""
+            SELECT i.id AS id, -bm25(internships_fts, {SQLITE_BM25_WEIGHTS}) AS rank,
+                   highlight(internships_fts, 0, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}') AS title_hl,
+                   snippet(internships_fts, 1, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', 32) AS description_hl,
+                   snippet(internships_fts, 2, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', 24) AS requirements_hl
+            {base}
+            ORDER BY bm25(internships_fts, {SQLITE_BM25_WEIGHTS})
+        """
+    else:
+        if not re.search(r'\w', query or ''):
+            return [], 0
+        params['query'] = query
+        params['options'] = f'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxFragments=2'
+        where = "i.search_vector @@ q" + _filters(location, company, params)
+        base = "FROM internships i, websearch_to_tsquery('english', :query) q WHERE " + where
+        # Rank and paginate first so ts_headline only runs on the returned page
+        select = f"""
+            SELECT ranked.id AS id, ranked.rank AS rank,
+                   ts_headline('english', coalesce(ranked.title, ''), q, :options) AS title_hl,
+                   ts_headline('english', coalesce(ranked.description, ''), q, :options) AS description_hl,
+                   ts_headline('english', coalesce(ranked.requirements, ''), q, :options) AS requirements_hl
+            FROM (
+                SELECT i.id, i.title, i.description, i.requirements, ts_rank_cd(i.search_vector, q) AS rank
+                {base}
+                ORDER BY rank DESC, i.id DESC
+                {{limit}}
+            ) ranked, websearch_to_tsquery('english', :query) q
+            ORDER BY ranked.rank DESC, ranked.id DESC
+        """
+
+    limit = ''
+    if per_page:
+        limit = 'LIMIT :limit OFFSET :offset'
+        params['limit'] = per_page
+        params['offset'] = (max(page, 1) - 1) * per_page
+
+    if engine.dialect.name == 'sqlite':
+        select = select + ' ' + limit
+    else:
+        select = select.replace('{limit}', limit)
+
+    rows = session.execute(text(select), params).mappings().all()
+    total = session.execute(text("SELECT COUNT(*) " + base), params).scalar() if per_page else len(rows)
+
+    hits = [
+        {
+            'id': row['id'],
+            'rank': float(row['rank'] or 0),
+            'highlights': {
+                'title': row['title_hl'],
+                'description': row['description_hl'],
+                'requirements': row['requirements_hl']
+            }
+        }
+        for row in rows
+    ]
+    return hits, total
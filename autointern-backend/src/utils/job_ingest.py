@@ -0,0 +1,140 @@
+"""
+Bulk ingestion of scraped jobs into the internships table
+Dedupes a whole batch with one set-based lookup and a native upsert
+"""
+
+import hashlib
+import json
+import re
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from sqlalchemy.dialects import postgresql, sqlite
+from src.models.user_enhanced import db, Internship
+
+# Keys per lookup and rows per upsert statement (PostgreSQL allows 65535 bound parameters)
+INGEST_CHUNK_SIZE = 500
+
+# SQLite builds before 3.32 allow at most 999 bound parameters per statement
+SQLITE_MAX_PARAMETERS = 999
+
+# Columns refreshed when a scraped job is seen again
+UPDATABLE_COLUMNS = ['location', 'description', 'url', 'requirements', 'keywords']
+
+def normalize_text(value):
+    """Lowercase, strip punctuation and collapse whitespace"""
+    if not value:
+        return ''
+    value = re.sub(r'[^\w\s]', ' ', value.lower())
+    return re.sub(r'\s+', ' ', value).strip()
+
+def normalize_url(url):
+    """Normalize a job URL so trivial variations map to the same posting"""
+    if not url:
+        return ''
+    parts = urlsplit(url.strip().lower())
+    host = parts.netloc[4:] if parts.netloc.startswith('www.') else parts.netloc
+    return f"{host}{parts.path.rstrip('/')}"
+
+def internship_dedupe_key(title, company, url):
+    """Stable key over normalized title/company/url"""
+    raw = '|'.join([normalize_text(title), normalize_text(company), normalize_url(url)])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def _job_to_row(job, source, now):
+    keywords = job.get('keywords', [])
+    return {
+        'title': job['title'],
+        'company': job['company'],
+        'location': job.get('location'),
+        'description': job.get('description'),
+        'url': job.get('url'),
+        'requirements': job.get('requirements', ''),
+        'source': source,
+        'keywords': keywords if isinstance(keywords, str) else json.dumps(keywords),
+        'dedupe_key': internship_dedupe_key(job['title'], job['company'], job.get('url')),
+        'created_at': now,
+        'updated_at': now
+    }
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def find_existing_keys(keys, session=None):
+    """Map dedupe_key -> internship id for the keys already stored"""
+    session = session or db.session
+    existing = {}
+    for chunk in _chunks(list(keys), INGEST_CHUNK_SIZE):
+        rows = session.query(Internship.dedupe_key, Internship.id).filter(
+            Internship.dedupe_key.in_(chunk)
+        ).all()
+        existing.update(dict(rows))
+    return existing
+
+def _native_upsert(session, dialect_name, rows):
+    insert = postgresql.insert if dialect_name == 'postgresql' else sqlite.insert
+    table = Internship.__table__
+    # Every row binds one parameter per column
+    chunk_size = INGEST_CHUNK_SIZE
+    if dialect_name == 'sqlite' and rows:
+        chunk_size = min(chunk_size, max(1, SQLITE_MAX_PARAMETERS // len(rows[0])))
+    for chunk in _chunks(rows, chunk_size):
+        stmt = insert(table).values(chunk)
+        update_columns = {column: stmt.excluded[column] for column in UPDATABLE_COLUMNS}
+        update_columns['updated_at'] = stmt.excluded.updated_at
+        stmt = stmt.on_conflict_do_update(index_elements=['dedupe_key'], set_=update_columns)
+        session.execute(stmt)
+
+def _generic_upsert(session, rows, existing):
+    new_rows = [row for row in rows if row['dedupe_key'] not in existing]
+    updated_rows = []
+    for row in rows:
+        if row['dedupe_key'] in existing:
+            update = {column: row[column] for column in UPDATABLE_COLUMNS}
+            update['id'] = existing[row['dedupe_key']]
+            update['updated_at'] = row['updated_at']
+            updated_rows.append(update)
+
+    if new_rows:
+        session.bulk_insert_mappings(Internship, new_rows)
+    if updated_rows:
+        session.bulk_update_mappings(Internship, updated_rows)
+
+def bulk_upsert_internships(jobs, source='scraped', session=None):
+    """Insert new jobs and refresh already-known ones in a few set-based statements
+
+    Uses INSERT ... ON CONFLICT (dedupe_key) on SQLite and PostgreSQL and falls
+    back to bulk insert/update mappings elsewhere. The caller owns the commit.
+    Returns {'inserted': n, 'updated': m, 'keys': [...]} where keys follow the
+    order of the (batch-deduplicated) input.
+    """
+    session = session or db.session
+    now = datetime.utcnow()
+
+    # Dedupe within the batch first; later occurrences win
+    rows_by_key = {}
+    for job in jobs:
+        if not job.get('title') or not job.get('company'):
+            continue
+        row = _job_to_row(job, source, now)
+        rows_by_key[row['dedupe_key']] = row
+    rows = list(rows_by_key.values())
+
+    if not rows:
+        return {'inserted': 0, 'updated': 0, 'keys': []}
+
+    existing = find_existing_keys(rows_by_key.keys(), session=session)
+
+    dialect_name = session.get_bind().dialect.name
+    if dialect_name in ('sqlite', 'postgresql'):
+        _native_upsert(session, dialect_name, rows)
+    else:
+        _generic_upsert(session, rows, existing)
+
+    updated = sum(1 for key in rows_by_key if key in existing)
+    return {
+        'inserted': len(rows) - updated,
+        'updated': updated,
+        'keys': list(rows_by_key.keys())
+    }
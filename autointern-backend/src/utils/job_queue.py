@@ -0,0 +1,498 @@
+"""
+Background job queue
+A batch job is a list of items processed independently by a pool of worker
+threads. Job and item state live in a pluggable broker: a local SQLite file
+by default, or Redis when JOB_QUEUE_URL points at one.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+DEFAULT_QUEUE_URL = 'sqlite:///' + os.path.join(tempfile.gettempdir(), 'autointern_jobs.db')
+DEFAULT_WORKERS = 4
+
+# Items claimed by a worker that died are retried after this many seconds
+DEFAULT_VISIBILITY_TIMEOUT = 300
+DEFAULT_MAX_ATTEMPTS = 3
+
+def _now():
+    return datetime.utcnow().isoformat()
+
+def _progress(job):
+    """Add progress fields to a job dict"""
+    processed = job['completed'] + job['failed']
+    job['progress'] = round(processed / job['total'] * 100, 2) if job['total'] else 100.0
+    return job
+
+class QueueBroker(ABC):
+    """Storage backend for the job queue"""
+
+    @abstractmethod
+    def enqueue(self, kind, items, meta=None):
+        """Store a new job and its items, return the job id"""
+
+    @abstractmethod
+    def claim(self, kinds):
+        """Take the next queued item of one of the given kinds, or return None"""
+
+    @abstractmethod
+    def complete(self, job_id, index, result):
+        """Mark an item done with its result"""
+
+    @abstractmethod
+    def fail(self, job_id, index, error):
+        """Mark an item failed with an error message"""
+
+    @abstractmethod
+    def get(self, job_id):
+        """Return a job with its items, or None"""
+
+class SQLiteBroker(QueueBroker):
+    """Job queue stored in a local SQLite file, safe across threads and processes"""
+
+    def __init__(self, path, visibility_timeout=DEFAULT_VISIBILITY_TIMEOUT, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self._init_schema()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS queue_jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    meta TEXT,
+                    status TEXT NOT NULL,
+                    total INTEGER NOT NULL,
+                    completed INTEGER NOT NULL DEFAULT 0,
+                    failed INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT,
+                    started_at TEXT,
+                    finished_at TEXT
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS queue_items (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    kind TEXT NOT NULL,
+                    payload TEXT,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    claimed_at REAL,
+                    result TEXT,
+                    error TEXT,
+                    UNIQUE (job_id, idx)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_queue_items_status_kind ON queue_items (status, kind, seq)")
+        finally:
+            conn.close()
+
+    def enqueue(self, kind, items, meta=None):
+        job_id = uuid.uuid4().hex
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO queue_jobs (id, kind, meta, status, total, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(meta or {}), 'queued' if items else 'completed', len(items), _now())
+            )
+            conn.executemany(
+                "INSERT INTO queue_items (job_id, idx, kind, payload, status) VALUES (?, ?, ?, ?, 'queued')",
+                [(job_id, index, kind, json.dumps(payload)) for index, payload in enumerate(items)]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return job_id
+
+    def _finish_item(self, conn, job_id, index, status, result=None, error=None):
+        updated = conn.execute(
+            "UPDATE queue_items SET status = ?, result = ?, error = ? WHERE job_id = ? AND idx = ? AND status = 'running'",
+            (status, json.dumps(result) if result is not None else None, error, job_id, index)
+        ).rowcount
+        if not updated:
+            return
+        counter = 'completed' if status == 'done' else 'failed'
+        conn.execute(f"UPDATE queue_jobs SET {counter} = {counter} + 1 WHERE id = ?", (job_id,))
+        conn.execute(
+            "UPDATE queue_jobs SET status = 'completed', finished_at = ? WHERE id = ? AND completed + failed >= total",
+            (_now(), job_id)
+        )
+
+    def claim(self, kinds):
+        if not kinds:
+            return None
+        placeholders = ', '.join('?' for _ in kinds)
+        stale_before = time.time() - self.visibility_timeout
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+
+            # Give up on items whose workers died too many times
+            for row in conn.execute(
+                f"SELECT job_id, idx FROM queue_items WHERE status = 'running' AND claimed_at < ? "
+                f"AND attempts >= ? AND kind IN ({placeholders})",
+                (stale_before, self.max_attempts, *kinds)
+            ).fetchall():
+                self._finish_item(conn, row['job_id'], row['idx'], 'failed', error='Worker timed out')
+
+            row = conn.execute(
+                f"SELECT seq, job_id, idx, kind, payload FROM queue_items "
+                f"WHERE kind IN ({placeholders}) AND (status = 'queued' OR (status = 'running' AND claimed_at < ?)) "
+                f"ORDER BY seq LIMIT 1",
+                (*kinds, stale_before)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute(
+                "UPDATE queue_items SET status = 'running', claimed_at = ?, attempts = attempts + 1 WHERE seq = ?",
+                (time.time(), row['seq'])
+            )
+            conn.execute(
+                "UPDATE queue_jobs SET status = 'running', started_at = ? WHERE id = ? AND status = 'queued'",
+                (_now(), row['job_id'])
+            )
+            meta = conn.execute("SELECT meta FROM queue_jobs WHERE id = ?", (row['job_id'],)).fetchone()['meta']
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        return {
+            'job_id': row['job_id'],
+            'index': row['idx'],
+            'kind': row['kind'],
+            'payload': json.loads(row['payload']),
+            'meta': json.loads(meta or '{}')
+        }
+
+    def _finish(self, job_id, index, status, result=None, error=None):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            self._finish_item(conn, job_id, index, status, result, error)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def complete(self, job_id, index, result):
+        self._finish(job_id, index, 'done', result=result)
+
+    def fail(self, job_id, index, error):
+        self._finish(job_id, index, 'failed', error=error)
+
+    def get(self, job_id):
+        conn = self._connect()
+        try:
+            job = conn.execute("SELECT * FROM queue_jobs WHERE id = ?", (job_id,)).fetchone()
+            if job is None:
+                return None
+            items = conn.execute(
+                "SELECT idx, payload, status, attempts, result, error FROM queue_items WHERE job_id = ? ORDER BY idx",
+                (job_id,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        job = dict(job)
+        job['meta'] = json.loads(job['meta'] or '{}')
+        job['items'] = [
+            {
+                'index': item['idx'],
+                'payload': json.loads(item['payload']),
+                'status': item['status'],
+                'attempts': item['attempts'],
+                'result': json.loads(item['result']) if item['result'] else None,
+                'error': item['error']
+            }
+            for item in items
+        ]
+        return _progress(job)
+
+class RedisBroker(QueueBroker):
+    """Job queue stored in Redis
+
+    Claimed entries move atomically from the kind's queue list to its
+    processing list (RPOPLPUSH) and stay there until finished, so items whose
+    worker died are re-queued after visibility_timeout, like the SQLite broker.
+    """
+
+    def __init__(self, url, prefix='autointern:jobs', visibility_timeout=DEFAULT_VISIBILITY_TIMEOUT,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS):
+        if redis is None:
+            raise RuntimeError('The redis package is required for a redis:// JOB_QUEUE_URL')
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+
+    def _job_key(self, job_id):
+        return f'{self.prefix}:job:{job_id}'
+
+    def _items_key(self, job_id):
+        return f'{self.prefix}:job:{job_id}:items'
+
+    def _queue_key(self, kind):
+        return f'{self.prefix}:queue:{kind}'
+
+    def _processing_key(self, kind):
+        return f'{self.prefix}:processing:{kind}'
+
+    def enqueue(self, kind, items, meta=None):
+        job_id = uuid.uuid4().hex
+        pipe = self.client.pipeline()
+        pipe.hset(self._job_key(job_id), mapping={
+            'id': job_id, 'kind': kind, 'meta': json.dumps(meta or {}),
+            'status': 'queued' if items else 'completed', 'total': len(items),
+            'completed': 0, 'failed': 0, 'created_at': _now()
+        })
+        if items:
+            pipe.hset(self._items_key(job_id), mapping={
+                index: json.dumps({'payload': payload, 'status': 'queued', 'attempts': 0})
+                for index, payload in enumerate(items)
+            })
+            # Consumed from the right by RPOPLPUSH, so the first item goes in last
+            pipe.lpush(self._queue_key(kind), *[f'{job_id}:{index}' for index in range(len(items))])
+        pipe.execute()
+        return job_id
+
+    def _requeue_stale(self, kind):
+        """Re-queue entries whose worker died, or fail them after max_attempts"""
+        stale_before = time.time() - self.visibility_timeout
+        processing_key = self._processing_key(kind)
+        for entry in self.client.lrange(processing_key, 0, -1):
+            job_id, index = entry.rsplit(':', 1)
+            raw = self.client.hget(self._items_key(job_id), index)
+            item = json.loads(raw) if raw else None
+            if item is not None and item.get('claimed_at') is None:
+                # Moved by a worker that died before recording the claim: start the clock now
+                item['claimed_at'] = time.time()
+                self.client.hset(self._items_key(job_id), index, json.dumps(item))
+                continue
+            if item is not None and item['status'] == 'running' and item['claimed_at'] >= stale_before:
+                continue
+            # Only the worker whose LREM removed the entry handles it
+            if not self.client.lrem(processing_key, 1, entry):
+                continue
+            if item is None or item['status'] in ('done', 'failed'):
+                continue
+            if item['status'] == 'running' and item['attempts'] >= self.max_attempts:
+                self._finish(job_id, index, 'failed', error='Worker timed out')
+            else:
+                # Next in line for RPOPLPUSH
+                self.client.rpush(self._queue_key(kind), entry)
+
+    def claim(self, kinds):
+        for kind in kinds:
+            self._requeue_stale(kind)
+            while True:
+                entry = self.client.rpoplpush(self._queue_key(kind), self._processing_key(kind))
+                if entry is None:
+                    break
+                job_id, index = entry.rsplit(':', 1)
+                raw = self.client.hget(self._items_key(job_id), index)
+                item = json.loads(raw) if raw else None
+                if item is None or item['status'] in ('done', 'failed'):
+                    # Finished by a slow worker after it was re-queued
+                    self.client.lrem(self._processing_key(kind), 1, entry)
+                    continue
+                item['status'] = 'running'
+                item['attempts'] += 1
+                item['claimed_at'] = time.time()
+                self.client.hset(self._items_key(job_id), index, json.dumps(item))
+                if self.client.hget(self._job_key(job_id), 'status') == 'queued':
+                    self.client.hset(self._job_key(job_id), mapping={'status': 'running', 'started_at': _now()})
+                return {
+                    'job_id': job_id,
+                    'index': int(index),
+                    'kind': kind,
+                    'payload': item['payload'],
+                    'meta': json.loads(self.client.hget(self._job_key(job_id), 'meta') or '{}')
+                }
+        return None
+
+    def _finish(self, job_id, index, status, result=None, error=None):
+        item = json.loads(self.client.hget(self._items_key(job_id), index))
+        if item['status'] != 'running':
+            return
+        item.update({'status': status, 'result': result, 'error': error})
+        self.client.hset(self._items_key(job_id), index, json.dumps(item))
+
+        job_key = self._job_key(job_id)
+        self.client.lrem(self._processing_key(self.client.hget(job_key, 'kind')), 1, f'{job_id}:{index}')
+        self.client.hincrby(job_key, 'completed' if status == 'done' else 'failed', 1)
+        completed, failed, total = self.client.hmget(job_key, 'completed', 'failed', 'total')
+        if int(completed) + int(failed) >= int(total):
+            self.client.hset(job_key, 'status', 'completed')
+            self.client.hsetnx(job_key, 'finished_at', _now())
+
+    def complete(self, job_id, index, result):
+        self._finish(job_id, index, 'done', result=result)
+
+    def fail(self, job_id, index, error):
+        self._finish(job_id, index, 'failed', error=error)
+
+    def get(self, job_id):
+        job = self.client.hgetall(self._job_key(job_id))
+        if not job:
+            return None
+        items = self.client.hgetall(self._items_key(job_id))
+
+        for field in ('total', 'completed', 'failed'):
+            job[field] = int(job.get(field, 0))
+        for field in ('started_at', 'finished_at'):
+            job.setdefault(field, None)
+        job['meta'] = json.loads(job.get('meta') or '{}')
+        job['items'] = []
+        for index in sorted(items, key=int):
+            item = json.loads(items[index])
+            job['items'].append({
+                'index': int(index),
+                'payload': item['payload'],
+                'status': item['status'],
+                'attempts': item['attempts'],
+                'result': item.get('result'),
+                'error': item.get('error')
+            })
+        return _progress(job)
+
+def create_broker(url):
+    """Create a broker from a sqlite:///path or redis:// URL"""
+    if url.startswith('sqlite:///'):
+        return SQLiteBroker(url[len('sqlite:///'):])
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisBroker(url)
+    raise ValueError(f'Unsupported job queue URL: {url}')
+
+class JobQueue:
+    """Runs registered handlers over job items on a pool of worker threads"""
+
+    def __init__(self, broker=None, workers=DEFAULT_WORKERS, poll_interval=0.5):
+        self.broker = broker
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.handlers = {}
+        self.app = None
+        self._threads = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Configure the broker and worker count from the Flask app"""
+        self.app = app
+        if self.broker is None:
+            self.broker = create_broker(app.config.get('JOB_QUEUE_URL') or DEFAULT_QUEUE_URL)
+        self.workers = int(app.config.get('JOB_QUEUE_WORKERS', self.workers))
+
+    def register(self, kind, handler):
+        """Register handler(payload, meta) -> result for a job kind"""
+        self.handlers[kind] = handler
+
+    def submit(self, kind, items, meta=None):
+        """Enqueue a batch job and make sure workers are running"""
+        if kind not in self.handlers:
+            raise ValueError(f'No handler registered for {kind} jobs')
+        if self.broker is None:
+            self.broker = create_broker(DEFAULT_QUEUE_URL)
+        job_id = self.broker.enqueue(kind, list(items), meta)
+        self.start()
+        return job_id
+
+    def status(self, job_id):
+        """Get a job's status, progress and item results"""
+        if self.broker is None:
+            return None
+        return self.broker.get(job_id)
+
+    def start(self):
+        """Start the worker threads (no-op if running or workers is 0)"""
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            if self._threads or self.workers <= 0:
+                return
+            self._stop.clear()
+            for number in range(self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f'job-worker-{number}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        """Ask the workers to exit after their current item"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_pending(self, max_items=None):
+        """Process queued items on the calling thread until none are left"""
+        processed = 0
+        while max_items is None or processed < max_items:
+            if not self.work_one():
+                break
+            processed += 1
+        return processed
+
+    def work_one(self):
+        """Claim and process a single item; return False if the queue is empty"""
+        claimed = self.broker.claim(list(self.handlers))
+        if claimed is None:
+            return False
+
+        handler = self.handlers[claimed['kind']]
+        try:
+            if self.app is not None:
+                with self.app.app_context():
+                    result = handler(claimed['payload'], claimed['meta'])
+            else:
+                result = handler(claimed['payload'], claimed['meta'])
+        except Exception as e:
+            self.broker.fail(claimed['job_id'], claimed['index'], str(e))
+        else:
+            self.broker.complete(claimed['job_id'], claimed['index'], result)
+        return True
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            try:
+                if self.work_one():
+                    continue
+            except Exception as e:
+                print(f"Job worker error: {e}")
+            self._stop.wait(self.poll_interval)
+
+# Global job queue instance
+job_queue = JobQueue()
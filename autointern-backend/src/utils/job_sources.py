@@ -0,0 +1,148 @@
+"""
+Job source engine for Auto Intern project
+Queries every registered job source concurrently with a per-source deadline
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+DEFAULT_SOURCE_TIMEOUT = 5.0  # seconds
+
+
+class JobSource:
+    """A named job source wrapping a fetch(keywords, location, job_type) callable"""
+
+    def __init__(self, name, fetch, timeout=DEFAULT_SOURCE_TIMEOUT):
+        self.name = name
+        self.fetch = fetch
+        self.timeout = timeout
+
+    def search(self, keywords, location, job_type):
+        """Run the underlying fetch and return a list of job dicts"""
+        return self.fetch(keywords, location, job_type) or []
+
+
+class FakeJobSource(JobSource):
+    """Local job source with configurable latency, used for offline benchmarks"""
+
+    def __init__(self, name, latency=0.0, jobs=None, fail=False, timeout=DEFAULT_SOURCE_TIMEOUT):
+        super().__init__(name, self._fetch, timeout=timeout)
+        self.latency = latency
+        self.jobs = jobs
+        self.fail = fail
+
+    def _fetch(self, keywords, location, job_type):
+        time.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError(f'{self.name} source failed')
+
+        if self.jobs is not None:
+            return [dict(job) for job in self.jobs]
+
+        return [{
+            'title': f'{job_type.title()} {i + 1} at {self.name}',
+            'company': self.name,
+            'location': location or 'Remote',
+            'description': f'{job_type} working with {", ".join(keywords[:3])}.',
+            'url': f'https://{self.name}.example.com/jobs/{i + 1}',
+            'requirements': '',
+            'keywords': keywords[:3],
+            'source': self.name
+        } for i in range(3)]
+
+
+class JobSourceEngine:
+    """Fan out a job search over all registered sources in a shared thread pool"""
+
+    def __init__(self, max_workers=8):
+        self.sources = {}
+        self.max_workers = max_workers
+        self._executor = None
+
+    def register(self, source):
+        """Register (or replace) a job source by name"""
+        self.sources[source.name] = source
+        return source
+
+    def unregister(self, name):
+        """Remove a job source by name"""
+        self.sources.pop(name, None)
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='job-source'
+            )
+        return self._executor
+
+    def search(self, keywords, location, job_type, sources=None):
+        """Query sources concurrently and collect whatever finishes within each deadline
+
+        Returns a dict with the merged 'jobs' list and per-source 'sources' info
+        (status, elapsed_ms, count, error). A source that misses its deadline is
+        reported as 'timeout' and its results are dropped; it keeps running in the
+        background and its worker is freed once it returns.
+        """
+        selected = [self.sources[name] for name in (sources or self.sources) if name in self.sources]
+        executor = self._get_executor()
+
+        started = time.monotonic()
+        futures = []
+        for source in selected:
+            futures.append((source, executor.submit(self._run_source, source, keywords, location, job_type)))
+
+        jobs = []
+        source_info = {}
+
+        for source, future in futures:
+            remaining = max(0.0, started + source.timeout - time.monotonic())
+            try:
+                source_jobs, elapsed = future.result(timeout=remaining)
+                for job in source_jobs:
+                    job.setdefault('source', source.name)
+                jobs.extend(source_jobs)
+                source_info[source.name] = {
+                    'status': 'ok',
+                    'elapsed_ms': round(elapsed * 1000, 2),
+                    'count': len(source_jobs),
+                    'error': None
+                }
+            except FutureTimeoutError:
+                future.cancel()
+                source_info[source.name] = {
+                    'status': 'timeout',
+                    'elapsed_ms': round((time.monotonic() - started) * 1000, 2),
+                    'count': 0,
+                    'error': f'Exceeded {source.timeout}s deadline'
+                }
+            except Exception as e:
+                source_info[source.name] = {
+                    'status': 'error',
+                    'elapsed_ms': round((time.monotonic() - started) * 1000, 2),
+                    'count': 0,
+                    'error': str(e)
+                }
+
+        return {
+            'jobs': jobs,
+            'sources': source_info,
+            'partial': any(info['status'] != 'ok' for info in source_info.values()),
+            'elapsed_ms': round((time.monotonic() - started) * 1000, 2)
+        }
+
+    @staticmethod
+    def _run_source(source, keywords, location, job_type):
+        start = time.monotonic()
+        source_jobs = source.search(keywords, location, job_type)
+        return list(source_jobs), time.monotonic() - start
+
+    def shutdown(self, wait=False):
+        """Shut down the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+# Global instance
+job_source_engine = JobSourceEngine()
@@ -0,0 +1,240 @@
+"""
+Content-addressed cache for LLM responses
+Replies are keyed by a SHA-256 of (model, messages, temperature, max_tokens)
+and stored in a pluggable backend: in-process LRU (memory://), a SQLite file
+(sqlite:///path) or Redis (redis://). TTLs are set per endpoint and hit/miss
+counters are kept for monitoring.
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_TTL = 24 * 3600
+
+# Seconds a cached reply stays valid, per endpoint
+ENDPOINT_TTLS = {
+    'cover_letter': 7 * 24 * 3600,
+    'cv_analysis': 24 * 3600,
+    'keyword_suggestions': 24 * 3600,
+    'cv_keywords': 7 * 24 * 3600
+}
+
+def cache_key(model, messages, temperature, max_tokens):
+    """Stable hash of everything that determines a completion"""
+    payload = json.dumps(
+        {'model': model, 'messages': messages, 'temperature': temperature, 'max_tokens': max_tokens},
+        sort_keys=True, ensure_ascii=False, separators=(',', ':')
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class MemoryCacheBackend:
+    """In-process LRU cache"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class SQLiteCacheBackend:
+    """Cache stored in a SQLite file, shared between processes"""
+
+    # Trim to max_entries once every this many writes
+    PRUNE_EVERY = 64
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._writes = 0
+        self._lock = threading.Lock()
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed_at ON llm_cache (accessed_at)")
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def get(self, key):
+        now = time.time()
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            return json.loads(row[0])
+        finally:
+            conn.close()
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + ttl, now)
+            )
+            with self._lock:
+                self._writes += 1
+                prune = self._writes % self.PRUNE_EVERY == 0
+            if prune:
+                self._prune(conn, now)
+        finally:
+            conn.close()
+
+    def _prune(self, conn, now):
+        conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (now,))
+        excess = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY accessed_at LIMIT ?)",
+                (excess,)
+            )
+
+    def delete(self, key):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+        finally:
+            conn.close()
+
+    def clear(self):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM llm_cache")
+        finally:
+            conn.close()
+
+class RedisCacheBackend:
+    """Cache stored in Redis; expiry via SETEX, size bounded by the server's maxmemory policy"""
+
+    def __init__(self, url, prefix='autointern:llm:'):
+        if redis is None:
+            raise RuntimeError('The redis package is required for a redis:// LLM_CACHE_URL')
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl):
+        self.client.setex(self.prefix + key, int(ttl), json.dumps(value))
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + '*'):
+            self.client.delete(key)
+
+def create_cache_backend(url, max_entries=DEFAULT_MAX_ENTRIES):
+    """Create a backend from memory://, sqlite:///path or redis:// URL"""
+    if not url or url.startswith('memory://'):
+        return MemoryCacheBackend(max_entries)
+    if url.startswith('sqlite:///'):
+        return SQLiteCacheBackend(url[len('sqlite:///'):], max_entries)
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisCacheBackend(url)
+    raise ValueError(f'Unsupported LLM cache URL: {url}')
+
+class LLMCache:
+    """Endpoint-aware response cache with hit/miss counters"""
+
+    def __init__(self, backend=None, ttls=None, default_ttl=DEFAULT_TTL):
+        self.backend = backend or MemoryCacheBackend()
+        self.ttls = dict(ENDPOINT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def _count(self, endpoint, field):
+        with self._lock:
+            counters = self._counters.setdefault(endpoint, {'hits': 0, 'misses': 0, 'errors': 0})
+            counters[field] += 1
+
+    def get(self, key, endpoint):
+        """Return the cached reply or None, counting the hit or miss"""
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            print(f"LLM cache read error: {e}")
+            self._count(endpoint, 'errors')
+            return None
+        self._count(endpoint, 'hits' if value is not None else 'misses')
+        return value
+
+    def set(self, key, value, endpoint):
+        """Store a reply with the endpoint's TTL"""
+        try:
+            self.backend.set(key, value, self.ttls.get(endpoint, self.default_ttl))
+        except Exception as e:
+            print(f"LLM cache write error: {e}")
+            self._count(endpoint, 'errors')
+
+    def stats(self):
+        """Hit/miss counters per endpoint and in total"""
+        with self._lock:
+            endpoints = {endpoint: dict(counters) for endpoint, counters in self._counters.items()}
+        hits = sum(counters['hits'] for counters in endpoints.values())
+        misses = sum(counters['misses'] for counters in endpoints.values())
+        return {
+            'backend': type(self.backend).__name__,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses) * 100, 2) if hits + misses else 0.0,
+            'endpoints': endpoints
+        }
@@ -0,0 +1,284 @@
+"""
+Central client for OpenAI chat completions
+Every AI feature goes through one shared client so the whole process stays
+within the account's rate limits: calls share a bounded concurrency pool and
+request/token buckets, and transient failures are retried with jittered
+exponential backoff. Deterministic prompts can opt into the response cache
+by passing cache_endpoint.
+"""
+
+import os
+import time
+import random
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import openai
+from src.utils.llm_cache import LLMCache, cache_key, create_cache_backend
+
+DEFAULT_MODEL = 'gpt-3.5-turbo'
+
+# Errors worth retrying: rate limits, timeouts, connection problems and 5xx
+RETRYABLE_ERRORS = (
+    openai.error.RateLimitError,
+    openai.error.Timeout,
+    openai.error.APIConnectionError,
+    openai.error.ServiceUnavailableError,
+    openai.error.TryAgain,
+    openai.error.APIError
+)
+
+def estimate_tokens(messages, max_tokens=0):
+    """Rough token count of a request (about 4 characters per token)"""
+    characters = sum(len(message.get('content') or '') for message in messages)
+    return characters // 4 + 4 * len(messages) + (max_tokens or 0)
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at rate_per_minute"""
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount=1):
+        """Block until amount tokens are available and take them"""
+        amount = min(amount, self.capacity)
+        with self._cond:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                self._cond.wait((amount - self.tokens) / self.rate)
+
+    def adjust(self, amount):
+        """Give back (positive) or take extra (negative) tokens after the fact"""
+        with self._cond:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + amount)
+            self._cond.notify_all()
+
+class LLMClient:
+    """Rate-limited, retrying chat completion client"""
+
+    def __init__(self, api_key=None, api_base=None, model=DEFAULT_MODEL, max_concurrency=8,
+                 requests_per_minute=3500, tokens_per_minute=90000, max_retries=4,
+                 backoff_base=0.5, backoff_max=20.0, timeout=60, cache=None):
+        self.api_key = api_key
+        self.api_base = api_base
+        self.model = model
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.cache = cache
+        self.configure_limits(max_concurrency, requests_per_minute, tokens_per_minute)
+        self._stats_lock = threading.Lock()
+        self._stats = {'requests': 0, 'retries': 0, 'failures': 0, 'tokens': 0}
+
+    def configure_limits(self, max_concurrency, requests_per_minute, tokens_per_minute):
+        """(Re)create the concurrency pool and rate limiters"""
+        if getattr(self, '_executor', None) is not None:
+            self._executor.shutdown(wait=False)
+        self.max_concurrency = max_concurrency
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='llm')
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def init_app(self, app):
+        """Configure the client from the Flask app config"""
+        config = app.config
+        self.api_key = config.get('OPENAI_API_KEY') or self.api_key
+        self.api_base = config.get('OPENAI_API_BASE') or self.api_base
+        self.model = config.get('LLM_MODEL') or self.model
+        self.max_retries = int(config.get('LLM_MAX_RETRIES', self.max_retries))
+        self.timeout = float(config.get('LLM_TIMEOUT', self.timeout))
+        self.configure_limits(
+            int(config.get('LLM_MAX_CONCURRENCY', self.max_concurrency)),
+            int(config.get('LLM_REQUESTS_PER_MINUTE', self.request_bucket.capacity if self.request_bucket else 0)),
+            int(config.get('LLM_TOKENS_PER_MINUTE', self.token_bucket.capacity if self.token_bucket else 0))
+        )
+        if config.get('LLM_CACHE_ENABLED', True):
+            backend = create_cache_backend(
+                config.get('LLM_CACHE_URL'),
+                int(config.get('LLM_CACHE_MAX_ENTRIES', 10000))
+            )
+            self.cache = LLMCache(backend, ttls=config.get('LLM_CACHE_TTLS'))
+        else:
+            self.cache = None
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def stats(self):
+        """Request, retry, failure and token counters, plus cache counters"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        if self.cache is not None:
+            stats['cache'] = self.cache.stats()
+        return stats
+
+    def _is_retryable(self, error):
+        if not isinstance(error, RETRYABLE_ERRORS):
+            return False
+        status = getattr(error, 'http_status', None)
+        # APIError also covers 4xx responses that will fail the same way again
+        return status is None or status == 429 or status >= 500
+
+    def _backoff(self, attempt):
+        """Full-jitter exponential backoff"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _create(self, **params):
+        return openai.ChatCompletion.create(
+            api_key=self.api_key or os.environ.get('OPENAI_API_KEY'),
+            api_base=self.api_base or os.environ.get('OPENAI_API_BASE') or openai.api_base,
+            request_timeout=self.timeout,
+            **params
+        )
+
+    def create(self, messages, model=None, max_tokens=1000, temperature=0.7, **kwargs):
+        """Run a chat completion and return the raw response"""
+        estimated = estimate_tokens(messages, max_tokens)
+        attempt = 0
+
+        while True:
+            if self.request_bucket:
+                self.request_bucket.acquire(1)
+            if self.token_bucket:
+                self.token_bucket.acquire(estimated)
+
+            try:
+                with self._semaphore:
+                    self._count('requests')
+                    response = self._create(
+                        model=model or self.model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        **kwargs
+                    )
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    self._count('failures')
+                    raise
+                attempt += 1
+                self._count('retries')
+                time.sleep(self._backoff(attempt))
+                continue
+
+            used = (response.get('usage') or {}).get('total_tokens')
+            if used:
+                self._count('tokens', used)
+                if self.token_bucket:
+                    self.token_bucket.adjust(estimated - used)
+            return response
+
+    def chat(self, messages, model=None, max_tokens=1000, temperature=0.7, cache_endpoint=None, **kwargs):
+        """Run a chat completion and return the reply text
+
+        With cache_endpoint set, identical requests are answered from the
+        response cache using that endpoint's TTL.
+        """
+        key = None
+        if self.cache is not None and cache_endpoint and not kwargs:
+            key = cache_key(model or self.model, messages, temperature, max_tokens)
+            cached = self.cache.get(key, cache_endpoint)
+            if cached is not None:
+                return cached
+
+        response = self.create(messages, model=model, max_tokens=max_tokens, temperature=temperature, **kwargs)
+        content = response.choices[0].message.content
+
+        if key is not None and content:
+            self.cache.set(key, content, cache_endpoint)
+        return content
+
+    def stream(self, messages, model=None, max_tokens=1000, temperature=0.7, **kwargs):
+        """Yield the reply text in pieces as the API produces them
+
+        Failures before the first chunk are retried like create(); once
+        text has been yielded, errors propagate to the caller.
+        """
+        estimated = estimate_tokens(messages, max_tokens)
+        attempt = 0
+
+        while True:
+            if self.request_bucket:
+                self.request_bucket.acquire(1)
+            if self.token_bucket:
+                self.token_bucket.acquire(estimated)
+
+            # The concurrency slot is held until the stream is consumed or closed
+            self._semaphore.acquire()
+            try:
+                self._count('requests')
+                try:
+                    chunks = iter(self._create(
+                        model=model or self.model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        stream=True,
+                        **kwargs
+                    ))
+                    first = next(chunks, None)
+                except Exception as e:
+                    if attempt >= self.max_retries or not self._is_retryable(e):
+                        self._count('failures')
+                        raise
+                    attempt += 1
+                    self._count('retries')
+                else:
+                    pending = [first] if first is not None else []
+                    for chunk in itertools.chain(pending, chunks):
+                        content = chunk['choices'][0].get('delta', {}).get('content')
+                        if content:
+                            yield content
+                    return
+            finally:
+                self._semaphore.release()
+
+            time.sleep(self._backoff(attempt))
+
+    def generate(self, prompt, system=None, **kwargs):
+        """Complete a single user prompt, optionally with a system prompt"""
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": prompt})
+        return self.chat(messages, **kwargs)
+
+    def generate_many(self, prompts, system=None, return_exceptions=True, **kwargs):
+        """Complete many prompts concurrently, results in input order
+
+        Each prompt is a string or a full messages list. Failed prompts yield
+        their exception when return_exceptions is True, otherwise the first
+        failure is raised.
+        """
+        def run(prompt):
+            if isinstance(prompt, str):
+                return self.generate(prompt, system=system, **kwargs)
+            return self.chat(prompt, **kwargs)
+
+        futures = [self._executor.submit(run, prompt) for prompt in prompts]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+# Global LLM client instance
+llm_client = LLMClient()
@@ -0,0 +1,83 @@
+"""
+Lazily loaded spaCy pipeline
+The model is loaded on first use rather than at import time, so processes
+that never parse a CV don't pay for it, and without the components CV
+parsing doesn't read (NER, lemmatizer). Noun chunks only need the tagger and
+the dependency parser. pipe() streams many documents through one pipeline
+for bulk reprocessing.
+"""
+
+import threading
+
+DEFAULT_MODEL = 'en_core_web_sm'
+
+# Components the CV parser never reads; excluded so they are not even loaded
+EXCLUDED_PIPES = ('ner', 'lemmatizer')
+
+DEFAULT_BATCH_SIZE = 32
+
+class NLPPipeline:
+    """spaCy model loaded on first use, shared by the whole process"""
+
+    def __init__(self, model_name=DEFAULT_MODEL, exclude=EXCLUDED_PIPES, batch_size=DEFAULT_BATCH_SIZE, n_process=1):
+        self.model_name = model_name
+        self.exclude = list(exclude)
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self._nlp = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Read the model name and batching defaults from the Flask app config"""
+        self.model_name = app.config.get('SPACY_MODEL') or self.model_name
+        self.batch_size = int(app.config.get('SPACY_BATCH_SIZE', self.batch_size))
+        self.n_process = int(app.config.get('SPACY_N_PROCESS', self.n_process))
+
+    @property
+    def nlp(self):
+        """The loaded model, or None when spaCy or the model is not installed"""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._nlp = self._load()
+                    self._loaded = True
+        return self._nlp
+
+    def _load(self):
+        try:
+            # Imported lazily as well: importing spaCy alone takes about a second
+            import spacy
+            # Install with: python -m spacy download en_core_web_sm
+            return spacy.load(self.model_name, exclude=self.exclude)
+        except (ImportError, OSError) as e:
+            print(f"spaCy model {self.model_name} not available: {e}")
+            return None
+
+    def _clip(self, text):
+        return text[:self.nlp.max_length]
+
+    def process(self, text):
+        """Run the pipeline over one text, or return None without a model"""
+        if self.nlp is None or not text:
+            return None
+        return self.nlp(self._clip(text))
+
+    def pipe(self, texts, batch_size=None, n_process=None):
+        """Yield one Doc per text (None without a model), in input order
+
+        Texts are streamed through nlp.pipe in batches of batch_size; with
+        n_process > 1 spaCy spreads the batches over worker processes.
+        """
+        if self.nlp is None:
+            for _ in texts:
+                yield None
+            return
+        yield from self.nlp.pipe(
+            (self._clip(text or '') for text in texts),
+            batch_size=batch_size or self.batch_size,
+            n_process=n_process or self.n_process
+        )
+
+# Global NLP pipeline instance
+nlp_pipeline = NLPPipeline()
@@ -0,0 +1,196 @@
+"""
+Readiness-based waiting for browser automation
+Instead of sleeping a fixed number of seconds after every navigation or
+click, autofill waits only as long as the page actually needs: until the
+document has been parsed, the network has gone quiet and the elements it
+needs are present, each with an upper bound. The time spent in every phase
+is recorded so slow pages show where the time goes.
+"""
+
+import time
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    TimeoutException, NoSuchElementException, StaleElementReferenceException,
+    JavascriptException, InvalidSelectorException
+)
+
+DEFAULT_READY_TIMEOUT = 10
+DEFAULT_NETWORK_IDLE_TIMEOUT = 5
+DEFAULT_NETWORK_IDLE_TIME = 0.5
+DEFAULT_ELEMENT_TIMEOUT = 5
+DEFAULT_SUBMIT_TIMEOUT = 10
+DEFAULT_POLL_INTERVAL = 0.1
+
+# Form controls; any of them means a form has rendered
+FORM_CONTROL_SELECTOR = 'input, textarea, select'
+
+# Counts fetch/XHR requests in flight (instrumented on first call) and
+# completed resource loads; the network is idle when nothing is in flight
+# and no resource has finished for a while
+NETWORK_STATE_SCRIPT = """
+var w = window;
+if (!w.__autointernNetwork) {
+    var network = w.__autointernNetwork = {pending: 0};
+    var done = function() { network.pending = Math.max(0, network.pending - 1); };
+    if (w.fetch) {
+        var originalFetch = w.fetch;
+        w.fetch = function() {
+            network.pending++;
+            var request = originalFetch.apply(this, arguments);
+            request.then(done, done);
+            return request;
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        network.pending++;
+        this.addEventListener('loadend', done);
+        return originalSend.apply(this, arguments);
+    };
+}
+return [w.__autointernNetwork.pending, performance.getEntriesByType('resource').length];
+"""
+
+def document_ready(driver):
+    """Condition: the document has been parsed (readyState interactive or complete)"""
+    return driver.execute_script('return document.readyState') in ('interactive', 'complete')
+
+def phrases_in_text(driver, phrases):
+    """The (lowercase) phrases found in the visible page text"""
+    text = driver.execute_script('return document.body ? document.body.innerText.toLowerCase() : ""') or ''
+    return [phrase for phrase in phrases if phrase in text]
+
+def text_contains_any(phrases, already_present=()):
+    """Condition: the visible page text contains one of the phrases, ignoring those already_present
+
+    Pass the phrases found before an action so that text the page already
+    showed (help text, earlier messages) does not count as its result.
+    """
+    phrases = [phrase for phrase in phrases if phrase not in already_present]
+    def condition(driver):
+        return bool(phrases) and bool(phrases_in_text(driver, phrases))
+    return condition
+
+class PageWaiter:
+    """Upper bounds for each kind of wait, shared by all autofill requests"""
+
+    def __init__(self, ready_timeout=DEFAULT_READY_TIMEOUT, network_idle_timeout=DEFAULT_NETWORK_IDLE_TIMEOUT,
+                 network_idle_time=DEFAULT_NETWORK_IDLE_TIME, element_timeout=DEFAULT_ELEMENT_TIMEOUT,
+                 submit_timeout=DEFAULT_SUBMIT_TIMEOUT, poll_interval=DEFAULT_POLL_INTERVAL):
+        self.ready_timeout = ready_timeout
+        self.network_idle_timeout = network_idle_timeout
+        self.network_idle_time = network_idle_time
+        self.element_timeout = element_timeout
+        self.submit_timeout = submit_timeout
+        self.poll_interval = poll_interval
+
+    def init_app(self, app):
+        """Read the wait bounds from the Flask app config"""
+        config = app.config
+        self.ready_timeout = float(config.get('AUTOFILL_READY_TIMEOUT', self.ready_timeout))
+        self.network_idle_timeout = float(config.get('AUTOFILL_NETWORK_IDLE_TIMEOUT', self.network_idle_timeout))
+        self.network_idle_time = float(config.get('AUTOFILL_NETWORK_IDLE_TIME', self.network_idle_time))
+        self.element_timeout = float(config.get('AUTOFILL_ELEMENT_TIMEOUT', self.element_timeout))
+        self.submit_timeout = float(config.get('AUTOFILL_SUBMIT_TIMEOUT', self.submit_timeout))
+
+    def session(self, driver):
+        """Start recording the waits of one request"""
+        return PageWaits(self, driver)
+
+class PageWaits:
+    """Waits on one driver, recording how long each phase took"""
+
+    def __init__(self, waiter, driver):
+        self.waiter = waiter
+        self.driver = driver
+        self.phases = []
+
+    def _record(self, phase, start, ready):
+        self.phases.append({'phase': phase, 'seconds': round(time.monotonic() - start, 3), 'ready': ready})
+
+    def until(self, condition, phase, timeout, required=False):
+        """Poll condition until it returns a truthy value or timeout passes
+
+        Returns the value, or None on timeout (TimeoutException when required).
+        """
+        start = time.monotonic()
+        try:
+            result = WebDriverWait(
+                self.driver, timeout, poll_frequency=self.waiter.poll_interval,
+                ignored_exceptions=(NoSuchElementException, StaleElementReferenceException, JavascriptException)
+            ).until(condition)
+        except TimeoutException:
+            self._record(phase, start, False)
+            if required:
+                raise
+            return None
+        self._record(phase, start, True)
+        return result
+
+    def navigate(self, url, phase='navigate'):
+        """Open a URL, recording how long the browser took to return
+
+        The driver's page-load timeout bounds this; when it passes, loading is
+        stopped and the phase is recorded as not ready.
+        """
+        start = time.monotonic()
+        try:
+            self.driver.get(url)
+        except TimeoutException:
+            self._record(phase, start, False)
+            try:
+                self.driver.execute_script('window.stop()')
+            except Exception:
+                pass
+            return
+        self._record(phase, start, True)
+
+    def document_ready(self, phase='document_ready'):
+        return self.until(document_ready, phase, self.waiter.ready_timeout)
+
+    def network_idle(self, phase='network_idle'):
+        """Wait until no fetch/XHR is in flight and no resource finished for network_idle_time"""
+        state = {'last': None, 'since': time.monotonic()}
+
+        def idle(driver):
+            pending, resources = driver.execute_script(NETWORK_STATE_SCRIPT)
+            now = time.monotonic()
+            if pending or resources != state['last']:
+                state['last'] = resources
+                state['since'] = now
+                return False
+            return now - state['since'] >= self.waiter.network_idle_time
+
+        return self.until(idle, phase, self.waiter.network_idle_timeout)
+
+    def element_present(self, selector, phase='element_present', timeout=None):
+        """Wait for an element matching the CSS selector and return it (None if it never shows up)"""
+        start = time.monotonic()
+        try:
+            return self.until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, selector)),
+                phase,
+                self.waiter.element_timeout if timeout is None else timeout
+            )
+        except InvalidSelectorException:
+            self._record(phase, start, False)
+            return None
+
+    def page_ready(self, url, selector=FORM_CONTROL_SELECTOR):
+        """Open a URL and wait for the document, the network and the target elements"""
+        self.navigate(url)
+        self.document_ready()
+        self.network_idle()
+        if selector:
+            self.element_present(selector)
+
+    def to_dict(self):
+        return {
+            'phases': self.phases,
+            'total_seconds': round(sum(phase['seconds'] for phase in self.phases), 3)
+        }
+
+# Global page waiter instance
+page_waiter = PageWaiter()
@@ -0,0 +1,150 @@
+"""
+PDF text extraction engine
+Pages are extracted in ranges on a process pool (PyPDF2 is pure Python, so
+threads would serialize on the GIL) and handed back in page order, either as
+an iterator, so later stages can start on the first pages, or joined once
+into a single string. Page and byte caps bound the work per document.
+"""
+
+import os
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PAGES = 100
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+# Documents this short are extracted inline; the pool round trip costs more
+INLINE_PAGE_LIMIT = 4
+MIN_PAGES_PER_TASK = 4
+
+# Reader of the last document opened in this process, reused across its page ranges
+_reader_cache = {}
+
+def _open_reader(file_path):
+    if PyPDF2 is None:
+        raise RuntimeError('PyPDF2 is required for PDF extraction')
+    return PyPDF2.PdfReader(file_path)
+
+def _extract_page(reader, number):
+    try:
+        return reader.pages[number].extract_text() or ''
+    except Exception as e:
+        logger.warning("Error extracting PDF page %d: %s", number + 1, e)
+        return ''
+
+def extract_page_range(file_path, start, stop):
+    """Extract pages start..stop-1 (runs in a pool process)"""
+    key = (file_path, os.path.getmtime(file_path))
+    reader = _reader_cache.get(key)
+    if reader is None:
+        _reader_cache.clear()
+        reader = _reader_cache[key] = _open_reader(file_path)
+    return [_extract_page(reader, number) for number in range(start, stop)]
+
+class PDFExtractor:
+    """Page-parallel PDF text extraction with per-document limits"""
+
+    def __init__(self, workers=DEFAULT_WORKERS, max_pages=DEFAULT_MAX_PAGES, max_bytes=DEFAULT_MAX_BYTES,
+                 min_pages_per_task=MIN_PAGES_PER_TASK, inline_page_limit=INLINE_PAGE_LIMIT):
+        self.workers = workers
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.min_pages_per_task = min_pages_per_task
+        self.inline_page_limit = inline_page_limit
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Read worker count and limits from the Flask app config"""
+        self.workers = int(app.config.get('PDF_EXTRACT_WORKERS', self.workers))
+        self.max_pages = int(app.config.get('PDF_MAX_PAGES', self.max_pages))
+        self.max_bytes = int(app.config.get('PDF_MAX_BYTES', self.max_bytes))
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a process that runs worker threads can copy held locks
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._pool
+
+    def _reset_pool(self, pool):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+    def _iter_raw_pages(self, file_path, reader, page_count):
+        if page_count <= self.inline_page_limit or self.workers <= 1:
+            for number in range(page_count):
+                yield _extract_page(reader, number)
+            return
+
+        # About two ranges per worker, small enough that the first one returns early
+        per_task = max(self.min_pages_per_task, -(-page_count // (self.workers * 2)))
+        pool = self._get_pool()
+        futures = []
+        done = 0
+        try:
+            futures = [
+                pool.submit(extract_page_range, file_path, start, min(start + per_task, page_count))
+                for start in range(0, page_count, per_task)
+            ]
+            for future in futures:
+                pages = future.result()
+                done += len(pages)
+                yield from pages
+        except BrokenProcessPool as e:
+            # A worker died: start a fresh pool next time, finish this document inline
+            logger.warning("PDF extraction pool failed, continuing inline: %s", e)
+            self._reset_pool(pool)
+            for number in range(done, page_count):
+                yield _extract_page(reader, number)
+        finally:
+            # Stopped early (byte cap or caller gave up): drop work not yet started
+            for future in futures:
+                future.cancel()
+
+    def iter_pages(self, file_path, max_pages=None, max_bytes=None):
+        """Yield page texts in order as they are extracted, within the page and byte caps"""
+        max_pages = max_pages or self.max_pages
+        max_bytes = max_bytes or self.max_bytes
+        reader = _open_reader(file_path)
+        page_count = min(len(reader.pages), max_pages)
+
+        remaining = max_bytes
+        for text in self._iter_raw_pages(file_path, reader, page_count):
+            size = len(text.encode('utf-8'))
+            if size > remaining:
+                yield text.encode('utf-8')[:remaining].decode('utf-8', 'ignore')
+                return
+            remaining -= size
+            yield text
+
+    def extract_text(self, file_path, max_pages=None, max_bytes=None):
+        """Extract the whole document as one string (pages joined by newlines)"""
+        pages = list(self.iter_pages(file_path, max_pages, max_bytes))
+        return '\n'.join(pages) + '\n' if pages else ''
+
+# Global PDF extractor instance
+pdf_extractor = PDFExtractor()
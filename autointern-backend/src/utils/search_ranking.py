@@ -0,0 +1,326 @@
+"""
+BM25 ranking engine for internship search
+Keeps a sparse term matrix over title, description and requirements and ranks
+postings with vectorized BM25 scoring (NumPy/SciPy).
+"""
+
+import math
+import re
+import threading
+import time
+from collections import Counter
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = None
+    sparse = None
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it',
+    'of', 'on', 'or', 'our', 'that', 'the', 'to', 'we', 'will', 'with', 'you', 'your'
+}
+
+# Field weights (a title hit counts three times as much as a description hit)
+DEFAULT_FIELD_WEIGHTS = {'title': 3.0, 'description': 1.0, 'requirements': 1.0}
+
+def ranking_available():
+    """Check if NumPy/SciPy are installed"""
+    return np is not None
+
+def tokenize(text):
+    """Lowercase word tokens without stop words"""
+    if not text:
+        return []
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+class BM25Index:
+    """Sparse BM25 index with append-only incremental updates
+
+    Rows are documents and columns are terms. New documents go into a small
+    delta matrix that is merged into the base matrix once it grows past
+    merge_threshold, so adding postings never rebuilds the whole index.
+    Updated or removed documents are tombstoned and dropped on compaction.
+    """
+
+    def __init__(self, field_weights=None, k1=1.2, b=0.75, merge_threshold=10000):
+        if not ranking_available():
+            raise RuntimeError('BM25Index requires numpy and scipy')
+
+        self.field_weights = field_weights or DEFAULT_FIELD_WEIGHTS
+        self.k1 = k1
+        self.b = b
+        self.merge_threshold = merge_threshold
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.vocabulary = {}
+        self.doc_ids = []
+        self.rows_by_id = {}
+        self._lengths = []
+        self._alive = []
+        self._df = []
+        self._dead = 0
+        self._base = None
+        self._base_rows = 0
+        self._delta_rows = []
+        self._delta_cols = []
+        self._delta_vals = []
+        self._delta = None
+        self._arrays = None
+
+    def __len__(self):
+        return len(self.doc_ids) - self._dead
+
+    def _analyze(self, document):
+        counts = Counter()
+        for field, weight in self.field_weights.items():
+            for token in tokenize(document.get(field)):
+                counts[token] += weight
+        return counts
+
+    def add_documents(self, documents):
+        """Add or replace documents given as dicts with 'id' and the indexed fields"""
+        with self._lock:
+            replaced = []
+            for document in documents:
+                doc_id = document['id']
+                if doc_id in self.rows_by_id:
+                    replaced.append(self.rows_by_id[doc_id])
+
+                row = len(self.doc_ids)
+                self.doc_ids.append(doc_id)
+                self.rows_by_id[doc_id] = row
+
+                counts = self._analyze(document)
+                for token, tf in counts.items():
+                    col = self.vocabulary.get(token)
+                    if col is None:
+                        col = len(self.vocabulary)
+                        self.vocabulary[token] = col
+                        self._df.append(0)
+                    self._df[col] += 1
+                    self._delta_rows.append(row - self._base_rows)
+                    self._delta_cols.append(col)
+                    self._delta_vals.append(tf)
+
+                self._lengths.append(sum(counts.values()))
+                self._alive.append(True)
+
+            self._kill(replaced)
+            self._delta = None
+            self._arrays = None
+            if len(self.doc_ids) - self._base_rows >= self.merge_threshold:
+                self._merge()
+            self._compact_if_sparse()
+
+    def remove_documents(self, doc_ids):
+        """Tombstone documents by id"""
+        with self._lock:
+            self._kill([self.rows_by_id.pop(doc_id) for doc_id in doc_ids if doc_id in self.rows_by_id])
+            self._arrays = None
+            self._compact_if_sparse()
+
+    def _compact_if_sparse(self):
+        if self._dead > 0.2 * max(len(self.doc_ids), 1):
+            self.compact()
+
+    def _kill(self, rows):
+        """Tombstone rows and take their terms out of the document frequencies"""
+        rows = sorted({row for row in rows if self._alive[row]})
+        if not rows:
+            return
+        for row in rows:
+            self._alive[row] = False
+        self._dead += len(rows)
+
+        cols = []
+        base_rows = [row for row in rows if row < self._base_rows]
+        if base_rows:
+            cols.append(self._base[base_rows].nonzero()[1])
+        delta_rows = [row - self._base_rows for row in rows if row >= self._base_rows]
+        if delta_rows:
+            in_rows = np.isin(np.asarray(self._delta_rows, dtype=np.int32), delta_rows)
+            cols.append(np.asarray(self._delta_cols, dtype=np.int32)[in_rows])
+        counts = np.bincount(np.concatenate(cols), minlength=len(self._df))
+        for col in np.flatnonzero(counts):
+            self._df[col] -= int(counts[col])
+
+    def _delta_matrix(self):
+        if self._delta is None:
+            delta_rows = len(self.doc_ids) - self._base_rows
+            self._delta = sparse.csc_matrix(
+                (np.asarray(self._delta_vals, dtype=np.float32),
+                 (np.asarray(self._delta_rows, dtype=np.int32), np.asarray(self._delta_cols, dtype=np.int32))),
+                shape=(delta_rows, len(self.vocabulary))
+            )
+        return self._delta
+
+    def _merge(self):
+        """Fold the delta matrix into the base matrix"""
+        delta = self._delta_matrix()
+        if self._base is None:
+            base = delta
+        else:
+            self._base.resize((self._base_rows, len(self.vocabulary)))
+            base = sparse.vstack([self._base, delta], format='csc')
+        base.sort_indices()
+        self._base = base
+        self._base_rows = len(self.doc_ids)
+        self._delta_rows, self._delta_cols, self._delta_vals = [], [], []
+        self._delta = None
+
+    def compact(self):
+        """Drop tombstoned rows and recompute document frequencies"""
+        with self._lock:
+            self._merge()
+            keep = np.flatnonzero(np.asarray(self._alive, dtype=bool))
+            self._base = self._base[keep].tocsc()
+            self._base.sort_indices()
+            self.doc_ids = [self.doc_ids[row] for row in keep]
+            self.rows_by_id = {doc_id: row for row, doc_id in enumerate(self.doc_ids)}
+            self._lengths = [self._lengths[row] for row in keep]
+            self._alive = [True] * len(keep)
+            self._df = np.diff(self._base.indptr).tolist()
+            self._base_rows = len(self.doc_ids)
+            self._dead = 0
+            self._arrays = None
+
+    def _prepare(self):
+        """Cache dense per-document arrays used at query time"""
+        if self._arrays is None:
+            lengths = np.asarray(self._lengths, dtype=np.float32)
+            alive = np.asarray(self._alive, dtype=bool)
+            avgdl = float(lengths[alive].mean()) if alive.any() else 1.0
+            norm = self.k1 * (1 - self.b + self.b * lengths / max(avgdl, 1e-6))
+            self._arrays = (alive, norm.astype(np.float32))
+        return self._arrays
+
+    def search(self, query, page=1, per_page=20):
+        """Rank documents for a query
+
+        Returns (doc_ids, scores, total) for the requested page, where total is
+        the number of documents matching at least one query term.
+        """
+        with self._lock:
+            cols = sorted({self.vocabulary[token] for token in tokenize(query) if token in self.vocabulary})
+            if not cols or not self.doc_ids:
+                return [], [], 0
+
+            alive, norm = self._prepare()
+            matrices = [(self._base, 0), (self._delta_matrix(), self._base_rows)]
+            n_docs = max(len(self), 1)
+
+            scores = np.zeros(len(self.doc_ids), dtype=np.float32)
+            for col in cols:
+                df = self._df[col]
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                for matrix, offset in matrices:
+                    if matrix is None or col >= matrix.shape[1]:
+                        continue
+                    start, end = matrix.indptr[col], matrix.indptr[col + 1]
+                    if start == end:
+                        continue
+                    rows = matrix.indices[start:end] + offset
+                    tf = matrix.data[start:end]
+                    scores[rows] += idf * tf * (self.k1 + 1) / (tf + norm[rows])
+
+            scores[~alive] = 0
+            candidates = np.flatnonzero(scores)
+            total = len(candidates)
+
+            page = max(page, 1)
+            k = min(page * per_page, total)
+            if k == 0:
+                return [], [], total
+            if k < total:
+                candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            # Highest score first, ties broken by newest row
+            order = np.lexsort((-candidates, -scores[candidates]))
+            top = candidates[order][(page - 1) * per_page:k]
+
+            return [self.doc_ids[row] for row in top], scores[top].tolist(), total
+
+class InternshipRanker:
+    """BM25 index over an Internship model, kept in sync incrementally
+
+    Rows changed since the last sync (by updated_at) are re-indexed at most once
+    per sync_interval seconds, so every worker process picks up postings written
+    by the others without a full rebuild. Rows at the last synced timestamp are
+    remembered by id so they are not re-indexed on every sync.
+    """
+
+    def __init__(self, model, sync_interval=5.0, batch_size=5000, **index_options):
+        self.model = model
+        self.sync_interval = sync_interval
+        self.batch_size = batch_size
+        self.index_options = index_options
+        self.index = None
+        self._synced_until = None
+        self._synced_ids = set()
+        self._last_sync = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        return ranking_available()
+
+    def sync(self, force=False):
+        """Index internships created or updated since the last sync"""
+        now = time.monotonic()
+        if not force and self.index is not None and now - self._last_sync < self.sync_interval:
+            return 0
+
+        with self._lock:
+            if self.index is None:
+                self.index = BM25Index(**self.index_options)
+
+            model = self.model
+            query = model.query.with_entities(
+                model.id, model.title, model.description, model.requirements, model.updated_at
+            )
+            if self._synced_until is not None:
+                query = query.filter(model.updated_at >= self._synced_until)
+
+            added = 0
+            batch = []
+            synced_until, synced_ids = self._synced_until, set(self._synced_ids)
+            for row in query.yield_per(self.batch_size):
+                # updated_at >= catches rows written later within the same timestamp; skip the ones already indexed
+                if row.updated_at is not None and row.updated_at == self._synced_until and row.id in self._synced_ids:
+                    continue
+                batch.append({
+                    'id': row.id,
+                    'title': row.title,
+                    'description': row.description,
+                    'requirements': row.requirements
+                })
+                if row.updated_at and (synced_until is None or row.updated_at > synced_until):
+                    synced_until, synced_ids = row.updated_at, set()
+                if row.updated_at is not None and row.updated_at == synced_until:
+                    synced_ids.add(row.id)
+                if len(batch) >= self.batch_size:
+                    self.index.add_documents(batch)
+                    added += len(batch)
+                    batch = []
+            if batch:
+                self.index.add_documents(batch)
+                added += len(batch)
+
+            self._synced_until, self._synced_ids = synced_until, synced_ids
+            self._last_sync = now
+            return added
+
+    def remove(self, internship_ids):
+        """Drop deleted internships from the index"""
+        if self.index is not None:
+            self.index.remove_documents(internship_ids)
+
+    def search(self, query, page=1, per_page=20):
+        """Ranked (ids, scores, total) for a query"""
+        self.sync()
+        return self.index.search(query, page=page, per_page=per_page)
@@ -0,0 +1,154 @@
+"""
+Inverted skill index for job recommendations
+Maintains skill -> internship postings in the internship_skills table
+"""
+
+import json
+from sqlalchemy import event, func, inspect
+from src.models.user_enhanced import db, Internship, InternshipSkill
+from src.utils.skill_matcher import extract_skills_from_text
+
+# Upper bound on postings written per statement
+INDEX_CHUNK_SIZE = 500
+
+def normalize_skill(skill):
+    """Normalize a skill for index lookups"""
+    return skill.strip().lower()[:100] if isinstance(skill, str) else ''
+
+def normalize_skills(skills):
+    """Normalize and dedupe a list of skills, dropping empties"""
+    return sorted({normalize_skill(skill) for skill in skills or []} - {''})
+
+def internship_keywords(keywords, description):
+    """Get an internship's keywords from its JSON column, or from its description"""
+    if keywords:
+        try:
+            parsed = json.loads(keywords)
+            if isinstance(parsed, list):
+                return parsed
+        except (TypeError, ValueError):
+            pass
+    return extract_skills_from_text(description)
+
+def _posting_rows(internship_id, keywords, description):
+    skills = normalize_skills(internship_keywords(keywords, description))
+    return [
+        {'skill': skill, 'internship_id': internship_id, 'keyword_count': len(skills)}
+        for skill in skills
+    ]
+
+def _write_postings(connection, internship_ids, rows):
+    table = InternshipSkill.__table__
+    ids = list(internship_ids)
+    for i in range(0, len(ids), INDEX_CHUNK_SIZE):
+        connection.execute(table.delete().where(table.c.internship_id.in_(ids[i:i + INDEX_CHUNK_SIZE])))
+    for i in range(0, len(rows), INDEX_CHUNK_SIZE):
+        connection.execute(table.insert(), rows[i:i + INDEX_CHUNK_SIZE])
+
+def index_internships(internships, session=None):
+    """Re-index (id, keywords, description) tuples in bulk"""
+    session = session or db.session
+    ids = []
+    rows = []
+    for internship_id, keywords, description in internships:
+        ids.append(internship_id)
+        rows.extend(_posting_rows(internship_id, keywords, description))
+    if ids:
+        _write_postings(session.connection(), ids, rows)
+    return len(rows)
+
+def index_internships_by_keys(dedupe_keys, session=None):
+    """Re-index internships written through the bulk upsert path"""
+    session = session or db.session
+    keys = list(dedupe_keys)
+    total = 0
+    for i in range(0, len(keys), INDEX_CHUNK_SIZE):
+        internships = session.query(Internship.id, Internship.keywords, Internship.description).filter(
+            Internship.dedupe_key.in_(keys[i:i + INDEX_CHUNK_SIZE])
+        ).all()
+        total += index_internships(internships, session=session)
+    return total
+
+def rebuild_index(batch_size=1000, session=None):
+    """Rebuild the whole index from the internships table in id-ordered batches"""
+    session = session or db.session
+    session.execute(InternshipSkill.__table__.delete())
+    last_id = 0
+    total = 0
+    while True:
+        internships = session.query(Internship.id, Internship.keywords, Internship.description).filter(
+            Internship.id > last_id
+        ).order_by(Internship.id).limit(batch_size).all()
+        if not internships:
+            break
+        total += index_internships(internships, session=session)
+        session.commit()
+        last_id = internships[-1].id
+    return total
+
+def recommend(user_skills, limit=10, session=None):
+    """Score internships sharing at least one skill and return the true top-N
+
+    Only the posting lists of the user's skills are read, so the cost scales with
+    the number of matching postings rather than the catalog size. Score is the
+    share of the internship's keywords the user has, as a percentage.
+    Returns a list of (internship_id, score, matching_skills, total_keywords).
+    """
+    session = session or db.session
+    skills = normalize_skills(user_skills)
+    if not skills:
+        return []
+
+    matches = func.count(InternshipSkill.skill)
+    total = func.max(InternshipSkill.keyword_count)
+    score = matches * 100.0 / total
+
+    top = session.query(
+        InternshipSkill.internship_id, score.label('score'), total.label('total')
+    ).filter(
+        InternshipSkill.skill.in_(skills)
+    ).group_by(
+        InternshipSkill.internship_id
+    ).order_by(score.desc(), InternshipSkill.internship_id.desc()).limit(limit).all()
+
+    if not top:
+        return []
+
+    matching = {}
+    for internship_id, skill in session.query(InternshipSkill.internship_id, InternshipSkill.skill).filter(
+        InternshipSkill.internship_id.in_([row.internship_id for row in top]),
+        InternshipSkill.skill.in_(skills)
+    ):
+        matching.setdefault(internship_id, []).append(skill)
+
+    return [
+        (row.internship_id, float(row.score), sorted(matching.get(row.internship_id, [])), row.total)
+        for row in top
+    ]
+
+def count_candidates(user_skills, session=None):
+    """Count internships sharing at least one skill with the user"""
+    session = session or db.session
+    skills = normalize_skills(user_skills)
+    if not skills:
+        return 0
+    return session.query(func.count(func.distinct(InternshipSkill.internship_id))).filter(
+        InternshipSkill.skill.in_(skills)
+    ).scalar()
+
+@event.listens_for(Internship, 'after_insert')
+def _index_after_insert(mapper, connection, target):
+    """Index internships created through the ORM"""
+    _write_postings(connection, [target.id], _posting_rows(target.id, target.keywords, target.description))
+
+@event.listens_for(Internship, 'after_update')
+def _index_after_update(mapper, connection, target):
+    """Re-index internships whose keywords or description changed"""
+    state = inspect(target)
+    if state.attrs.keywords.history.has_changes() or state.attrs.description.history.has_changes():
+        _write_postings(connection, [target.id], _posting_rows(target.id, target.keywords, target.description))
+
+@event.listens_for(Internship, 'after_delete')
+def _index_after_delete(mapper, connection, target):
+    """Drop postings of deleted internships"""
+    _write_postings(connection, [target.id], [])
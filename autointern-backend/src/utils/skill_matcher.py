@@ -0,0 +1,137 @@
+"""
+Multi-pattern skill matcher shared by the CV parser and job search
+Aho-Corasick automaton over word tokens, so every skill in the dictionary is
+found in a single pass over the text and only on word boundaries
+('ai' does not match inside 'maintain', 'go' does not match inside 'google').
+"""
+
+import json
+import os
+import re
+import threading
+from collections import deque
+
+# Words, and every punctuation character as its own token ('node.js' -> node . js)
+TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]')
+
+DEFAULT_DICTIONARY_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'skills.json')
+
+def tokenize(text):
+    """Split lowercased text into word and punctuation tokens"""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+class SkillMatcher:
+    """Token-level Aho-Corasick automaton over a skill dictionary"""
+
+    def __init__(self, terms=()):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self._compiled = True
+        self.terms = []
+        self._term_set = set()
+        for term in terms:
+            self.add(term)
+        self.compile()
+
+    def __len__(self):
+        return len(self.terms)
+
+    def add(self, term):
+        """Add a term to the dictionary; call compile() before matching"""
+        tokens = tokenize(term)
+        if not tokens:
+            return
+
+        canonical = ' '.join(term.lower().split())
+        if canonical in self._term_set:
+            return
+
+        # Also accept the plural form of the last word ('apis' -> 'api')
+        variants = [tokens]
+        if tokens[-1].isalpha() and len(tokens[-1]) > 1 and not tokens[-1].endswith('s'):
+            variants.append(tokens[:-1] + [tokens[-1] + 's'])
+
+        for variant in variants:
+            node = 0
+            for token in variant:
+                next_node = self._goto[node].get(token)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[node][token] = next_node
+                node = next_node
+            self._output[node].append(canonical)
+
+        self.terms.append(canonical)
+        self._term_set.add(canonical)
+        self._compiled = False
+
+    def compile(self):
+        """Build failure links and merge outputs (breadth-first)"""
+        if self._compiled:
+            return
+
+        goto, fail, output = self._goto, self._fail, self._output
+        queue = deque()
+        for child in goto[0].values():
+            fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for token, child in goto[node].items():
+                state = fail[node]
+                while state and token not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(token, 0)
+                if fail[child] == child:
+                    fail[child] = 0
+                output[child] = output[child] + [term for term in output[fail[child]] if term not in output[child]]
+                queue.append(child)
+
+        self._compiled = True
+
+    def find_all(self, text):
+        """Return every dictionary term in the text, in order of first occurrence"""
+        if not self._compiled:
+            self.compile()
+
+        goto, fail, output = self._goto, self._fail, self._output
+        found = {}
+        state = 0
+        for token in tokenize(text):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for term in output[state]:
+                found[term] = None
+        return list(found)
+
+def load_skill_dictionary(path=None):
+    """Load skills from a JSON list or a text file with one skill per line"""
+    path = path or os.environ.get('SKILL_DICTIONARY_PATH') or DEFAULT_DICTIONARY_PATH
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.json'):
+            return json.load(f)
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+def get_skill_matcher():
+    """Get the process-wide matcher, built once from the skill dictionary"""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = SkillMatcher(load_skill_dictionary())
+    return _matcher
+
+def extract_skills_from_text(text):
+    """Find every known skill in the text in a single pass"""
+    if not text:
+        return []
+    return get_skill_matcher().find_all(text)
@@ -0,0 +1,137 @@
+"""
+Static-HTML tier of form field detection
+Most application forms are rendered on the server, so their fields can be
+read from the HTML without starting a browser. The page is fetched over a
+pooled HTTP session (keep-alive connections reused across requests) and
+classified with the same rules as the browser scan. The browser is only
+needed when the page looks JavaScript-rendered or too few fields were found.
+"""
+
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from src.utils.form_fields import field_classifier, scan_html
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+DEFAULT_TIMEOUT = 5
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+DEFAULT_MIN_FIELDS = 2
+DEFAULT_POOL_SIZE = 20
+
+USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+)
+
+# Empty containers single-page apps render into
+APP_ROOT_SELECTORS = ['#root', '#app', '#__next', '#__nuxt', '[data-reactroot]', '[ng-app]', '[ng-version]']
+
+def looks_javascript_rendered(soup, controls):
+    """Whether the form is probably built in the browser rather than served in the HTML"""
+    if controls:
+        return False
+    for selector in APP_ROOT_SELECTORS:
+        root = soup.select_one(selector)
+        if root is not None and root.find(['input', 'textarea', 'select']) is None:
+            return True
+    for noscript in soup.find_all('noscript'):
+        if 'javascript' in noscript.get_text().lower():
+            return True
+    return False
+
+class StaticFormDetector:
+    """Detects form fields from server-rendered HTML, without a browser"""
+
+    def __init__(self, enabled=True, timeout=DEFAULT_TIMEOUT, max_bytes=DEFAULT_MAX_BYTES,
+                 min_fields=DEFAULT_MIN_FIELDS, pool_size=DEFAULT_POOL_SIZE, classifier=field_classifier):
+        self.enabled = enabled
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.min_fields = min_fields
+        self.pool_size = pool_size
+        self.classifier = classifier
+        self._session = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Read the static tier settings from the Flask app config"""
+        config = app.config
+        self.enabled = bool(config.get('AUTOFILL_STATIC_DETECTION', self.enabled))
+        self.timeout = float(config.get('AUTOFILL_STATIC_TIMEOUT', self.timeout))
+        self.max_bytes = int(config.get('AUTOFILL_STATIC_MAX_BYTES', self.max_bytes))
+        self.min_fields = int(config.get('AUTOFILL_STATIC_MIN_FIELDS', self.min_fields))
+
+    @property
+    def session(self):
+        """HTTP session shared by all requests, with a connection pool per host"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    session.headers.update({'User-Agent': USER_AGENT, 'Accept': 'text/html,application/xhtml+xml'})
+                    self._session = session
+        return self._session
+
+    def fetch(self, url):
+        """Download at most max_bytes of a page as (body, charset or None), or None if it is not HTML"""
+        with self.session.get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', 'text/html').lower()
+            if 'html' not in content_type:
+                return None
+            body = bytearray()
+            for chunk in response.iter_content(64 * 1024):
+                body += chunk
+                if len(body) >= self.max_bytes:
+                    break
+            # Without a declared charset, BeautifulSoup sniffs it from <meta> rather than assuming latin-1
+            charset = response.encoding if 'charset' in content_type else None
+            return bytes(body[:self.max_bytes]), charset
+
+    def detect(self, url):
+        """Try to answer detection from static HTML
+
+        Returns a dict with 'answered' (True when the static result is good
+        enough), 'reason' when it is not, and the scanned controls and
+        detected fields either way.
+        """
+        start = time.monotonic()
+        result = {'tier': 'static', 'answered': False, 'reason': None, 'detected_fields': {}, 'controls': []}
+        if not self.enabled or BeautifulSoup is None:
+            result['reason'] = 'disabled'
+            result['seconds'] = 0.0
+            return result
+
+        try:
+            page = self.fetch(url)
+        except requests.RequestException as e:
+            print(f"Static form fetch failed for {url}: {e}")
+            page = None
+        if page is None:
+            result['reason'] = 'fetch_failed'
+        else:
+            soup = BeautifulSoup(page[0], 'html.parser', from_encoding=page[1])
+            controls = scan_html(soup)
+            detected_fields = self.classifier.classify(controls)
+            result['detected_fields'] = detected_fields
+            result['controls'] = controls
+            if looks_javascript_rendered(soup, controls):
+                result['reason'] = 'javascript_rendered'
+            elif len(detected_fields) < self.min_fields:
+                result['reason'] = 'too_few_fields'
+            else:
+                result['answered'] = True
+
+        result['seconds'] = round(time.monotonic() - start, 3)
+        return result
+
+# Global static form detector instance
+static_form_detector = StaticFormDetector()